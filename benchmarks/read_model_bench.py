@@ -0,0 +1,113 @@
+"""
+Memory footprint and range-query latency of the in-memory read model
+against the SQLite path.
+
+    python benchmarks/read_model_bench.py --events 100000 --queries 300
+"""
+
+import argparse
+import os
+import random
+import sqlite3
+import statistics
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+from zoneinfo import ZoneInfo
+
+from calendar_agent import tools
+from calendar_agent.read_model import READ_MODEL
+
+ROME_TZ = ZoneInfo("Europe/Rome")
+START = datetime(2024, 1, 1, tzinfo=ROME_TZ)
+TITLES = ["Team Sync", "1:1", "Lunch", "Focus Block", "Review", "Gym", "Dentist", "Call"]
+WINDOWS = {"1h": timedelta(hours=1), "1d": timedelta(days=1), "1w": timedelta(days=7)}
+
+
+def _populate(db_path: str, count: int, years: int) -> None:
+    rng = random.Random(7)
+    span_minutes = years * 365 * 24 * 60
+    now = datetime.now(ROME_TZ).isoformat()
+    rows = []
+    for _ in range(count):
+        start = START + timedelta(minutes=rng.randrange(span_minutes))
+        end = start + timedelta(minutes=rng.choice((15, 30, 45, 60, 90, 120)))
+        rows.append(
+            (rng.choice(TITLES), start.isoformat(), end.isoformat(), "", "", now, now, "default")
+        )
+    with sqlite3.connect(db_path) as conn:
+        conn.executemany(
+            "INSERT INTO events (title, start_ts, end_ts, location, notes, created_at, updated_at, calendar_id) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            rows,
+        )
+
+
+def _rows_as_dicts(db_path: str) -> list[dict]:
+    with sqlite3.connect(db_path) as conn:
+        conn.row_factory = sqlite3.Row
+        return [dict(r) for r in conn.execute(f"SELECT {tools._ROW_COLUMNS} FROM events")]
+
+
+def _traced(fn):
+    tracemalloc.start()
+    result = fn()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, size
+
+
+def _latencies(ranges: list[tuple[str, str]], read_model: bool) -> list[float]:
+    os.environ["CALENDAR_READ_MODEL"] = "1" if read_model else "0"
+    tools._query_range("default", *ranges[0])
+    out = []
+    for s, e in ranges:
+        t0 = time.perf_counter()
+        tools._query_range("default", s, e)
+        out.append((time.perf_counter() - t0) * 1e6)
+    return out
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--events", type=int, default=100_000)
+    parser.add_argument("--queries", type=int, default=300)
+    parser.add_argument("--years", type=int, default=3)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, "bench.db")
+        os.environ["CALENDAR_DB_PATH"] = db_path
+        os.environ["CALENDAR_TOOL_CACHE_ENABLED"] = "0"
+        tools.init_db()
+        _populate(db_path, args.events, args.years)
+
+        t0 = time.perf_counter()
+        with sqlite3.connect(db_path) as conn:
+            conn.row_factory = sqlite3.Row
+            index, model_bytes = _traced(lambda: READ_MODEL.load(conn, db_path, "default", 0))
+        load_ms = (time.perf_counter() - t0) * 1000
+        _, dict_bytes = _traced(lambda: _rows_as_dicts(db_path))
+        db_bytes = os.path.getsize(db_path)
+
+        print(f"events: {len(index):,}  load: {load_ms:.0f} ms")
+        print(f"read model: {model_bytes / 2**20:.1f} MiB ({model_bytes / len(index):.0f} B/event)")
+        print(f"rows as dicts: {dict_bytes / 2**20:.1f} MiB  sqlite file: {db_bytes / 2**20:.1f} MiB")
+
+        rng = random.Random(11)
+        span = timedelta(days=args.years * 365)
+        print(f"\n{'window':<8}{'path':<12}{'p50 µs':>10}{'p95 µs':>10}")
+        for label, width in WINDOWS.items():
+            ranges = []
+            for _ in range(args.queries):
+                s = START + span * rng.random()
+                ranges.append((s.isoformat(), (s + width).isoformat()))
+            for path, enabled in (("sqlite", False), ("read model", True)):
+                samples = sorted(_latencies(ranges, enabled))
+                p95 = samples[int(len(samples) * 0.95) - 1]
+                print(f"{label:<8}{path:<12}{statistics.median(samples):>10.1f}{p95:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
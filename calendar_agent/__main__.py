@@ -1,14 +1,25 @@
 import os
+import sys
 import time
+from contextlib import nullcontext
 from datetime import datetime
 from uuid import uuid4
 from zoneinfo import ZoneInfo
-from datapizza.tracing import ContextTracing
 from opentelemetry import trace
 from .agent import create_calendar_agent
-from .telemetry import render_turn_summary, summarize_spans
-from .tools import init_db, seed_db, _get_db_path
+from .intent_cache import INTENT_CACHE, remember_turn
+from .profiling import profile_turn, profiling_enabled
+from .response_validation import finalize_response
+from .routing import routed_turn
+from .streaming import run_streaming, streaming_enabled
+from .telemetry import render_turn_profile, render_turn_summary, turn_trace
+from .tools import (
+    unit_of_work,
+    _calendar_id,
+    _get_db_path,
+)
 from .utils import env_truthy
+from .warmup import Warmup
 
 def _tracing_enabled() -> bool:
     return os.getenv("CALENDAR_TRACING", "").strip().lower() in {"1", "true"}
@@ -20,18 +31,51 @@ def _clear_agent_memory(agent) -> None:
     if hasattr(agent, "_memory") and agent._memory:
         agent._memory.clear()
 
+def _run_turn(agent, prompt: str, streaming: bool):
+    """Runs one agent turn; when streaming, prints the answer as it arrives."""
+    if not streaming:
+        return agent.run(prompt), None, False
+    printed = False
+
+    def on_delta(delta: str) -> None:
+        nonlocal printed
+        if not printed:
+            print("\nAssistant: ", end="", flush=True)
+            printed = True
+        print(delta, end="", flush=True)
+
+    turn = run_streaming(agent, prompt, on_delta)
+    if turn.streamed:
+        print()
+    return turn, turn.ttft_ms, turn.streamed
+
+def _final_text(agent, response, structured: bool) -> str:
+    if not structured:
+        return response.text
+    # Repairs locally when it can; re-asks the model only as a last resort.
+    return finalize_response(response.text, lambda prompt: agent.run(prompt).text)
+
 def main():
-    init_db()
-    seed_db()
+    if len(sys.argv) > 1 and sys.argv[1] == "serve":
+        from .server import serve_main
+
+        serve_main(sys.argv[2:])
+        return
+
     structured = env_truthy("CALENDAR_STRUCTURED_OUTPUT", "0")
+    # DB setup, cache prefill and agent construction overlap with the first input().
+    warmup = Warmup(create_calendar_agent).start()
     
     print("--- Calendar Assistant REPL ---")
     print("Type your request or '/exit' to quit.")
     
-    agent = create_calendar_agent()
+    agent = None
+    pending_warmup = warmup.report
     session_id = str(uuid4())
     tracing_enabled = _tracing_enabled()
     tracer = trace.get_tracer(__name__) if tracing_enabled else None
+    profile_enabled = profiling_enabled()
+    streaming = streaming_enabled()
     
     max_turns = 2 if structured else 15
     structured_turn_count = 0
@@ -40,6 +84,14 @@ def main():
             user_input = input("\nUser: ").strip()
         except EOFError:
             break
+
+        if agent is None:
+            try:
+                agent = warmup.result()
+            except Exception as e:
+                # Without a database or client there is nothing to run turns on.
+                print(f"\nError: Start-up failed: {e}")
+                break
             
         if user_input.lower() == "/exit":
             if structured:
@@ -52,7 +104,7 @@ def main():
             
         try:
             if tracing_enabled:
-                with ContextTracing().trace("calendar.turn") as ctx:
+                with turn_trace("calendar.turn") as turn_stats:
                     span = trace.get_current_span()
                     if span is not None:
                         span.set_attribute("session_id", session_id)
@@ -60,15 +112,46 @@ def main():
                         span.set_attribute("model", os.getenv("MODEL", ""))
                         span.set_attribute("user_input_length", len(user_input))
                         span.set_attribute("db_path", _get_db_path())
+                        span.set_attribute("calendar_id", _calendar_id())
+                        if pending_warmup is not None:
+                            span.set_attribute("warmup.total_ms", round(pending_warmup.total_ms, 2))
+                            span.set_attribute("warmup.waited_ms", round(pending_warmup.waited_ms, 2))
+                            span.set_attribute("warmup.hidden_ms", round(pending_warmup.hidden_ms, 2))
 
                     with tracer.start_as_current_span("timeparse"):
                         now_rome = datetime.now(ZoneInfo("Europe/Rome"))
                         context = f"[CURRENT_TIME_ROME={now_rome.isoformat()}] "
 
-                    with tracer.start_as_current_span("agent.run"):
-                        start_time = time.perf_counter()
-                        response = agent.run(context + user_input)
+                    start_time = time.perf_counter()
+                    with tracer.start_as_current_span("intent_cache.lookup"):
+                        lookup = INTENT_CACHE.lookup(user_input, now_rome, structured)
+
+                    route = None
+                    if lookup.hit:
+                        response, ttft_ms, streamed, profile = None, None, False, None
+                        text = lookup.text
+                        remember_turn(agent, context + user_input, text)
                         duration_ms = (time.perf_counter() - start_time) * 1000
+                    else:
+                        with tracer.start_as_current_span("agent.run"), routed_turn(
+                            agent, user_input, now_rome
+                        ) as route:
+                            with unit_of_work(), (
+                                profile_turn(session_id, turn)
+                                if profile_enabled
+                                else nullcontext()
+                            ) as profile:
+                                response, ttft_ms, streamed = _run_turn(
+                                    agent, context + user_input, streaming
+                                )
+                                text = _final_text(agent, response, structured)
+                            duration_ms = (time.perf_counter() - start_time) * 1000
+                            if route is not None:
+                                route.usage = getattr(response, "usage", None)
+                        INTENT_CACHE.store(lookup, text, getattr(response, "usage", None))
+                        if span is not None and route is not None:
+                            span.set_attribute("model", route.model)
+                            span.set_attribute("route.tier", route.tier)
 
                     if span is not None and response is not None:
                         usage = getattr(response, "usage", None)
@@ -92,8 +175,10 @@ def main():
                                 ),
                             )
                         span.set_attribute("turn.duration_ms", round(duration_ms, 2))
+                        if ttft_ms is not None:
+                            span.set_attribute("turn.ttft_ms", round(ttft_ms, 2))
 
-                    summary = summarize_spans(ctx.get_spans())
+                    summary = turn_stats.summary()
                     if span is not None:
                         cache_savings = summary["cache_savings"]
                         span.set_attribute(
@@ -119,21 +204,48 @@ def main():
                             "tool.total_duration_ms",
                             float(summary.get("tool_total_ms", 0.0)),
                         )
+                        for layer, hits in summary.get("cache_hits", {}).items():
+                            span.set_attribute(f"cache.hits.{layer}", int(hits))
 
                     render_turn_summary(
                         summary,
                         duration_ms=duration_ms,
                         usage=getattr(response, "usage", None),
+                        ttft_ms=ttft_ms,
+                        prompt_totals=getattr(agent, "prompt_totals", None),
+                        route=route,
+                        warmup=pending_warmup,
                     )
+                    pending_warmup = None
+                    if profile is not None:
+                        render_turn_profile(profile)
             else:
                 now_rome = datetime.now(ZoneInfo("Europe/Rome"))
                 context = f"[CURRENT_TIME_ROME={now_rome.isoformat()}] "
-                response = agent.run(context + user_input)
+                lookup = INTENT_CACHE.lookup(user_input, now_rome, structured)
+                if lookup.hit:
+                    text, streamed = lookup.text, False
+                    remember_turn(agent, context + user_input, text)
+                else:
+                    with routed_turn(agent, user_input, now_rome) as route, unit_of_work(), (
+                        profile_turn(session_id, turn)
+                        if profile_enabled
+                        else nullcontext()
+                    ) as profile:
+                        response, _, streamed = _run_turn(
+                            agent, context + user_input, streaming
+                        )
+                        text = _final_text(agent, response, structured)
+                        if route is not None:
+                            route.usage = getattr(response, "usage", None)
+                    INTENT_CACHE.store(lookup, text, getattr(response, "usage", None))
+                    if profile is not None:
+                        render_turn_profile(profile)
 
             if structured:
-                print(f"\n{response.text}")
-            else:
-                print(f"\nAssistant: {response.text}")
+                print(f"\n{text}")
+            elif not streamed:
+                print(f"\nAssistant: {text}")
 
             if structured:
                 structured_turn_count += 1
@@ -3,8 +3,21 @@ from dotenv import load_dotenv
 from datapizza.clients.google import GoogleClient
 from datapizza.memory import Memory
 from datapizza.agents import Agent
-from .tools import list_events, add_event, update_event, delete_events
-from .cache import InMemoryLRUCache
+from .tools import (
+    list_events,
+    add_event,
+    update_event,
+    delete_events,
+    summarize_range,
+    delete_events_in_range,
+    update_events_matching,
+    reschedule_by_title,
+    delete_by_title,
+)
+from .cache import InMemoryLRUCache, release_on_error
+from .prompt_size import instrument_prompt_size
+from .routing import FULL, LIGHT, ModelRouter, light_model, routing_enabled
+from .streaming import cache_streamed_calls, streaming_enabled
 from .utils import env_truthy
 
 load_dotenv()
@@ -15,22 +28,32 @@ if "DATAPIZZA_LOG_LEVEL" not in os.environ:
 if "DATAPIZZA_AGENT_LOG_LEVEL" not in os.environ:
     os.environ["DATAPIZZA_AGENT_LOG_LEVEL"] = "WARN"
 
-def create_calendar_agent():
-    api_key = os.getenv("GOOGLE_API_KEY")
-    model = os.getenv("MODEL", "gemini-2.5-flash")
+def _client_cache() -> InMemoryLRUCache | None:
     cache_enabled = os.getenv("CALENDAR_CLIENT_CACHE_ENABLED", "1").strip().lower() in {"1", "true"}
-    structured = env_truthy("CALENDAR_STRUCTURED_OUTPUT", "0")
     cache_size_raw = os.getenv("CALENDAR_CLIENT_CACHE_SIZE", "128")
     try:
         cache_size = int(cache_size_raw)
     except ValueError:
         cache_size = 128
-    client_cache = InMemoryLRUCache(maxsize=cache_size) if cache_enabled else None
+    return InMemoryLRUCache(maxsize=cache_size) if cache_enabled else None
+
+def create_calendar_agent(client=None, light_client=None):
+    """
+    Builds the calendar agent. With `CALENDAR_MODEL_ROUTING=1` (or an explicit
+    `light_client`) the agent also gets a `router` that sends simple turns to
+    the light model; each tier has its own client cache.
+    """
+    api_key = os.getenv("GOOGLE_API_KEY")
+    model = os.getenv("MODEL", "gemini-2.5-flash")
+    structured = env_truthy("CALENDAR_STRUCTURED_OUTPUT", "0")
     
     # if not api_key:
     #     pass
 
-    client = GoogleClient(api_key=api_key, model=model, cache=client_cache)
+    if client is None:
+        client = GoogleClient(api_key=api_key, model=model, cache=_client_cache())
+    if light_client is None and routing_enabled():
+        light_client = GoogleClient(api_key=api_key, model=light_model(), cache=_client_cache())
     memory = Memory()
     
     # system_prompt = (
@@ -53,16 +76,19 @@ def create_calendar_agent():
         "1) Never invent event IDs. Use only IDs returned by tools.\n"
         "2) Use tools for all CRUD (list/add/update/delete).\n"
         "3) If time range or event ID is missing/ambiguous, ask ONE concise clarifying question.\n"
-        "4) For update/delete by title, first call list_events for the inferred range to obtain IDs; never guess.\n"
-        "5) Be concise.\n"
-        "6) In the final reply, format times readably (e.g., 'Tuesday, Feb 11 at 9:30 AM'); never show raw ISO timestamps."
+        "4) To move or delete ONE event named by title, call reschedule_by_title or delete_by_title directly (pass the inferred range as the search window); if they return candidates, ask which one. To clear a time range or rename/relocate events by title or location, call delete_events_in_range or update_events_matching (dry_run=true first if the match may be too broad). Use list_events to obtain IDs only for other edits; never guess.\n"
+        "5) For busy/free questions over weeks, months or a year, call summarize_range instead of list_events.\n"
+        "6) Be concise.\n"
+        "7) In the final reply, format times readably (e.g., 'Tuesday, Feb 11 at 9:30 AM'); never show raw ISO timestamps."
     )
 
     structured_system_prompt = (
         "Return ONLY JSON. mode='structured'. "
         "Keys: mode,action,status,events,created_ids,updated_ids,deleted_ids,question,message. "
         "events items: id,title,start,end,location,notes. "
-        "Tool-only CRUD. Never invent IDs. "
+        "Tool-only CRUD. Never invent IDs. Use summarize_range for busy/free questions over long ranges. "
+        "Use delete_events_in_range/update_events_matching for bulk changes by range, title or location. "
+        "Use reschedule_by_title/delete_by_title to move or delete one event by title without listing first. "
         "If missing info: status='needs_clarification' and set question. No other text."
     )
 
@@ -75,11 +101,33 @@ def create_calendar_agent():
         memory=memory,
         stateless=False,
         max_steps=8,
+        stream=streaming_enabled(),
         system_prompt=system_prompt,
-        tools=[list_events, add_event, update_event, delete_events]
+        tools=[
+            list_events,
+            add_event,
+            update_event,
+            delete_events,
+            summarize_range,
+            delete_events_in_range,
+            update_events_matching,
+            reschedule_by_title,
+            delete_by_title,
+        ]
     )
 
     if not hasattr(agent, "memory") and not hasattr(agent, "_memory"):
         agent._memory = memory
-    
+
+    for tier_client in (client, light_client):
+        if tier_client is not None:
+            release_on_error(tier_client)
+            cache_streamed_calls(tier_client)
+
+    # Per-session prompt composition totals, shown in the turn summary.
+    agent.prompt_totals = instrument_prompt_size(client)
+    agent.router = None
+    if light_client is not None:
+        instrument_prompt_size(light_client, agent.prompt_totals)
+        agent.router = ModelRouter({FULL: client, LIGHT: light_client})
     return agent
@@ -0,0 +1,196 @@
+import sqlite3
+from dataclasses import dataclass
+from datetime import date, datetime, time, timedelta
+from zoneinfo import ZoneInfo
+
+ROME_TZ = ZoneInfo("Europe/Rome")
+
+AGGREGATE_SCHEMA = """
+    CREATE TABLE IF NOT EXISTS day_buckets (
+        calendar_id TEXT NOT NULL,
+        day TEXT NOT NULL,
+        event_count INTEGER NOT NULL,
+        busy_minutes INTEGER NOT NULL,
+        first_start TEXT NOT NULL,
+        last_end TEXT NOT NULL,
+        PRIMARY KEY (calendar_id, day)
+    ) WITHOUT ROWID;
+    CREATE TABLE IF NOT EXISTS day_bucket_dirty (
+        calendar_id TEXT NOT NULL,
+        start_ts TEXT NOT NULL,
+        end_ts TEXT NOT NULL
+    );
+    CREATE INDEX IF NOT EXISTS idx_events_calendar_end ON events (calendar_id, end_ts);
+    CREATE TRIGGER IF NOT EXISTS trg_events_buckets_insert AFTER INSERT ON events
+    BEGIN
+        INSERT INTO day_bucket_dirty VALUES (NEW.calendar_id, NEW.start_ts, NEW.end_ts);
+    END;
+    CREATE TRIGGER IF NOT EXISTS trg_events_buckets_update
+    AFTER UPDATE OF start_ts, end_ts, calendar_id ON events
+    BEGIN
+        INSERT INTO day_bucket_dirty VALUES (OLD.calendar_id, OLD.start_ts, OLD.end_ts);
+        INSERT INTO day_bucket_dirty VALUES (NEW.calendar_id, NEW.start_ts, NEW.end_ts);
+    END;
+    CREATE TRIGGER IF NOT EXISTS trg_events_buckets_delete AFTER DELETE ON events
+    BEGIN
+        INSERT INTO day_bucket_dirty VALUES (OLD.calendar_id, OLD.start_ts, OLD.end_ts);
+    END;
+    CREATE TRIGGER IF NOT EXISTS trg_archive_buckets_delete AFTER DELETE ON events_archive
+    BEGIN
+        INSERT INTO day_bucket_dirty VALUES (OLD.calendar_id, OLD.start_ts, OLD.end_ts);
+    END;
+"""
+
+
+@dataclass
+class DayBucket:
+    day: date
+    event_count: int
+    busy_minutes: int
+    first_start: datetime
+    last_end: datetime
+
+
+def _to_rome(ts: str) -> datetime:
+    dt = datetime.fromisoformat(ts)
+    if dt.tzinfo is None:
+        return dt.replace(tzinfo=ROME_TZ)
+    return dt.astimezone(ROME_TZ)
+
+
+def day_bounds(day: date) -> tuple[datetime, datetime]:
+    start = datetime.combine(day, time(0), tzinfo=ROME_TZ)
+    end = datetime.combine(day + timedelta(days=1), time(0), tzinfo=ROME_TZ)
+    return start, end
+
+
+def days_touched(start: datetime, end: datetime) -> list[date]:
+    """Local days overlapped by [start, end); an end at midnight is exclusive."""
+    first = start.date()
+    last = (end - timedelta(microseconds=1)).date() if end > start else first
+    return [first + timedelta(days=i) for i in range((last - first).days + 1)]
+
+
+def ensure_aggregate_schema(conn: sqlite3.Connection) -> None:
+    """Requires `events` and `events_archive` to exist."""
+    conn.executescript(AGGREGATE_SCHEMA)
+    has_buckets = conn.execute("SELECT 1 FROM day_buckets LIMIT 1").fetchone()
+    if has_buckets is None:
+        # First run on an existing database: queue every event for bucketing.
+        conn.execute("""
+            INSERT INTO day_bucket_dirty (calendar_id, start_ts, end_ts)
+            SELECT calendar_id, start_ts, end_ts FROM events
+            UNION ALL
+            SELECT calendar_id, start_ts, end_ts FROM events_archive
+        """)
+    refresh_day_buckets(conn)
+
+
+def _recompute_day(conn: sqlite3.Connection, calendar_id: str, day: date) -> None:
+    day_start, day_end = day_bounds(day)
+    # Archived events still count: moving an event to the archive leaves the
+    # day's totals unchanged.
+    rows = conn.execute(
+        """
+        SELECT start_ts, end_ts FROM events
+        WHERE calendar_id = ? AND start_ts < ? AND end_ts > ?
+        UNION ALL
+        SELECT start_ts, end_ts FROM events_archive
+        WHERE calendar_id = ? AND start_ts < ? AND end_ts > ?
+        """,
+        (calendar_id, day_end.isoformat(), day_start.isoformat()) * 2,
+    ).fetchall()
+
+    spans = []
+    for start_ts, end_ts in rows:
+        start = max(_to_rome(start_ts), day_start)
+        end = min(_to_rome(end_ts), day_end)
+        if end > start:
+            spans.append((start, end))
+
+    if not spans:
+        conn.execute(
+            "DELETE FROM day_buckets WHERE calendar_id = ? AND day = ?",
+            (calendar_id, day.isoformat()),
+        )
+        return
+
+    # Busy time is the union of the clipped intervals, so overlaps count once.
+    spans.sort()
+    busy = timedelta(0)
+    cur_start, cur_end = spans[0]
+    for start, end in spans[1:]:
+        if start > cur_end:
+            busy += cur_end - cur_start
+            cur_start, cur_end = start, end
+        else:
+            cur_end = max(cur_end, end)
+    busy += cur_end - cur_start
+
+    conn.execute(
+        """
+        INSERT OR REPLACE INTO day_buckets
+            (calendar_id, day, event_count, busy_minutes, first_start, last_end)
+        VALUES (?, ?, ?, ?, ?, ?)
+        """,
+        (
+            calendar_id,
+            day.isoformat(),
+            len(spans),
+            int(busy.total_seconds() // 60),
+            spans[0][0].isoformat(),
+            max(end for _, end in spans).isoformat(),
+        ),
+    )
+
+
+def refresh_day_buckets(conn: sqlite3.Connection) -> int:
+    """
+    Recomputes the buckets of every day touched since the last refresh.
+
+    The triggers log the old and new span of each changed event, so the work
+    is proportional to the number of days those spans cover. Returns the
+    number of days recomputed.
+    """
+    dirty = conn.execute(
+        "SELECT calendar_id, start_ts, end_ts FROM day_bucket_dirty"
+    ).fetchall()
+    if not dirty:
+        return 0
+    touched: set[tuple[str, date]] = set()
+    for calendar_id, start_ts, end_ts in dirty:
+        for day in days_touched(_to_rome(start_ts), _to_rome(end_ts)):
+            touched.add((calendar_id, day))
+    for calendar_id, day in sorted(touched):
+        _recompute_day(conn, calendar_id, day)
+    conn.execute("DELETE FROM day_bucket_dirty")
+    return len(touched)
+
+
+def has_dirty_buckets(conn: sqlite3.Connection) -> bool:
+    return conn.execute("SELECT 1 FROM day_bucket_dirty LIMIT 1").fetchone() is not None
+
+
+def read_day_buckets(
+    conn: sqlite3.Connection, calendar_id: str, first_day: date, end_day: date
+) -> list[DayBucket]:
+    """Buckets for days in [first_day, end_day), ordered by day."""
+    rows = conn.execute(
+        """
+        SELECT day, event_count, busy_minutes, first_start, last_end
+        FROM day_buckets
+        WHERE calendar_id = ? AND day >= ? AND day < ?
+        ORDER BY day ASC
+        """,
+        (calendar_id, first_day.isoformat(), end_day.isoformat()),
+    ).fetchall()
+    return [
+        DayBucket(
+            day=date.fromisoformat(row[0]),
+            event_count=int(row[1]),
+            busy_minutes=int(row[2]),
+            first_start=_to_rome(row[3]),
+            last_end=_to_rome(row[4]),
+        )
+        for row in rows
+    ]
@@ -0,0 +1,157 @@
+import os
+import sqlite3
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+
+# Archived events keep their id (events.id is AUTOINCREMENT, so ids are never
+# reused) and stay in the same database file, so a move is one transaction.
+ARCHIVE_SCHEMA = """
+    CREATE TABLE IF NOT EXISTS events_archive (
+        id INTEGER PRIMARY KEY,
+        title TEXT NOT NULL,
+        start_ts TEXT NOT NULL,
+        end_ts TEXT NOT NULL,
+        location TEXT,
+        notes TEXT,
+        created_at TEXT NOT NULL,
+        updated_at TEXT NOT NULL,
+        calendar_id TEXT NOT NULL DEFAULT 'default',
+        archived_at TEXT NOT NULL,
+        version INTEGER NOT NULL DEFAULT 1
+    );
+    CREATE INDEX IF NOT EXISTS idx_events_archive_calendar_end
+        ON events_archive (calendar_id, end_ts);
+    CREATE TABLE IF NOT EXISTS db_maintenance (
+        name TEXT PRIMARY KEY,
+        ran_at TEXT NOT NULL
+    );
+    CREATE TRIGGER IF NOT EXISTS trg_archive_rev_delete AFTER DELETE ON events_archive
+    BEGIN
+        INSERT INTO calendar_revisions (calendar_id, revision) VALUES (OLD.calendar_id, 1)
+        ON CONFLICT(calendar_id) DO UPDATE SET revision = revision + 1;
+    END;
+"""
+
+_EVENT_COLUMNS = (
+    "id, title, start_ts, end_ts, location, notes, created_at, updated_at, calendar_id, version"
+)
+
+
+@dataclass
+class ArchiveReport:
+    archived: int = 0
+    purged: int = 0
+    analyzed: bool = False
+    vacuumed: bool = False
+
+
+def _env_days(name: str) -> int:
+    try:
+        return max(0, int(os.getenv(name, "0")))
+    except ValueError:
+        return 0
+
+
+def archive_after_days() -> int:
+    """Events that ended more than this many days ago are archived; 0 disables."""
+    return _env_days("CALENDAR_ARCHIVE_AFTER_DAYS")
+
+
+def retention_days() -> int:
+    """Archived events that ended more than this many days ago are purged; 0 keeps them."""
+    return _env_days("CALENDAR_ARCHIVE_RETENTION_DAYS")
+
+
+def vacuum_free_ratio() -> float:
+    try:
+        return float(os.getenv("CALENDAR_VACUUM_FREE_RATIO", "0.25"))
+    except ValueError:
+        return 0.25
+
+
+def archive_interval_seconds() -> float:
+    try:
+        return max(60.0, float(os.getenv("CALENDAR_ARCHIVE_INTERVAL_SECONDS", "3600")))
+    except ValueError:
+        return 3600.0
+
+
+def ensure_archive_schema(conn: sqlite3.Connection) -> None:
+    conn.executescript(ARCHIVE_SCHEMA)
+    columns = {row[1] for row in conn.execute("PRAGMA table_info(events_archive)")}
+    if "version" not in columns:
+        conn.execute("ALTER TABLE events_archive ADD COLUMN version INTEGER NOT NULL DEFAULT 1")
+
+
+def archive_reaches(conn: sqlite3.Connection, calendar_id: str, start_iso: str) -> bool:
+    """True if some archived event of the calendar ends after `start_iso`."""
+    row = conn.execute(
+        "SELECT 1 FROM events_archive WHERE calendar_id = ? AND end_ts > ? LIMIT 1",
+        (calendar_id, start_iso),
+    ).fetchone()
+    return row is not None
+
+
+def move_to_archive(conn: sqlite3.Connection, cutoff: datetime, now: datetime) -> list[str]:
+    """
+    Moves events that ended at or before `cutoff` into `events_archive`.
+
+    Returns the calendar id of every moved row. Runs in the caller's transaction.
+    """
+    cutoff_iso = cutoff.isoformat()
+    conn.execute(
+        f"""
+        INSERT OR REPLACE INTO events_archive ({_EVENT_COLUMNS}, archived_at)
+        SELECT {_EVENT_COLUMNS}, ? FROM events WHERE end_ts <= ?
+        """,
+        (now.isoformat(), cutoff_iso),
+    )
+    rows = conn.execute(
+        "DELETE FROM events WHERE end_ts <= ? RETURNING calendar_id", (cutoff_iso,)
+    ).fetchall()
+    return [row[0] for row in rows]
+
+
+def purge_archive(conn: sqlite3.Connection, cutoff: datetime) -> list[str]:
+    rows = conn.execute(
+        "DELETE FROM events_archive WHERE end_ts <= ? RETURNING calendar_id",
+        (cutoff.isoformat(),),
+    ).fetchall()
+    return [row[0] for row in rows]
+
+
+def _mark_ran(conn: sqlite3.Connection, name: str, now: datetime) -> None:
+    conn.execute(
+        "INSERT OR REPLACE INTO db_maintenance (name, ran_at) VALUES (?, ?)",
+        (name, now.isoformat()),
+    )
+
+
+def analyze(conn: sqlite3.Connection, now: datetime) -> None:
+    """Refreshes planner statistics for the tables whose size just changed."""
+    conn.execute("ANALYZE events")
+    conn.execute("ANALYZE events_archive")
+    _mark_ran(conn, "analyze", now)
+
+
+def vacuum_if_fragmented(conn: sqlite3.Connection, now: datetime) -> bool:
+    """
+    Runs VACUUM only when free pages exceed `CALENDAR_VACUUM_FREE_RATIO` of
+    the file (set it to 0 to disable). VACUUM rewrites the whole database and
+    cannot run inside a transaction, so callers must have committed first.
+    """
+    ratio = vacuum_free_ratio()
+    if ratio <= 0 or conn.in_transaction:
+        return False
+    page_count = conn.execute("PRAGMA page_count").fetchone()[0]
+    freelist = conn.execute("PRAGMA freelist_count").fetchone()[0]
+    if page_count == 0 or freelist / page_count < ratio:
+        return False
+    conn.execute("VACUUM")
+    _mark_ran(conn, "vacuum", now)
+    conn.commit()
+    return True
+
+
+def horizon(days: int, now: datetime) -> datetime:
+    return (now - timedelta(days=days)).replace(hour=0, minute=0, second=0, microsecond=0)
@@ -1,5 +1,10 @@
+import asyncio
+import functools
 import os
+import threading
+import time
 from collections import OrderedDict
+from dataclasses import dataclass, field
 from typing import Any
 
 from datapizza.core.cache import Cache
@@ -47,30 +52,138 @@ def _record_cache_savings(layer: str, value: Any) -> None:
     )
 
 
+def _wait_timeout_s() -> float:
+    try:
+        return max(0.0, float(os.getenv("CALENDAR_CLIENT_CACHE_WAIT_SECONDS", "30")))
+    except ValueError:
+        return 30.0
+
+
+def _in_event_loop() -> bool:
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return False
+    return True
+
+
+@dataclass
+class _InFlight:
+    owner: int
+    started: float
+    done: threading.Event = field(default_factory=threading.Event)
+    value: Any = None
+
+
+@dataclass
+class CacheStats:
+    hits: int = 0
+    misses: int = 0
+    coalesced: int = 0
+
+
 class InMemoryLRUCache(Cache):
+    """
+    Thread-safe LRU for client responses with single-flight misses.
+
+    The Datapizza `@cacheable` wrapper calls `get`, runs the model call on a
+    miss, then calls `set`. The first thread to miss a key becomes its leader;
+    other threads that miss the same key while the call is in flight block in
+    `get` until the leader's `set` and then share its response instead of
+    paying for an identical call. Waiters make the call themselves once the
+    leader has been in flight for `CALENDAR_CLIENT_CACHE_WAIT_SECONDS`, or as
+    soon as its call fails (see `release_on_error`). Code running on an
+    event loop never blocks: it skips single-flight and calls directly.
+    """
+
     def __init__(self, maxsize: int = 128):
         self.maxsize = maxsize
         self._enabled = _env_enabled("CALENDAR_CLIENT_CACHE_ENABLED", "1")
         self._cache: OrderedDict[str, Any] = OrderedDict()
+        self._inflight: dict[str, _InFlight] = {}
+        self._lock = threading.Lock()
+        self.stats = CacheStats()
 
     def get(self, key: str) -> Any | None:
         if not self._enabled:
             return None
-        if key not in self._cache:
+        me = threading.get_ident()
+        timeout = _wait_timeout_s()
+        on_loop = _in_event_loop()
+        with self._lock:
+            if key in self._cache:
+                self._cache.move_to_end(key)
+                value = self._cache[key]
+                self.stats.hits += 1
+            else:
+                value = None
+                pending = self._inflight.get(key)
+                expired = pending is not None and time.monotonic() - pending.started > timeout
+                if pending is None or pending.owner == me or expired or on_loop:
+                    # Become (or stay) the leader; a stale or own entry is replaced.
+                    if not on_loop:
+                        self._inflight[key] = _InFlight(owner=me, started=time.monotonic())
+                    self.stats.misses += 1
+                    return None
+        if value is not None:
+            _mark_cache_hit("client")
+            _record_cache_savings("client", value)
+            return value
+
+        # Waiters share the leader's deadline rather than starting a fresh one.
+        remaining = max(0.0, timeout - (time.monotonic() - pending.started))
+        if not pending.done.wait(remaining) or pending.value is None:
+            with self._lock:
+                self.stats.misses += 1
             return None
-        value = self._cache.pop(key)
-        self._cache[key] = value
-        _mark_cache_hit("client")
-        _record_cache_savings("client", value)
-        return value
+        with self._lock:
+            self.stats.coalesced += 1
+        _mark_cache_hit("singleflight")
+        _record_cache_savings("singleflight", pending.value)
+        return pending.value
 
     def set(self, key: str, value: Any) -> None:
-        if not self._enabled:
-            return None
-        if self.maxsize <= 0:
-            return None
-        if key in self._cache:
-            self._cache.pop(key)
-        self._cache[key] = value
-        if len(self._cache) > self.maxsize:
-            self._cache.popitem(last=False)
+        with self._lock:
+            pending = self._inflight.pop(key, None)
+            if self._enabled and self.maxsize > 0:
+                self._cache[key] = value
+                self._cache.move_to_end(key)
+                if len(self._cache) > self.maxsize:
+                    self._cache.popitem(last=False)
+        if pending is not None:
+            pending.value = value
+            pending.done.set()
+
+    def abandon(self) -> None:
+        """Releases the keys this thread leads after its call failed; waiters fall back at once."""
+        me = threading.get_ident()
+        with self._lock:
+            keys = [key for key, pending in self._inflight.items() if pending.owner == me]
+            released = [self._inflight.pop(key) for key in keys]
+        for pending in released:
+            pending.done.set()
+
+
+def release_on_error(client: Any) -> None:
+    """
+    Wraps the client's cached sync calls so a failing leader releases its
+    single-flight keys: `@cacheable` never reaches `set` after an exception.
+    """
+    cache = getattr(client, "cache", None)
+    if not isinstance(cache, InMemoryLRUCache) or getattr(client, "_releases_on_error", False):
+        return
+    for name in ("invoke", "structured_response"):
+        call = getattr(client, name, None)
+        if call is None:
+            continue
+
+        @functools.wraps(call)
+        def guarded(*args: Any, _call: Any = call, **kwargs: Any) -> Any:
+            try:
+                return _call(*args, **kwargs)
+            except BaseException:
+                cache.abandon()
+                raise
+
+        setattr(client, name, guarded)
+    client._releases_on_error = True
@@ -0,0 +1,225 @@
+import os
+import re
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any
+
+from datapizza.type import ROLE, TextBlock
+from opentelemetry import trace
+
+from . import tools
+from .timeparse import resolve_range
+from .utils import env_truthy
+
+
+def intent_cache_enabled() -> bool:
+    return env_truthy("CALENDAR_INTENT_CACHE", "0")
+
+
+def _max_entries() -> int:
+    try:
+        return max(1, int(os.getenv("CALENDAR_INTENT_CACHE_SIZE", "256")))
+    except ValueError:
+        return 256
+
+
+_WORD_RE = re.compile(r"[a-z]+|\d+")
+# Relative range words understood by `resolve_range`, most specific first.
+_ANCHORS = ("today", "tomorrow", "next week", "this week")
+_PARTS = ("morning", "afternoon", "evening")
+_RANGE_WORDS = {"today", "tomorrow", "next", "this", "week", *_PARTS}
+# A turn is only a cacheable "list" intent if it asks to see the calendar...
+_LIST_CUES = {
+    "what", "whats", "show", "list", "agenda", "schedule", "events", "event",
+    "planned", "anything", "happening", "calendar",
+}
+# ...and every other word is filler. Any other word (a write verb, a title,
+# a person, "free") may change the answer, so such turns bypass the cache.
+_FILLER = {
+    "s", "is", "are", "do", "does", "i", "have", "got", "my", "me", "the", "on",
+    "for", "in", "there", "please", "can", "you", "tell", "of", "all", "going",
+    "how", "look", "looks", "like", "a", "any",
+}
+
+
+@dataclass(frozen=True)
+class Intent:
+    """Normalized form of a read-only turn; equal intents share one answer."""
+
+    action: str
+    anchor: str
+    start: str
+    end: str
+    mode: str
+
+
+def classify_intent(text: str, now: datetime, structured: bool) -> Intent | None:
+    """
+    Maps a user message to a cacheable `Intent`, or None if it is not a plain
+    "show my calendar for <range>" request that `timeparse` can resolve.
+    """
+    lowered = text.lower()
+    words = _WORD_RE.findall(lowered)
+    if not any(w in _LIST_CUES for w in words):
+        return None
+    if any(w not in _LIST_CUES and w not in _FILLER and w not in _RANGE_WORDS for w in words):
+        return None
+    resolved = resolve_range(lowered, now)
+    if resolved is None:
+        return None
+    anchor = next(a for a in _ANCHORS if a in lowered)
+    part = next((p for p in _PARTS if p in lowered), "")
+    return Intent(
+        action="list",
+        # Chat answers say "today"/"tomorrow", so the wording is part of the intent.
+        anchor=f"{anchor} {part}".strip(),
+        start=resolved[0],
+        end=resolved[1],
+        mode="structured" if structured else "chat",
+    )
+
+
+@dataclass
+class IntentCacheStats:
+    hits: int = 0
+    misses: int = 0
+    bypassed: int = 0
+
+    @property
+    def lookups(self) -> int:
+        return self.hits + self.misses
+
+    @property
+    def hit_rate(self) -> float:
+        return self.hits / self.lookups if self.lookups else 0.0
+
+
+@dataclass
+class _Entry:
+    text: str
+    prompt_tokens: int
+    completion_tokens: int
+    cached_tokens: int
+
+
+@dataclass
+class IntentLookup:
+    """Result of `IntentCache.lookup`; pass it back to `store` on a miss."""
+
+    intent: Intent | None
+    key: tuple | None = None
+    text: str | None = None
+
+    @property
+    def hit(self) -> bool:
+        return self.text is not None
+
+
+class IntentCache:
+    """
+    Final answers of read-only turns keyed by (database, calendar, intent,
+    persisted revision). A write to the calendar moves its revision, which
+    drops every entry stored for that calendar.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[tuple, _Entry] = OrderedDict()
+        self._revisions: dict[tuple[str, str], int] = {}
+        self.stats = IntentCacheStats()
+
+    def _key(self, intent: Intent) -> tuple:
+        calendar_id = tools._calendar_id()
+        scope = (tools._get_db_path(), calendar_id)
+        revision = tools._validate_tool_cache(calendar_id)
+        if self._revisions.get(scope, revision) != revision:
+            for key in [k for k in self._entries if k[:2] == scope]:
+                del self._entries[key]
+        self._revisions[scope] = revision
+        return (*scope, intent, revision)
+
+    def lookup(self, message: str, now: datetime, structured: bool) -> IntentLookup:
+        """Returns the cached answer for `message`, if any. No-op when disabled."""
+        if not intent_cache_enabled():
+            return IntentLookup(None)
+        intent = classify_intent(message, now, structured)
+        if intent is None or tools._has_pending_writes():
+            with self._lock:
+                self.stats.bypassed += 1
+            return IntentLookup(None)
+        with self._lock:
+            key = self._key(intent)
+            entry = self._entries.get(key)
+            if entry is None:
+                self.stats.misses += 1
+            else:
+                self._entries.move_to_end(key)
+                self.stats.hits += 1
+        _record_lookup("hit" if entry else "miss", self.stats, entry)
+        return IntentLookup(intent, key, entry.text if entry else None)
+
+    def store(self, lookup: IntentLookup, text: str, usage: Any | None = None) -> bool:
+        """Caches `text` unless the turn (or anyone else) changed the calendar."""
+        if lookup.intent is None or lookup.hit:
+            return False
+        with self._lock:
+            if self._key(lookup.intent) != lookup.key:
+                return False
+            self._entries[lookup.key] = _Entry(
+                text,
+                int(getattr(usage, "prompt_tokens", 0) or 0),
+                int(getattr(usage, "completion_tokens", 0) or 0),
+                int(getattr(usage, "cached_tokens", 0) or 0),
+            )
+            while len(self._entries) > _max_entries():
+                self._entries.popitem(last=False)
+        return True
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._revisions.clear()
+            self.stats = IntentCacheStats()
+
+
+def _record_lookup(outcome: str, stats: IntentCacheStats, entry: _Entry | None) -> None:
+    span = trace.get_current_span()
+    if span is None or not getattr(span, "is_recording", lambda: False)():
+        return
+    span.add_event(
+        "intent_cache.lookup",
+        {
+            "intent_cache.outcome": outcome,
+            "intent_cache.session_hits": stats.hits,
+            "intent_cache.session_lookups": stats.lookups,
+        },
+    )
+    if entry is None:
+        return
+    span.add_event("cache.hit", {"cache.layer": "intent"})
+    span.add_event(
+        "cache.hit",
+        {
+            "cache.layer": "intent",
+            "cache.saved_prompt_tokens": entry.prompt_tokens,
+            "cache.saved_completion_tokens": entry.completion_tokens,
+            "cache.saved_cached_tokens": entry.cached_tokens,
+            "cache.saved_total_tokens": (
+                entry.prompt_tokens + entry.completion_tokens + entry.cached_tokens
+            ),
+        },
+    )
+
+
+def remember_turn(agent: Any, message: str, text: str) -> None:
+    """Adds a cache-served exchange to the agent's memory so follow-ups see it."""
+    memory = getattr(agent, "_memory", None)
+    if memory is None:
+        return
+    memory.add_turn(TextBlock(content=message), role=ROLE.USER)
+    memory.add_turn(TextBlock(content=text), role=ROLE.ASSISTANT)
+
+
+INTENT_CACHE = IntentCache()
@@ -0,0 +1,128 @@
+import logging
+import os
+import queue
+import threading
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Any, Callable
+from zoneinfo import ZoneInfo
+
+from .timeparse import resolve_range
+from .utils import env_truthy
+
+log = logging.getLogger(__name__)
+
+ROME_TZ = ZoneInfo("Europe/Rome")
+# Phrases users typically ask next; resolved with timeparse against "now".
+# Week ranges are the most common follow-ups, so they rank ahead of days.
+WEEK_PHRASES = ("this week", "next week")
+DAY_PHRASES = ("today", "tomorrow")
+
+
+def prefetch_enabled() -> bool:
+    return env_truthy("CALENDAR_PREFETCH", "0")
+
+
+def _max_ranges() -> int:
+    try:
+        return max(0, int(os.getenv("CALENDAR_PREFETCH_MAX_RANGES", "4")))
+    except ValueError:
+        return 4
+
+
+def _phrase_ranges(phrases: tuple[str, ...], now: datetime) -> list[tuple[str, str]]:
+    return [r for r in (resolve_range(p, now) for p in phrases) if r is not None]
+
+
+def adjacent_ranges(
+    start: datetime, end: datetime, now: datetime
+) -> list[tuple[str, str]]:
+    """
+    Ranges a user is likely to ask for after [start, end), most likely first:
+    the next window of the same length, the "this week"/"next week" ranges
+    from `timeparse.resolve_range`, the rest of that week, then "today" and
+    "tomorrow". The cap keeps the head of this list.
+    """
+    ranges: list[tuple[str, str]] = []
+    length = end - start
+    if length > timedelta(0):
+        ranges.append((end.isoformat(), (end + length).isoformat()))
+
+    ranges.extend(_phrase_ranges(WEEK_PHRASES, now))
+
+    day_start = end.replace(hour=0, minute=0, second=0, microsecond=0)
+    next_monday = day_start + timedelta(days=7 - day_start.weekday())
+    if end < next_monday:
+        ranges.append((end.isoformat(), next_monday.isoformat()))
+
+    ranges.extend(_phrase_ranges(DAY_PHRASES, now))
+
+    served = (start.isoformat(), end.isoformat())
+    unique: list[tuple[str, str]] = []
+    for r in ranges:
+        if r != served and r not in unique:
+            unique.append(r)
+    return unique[: _max_ranges()]
+
+
+@dataclass
+class PrefetchStats:
+    scheduled: int = 0
+    filled: int = 0
+    cancelled: int = 0
+    hits: int = 0
+
+
+class Prefetcher:
+    """
+    Single idle worker thread that warms caches in the background.
+
+    Jobs are tagged with their calendar's generation; `cancel()` bumps the
+    generation so queued and in-flight jobs for that calendar are dropped.
+    """
+
+    def __init__(self) -> None:
+        self._queue: queue.Queue[tuple[str, int, Callable[..., Any], tuple]] = queue.Queue()
+        self._lock = threading.Lock()
+        self._generations: dict[str, int] = {}
+        self._thread: threading.Thread | None = None
+        self.stats = PrefetchStats()
+
+    def generation(self, calendar_id: str) -> int:
+        return self._generations.get(calendar_id, 0)
+
+    def is_current(self, calendar_id: str, generation: int) -> bool:
+        return self.generation(calendar_id) == generation
+
+    def schedule(self, calendar_id: str, fn: Callable[..., Any], *args: Any) -> None:
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(
+                    target=self._run, name="calendar-prefetch", daemon=True
+                )
+                self._thread.start()
+            self.stats.scheduled += 1
+            self._queue.put((calendar_id, self.generation(calendar_id), fn, args))
+
+    def cancel(self, calendar_id: str) -> None:
+        with self._lock:
+            self._generations[calendar_id] = self.generation(calendar_id) + 1
+
+    def wait_idle(self) -> None:
+        self._queue.join()
+
+    def _run(self) -> None:
+        while True:
+            calendar_id, generation, fn, args = self._queue.get()
+            try:
+                if not self.is_current(calendar_id, generation):
+                    self.stats.cancelled += 1
+                    continue
+                fn(generation, *args)
+            except Exception as e:
+                log.debug(f"Prefetch job failed: {e}")
+            finally:
+                self._queue.task_done()
+
+
+PREFETCHER = Prefetcher()
@@ -0,0 +1,193 @@
+import cProfile
+import os
+import pstats
+import tracemalloc
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Iterator
+
+from .utils import env_truthy
+
+# Caps the frames kept (leaf side) in each collapsed stack.
+_MAX_STACK_DEPTH = 64
+
+
+@dataclass
+class HotFunction:
+    name: str
+    calls: int
+    self_ms: float
+    cumulative_ms: float
+
+
+@dataclass
+class AllocationSite:
+    location: str
+    size_kib: float
+    count: int
+
+
+@dataclass
+class TurnProfile:
+    turn_index: int
+    pstats_path: str | None = None
+    collapsed_path: str | None = None
+    peak_memory_kib: float = 0.0
+    hot_functions: list[HotFunction] = field(default_factory=list)
+    allocation_sites: list[AllocationSite] = field(default_factory=list)
+
+
+def profiling_enabled() -> bool:
+    return env_truthy("CALENDAR_PROFILE", "0")
+
+
+def _profile_dir() -> str:
+    return os.getenv("CALENDAR_PROFILE_DIR", "./data/profiles")
+
+
+def _top_n() -> int:
+    try:
+        return max(1, int(os.getenv("CALENDAR_PROFILE_TOP", "10")))
+    except ValueError:
+        return 10
+
+
+def _func_label(func: tuple[str, int, str]) -> str:
+    filename, lineno, name = func
+    if filename == "~":
+        # Built-ins are reported as ("~", 0, "<built-in method ...>")
+        return name
+    return f"{os.path.basename(filename)}:{lineno}({name})"
+
+
+def _collapsed_stacks(stats: pstats.Stats) -> dict[str, float]:
+    """
+    Folds the cProfile caller/callee graph into collapsed stacks.
+
+    cProfile only keeps one level of callers, so each function gets a single
+    ancestry: its heaviest caller's (memoized) stack, capped at
+    `_MAX_STACK_DEPTH` frames. Its self time is then split across its direct
+    callers in proportion to each edge's cumulative time. The work is bounded
+    by the number of edges rather than the number of call paths. Weights are
+    in microseconds, which is what flamegraph.pl and speedscope expect for
+    the collapsed ("folded") format.
+    """
+    raw = stats.stats  # type: ignore[attr-defined]
+    paths: dict[tuple, list[str]] = {}
+
+    def hot_path(func: tuple) -> list[str]:
+        chain: list[tuple] = []
+        seen: set[tuple] = set()
+        node: tuple | None = func
+        while node is not None and node not in paths and node not in seen:
+            seen.add(node)
+            chain.append(node)
+            callers = raw[node][4] if node in raw else {}
+            node = max(callers, key=lambda c: callers[c][3]) if callers else None
+        prefix = paths.get(node, []) if node is not None else []
+        for frame in reversed(chain):
+            prefix = (prefix + [_func_label(frame)])[-_MAX_STACK_DEPTH:]
+            paths[frame] = prefix
+        return paths[func]
+
+    stacks: dict[str, float] = {}
+    for func, (_, _, self_time, _, callers) in raw.items():
+        if self_time <= 0:
+            continue
+        total = sum(edge[3] for edge in callers.values())
+        if total <= 0:
+            key = ";".join(hot_path(func))
+            stacks[key] = stacks.get(key, 0.0) + self_time * 1_000_000
+            continue
+        label = _func_label(func)
+        for caller, edge in callers.items():
+            if edge[3] <= 0:
+                continue
+            frames = (hot_path(caller) + [label])[-_MAX_STACK_DEPTH:]
+            key = ";".join(frames)
+            stacks[key] = stacks.get(key, 0.0) + self_time * edge[3] / total * 1_000_000
+    return stacks
+
+
+def _write_collapsed(stats: pstats.Stats, path: str) -> None:
+    stacks = _collapsed_stacks(stats)
+    with open(path, "w", encoding="utf-8") as fh:
+        for stack, weight in sorted(stacks.items()):
+            micros = int(round(weight))
+            if micros > 0:
+                fh.write(f"{stack} {micros}\n")
+
+
+def _hot_functions(stats: pstats.Stats, limit: int) -> list[HotFunction]:
+    raw = stats.stats  # type: ignore[attr-defined]
+    ranked = sorted(raw.items(), key=lambda item: item[1][2], reverse=True)
+    return [
+        HotFunction(
+            name=_func_label(func),
+            calls=int(nc),
+            self_ms=round(tt * 1000, 3),
+            cumulative_ms=round(ct * 1000, 3),
+        )
+        for func, (_, nc, tt, ct, _) in ranked[:limit]
+    ]
+
+
+def _allocation_sites(
+    before: tracemalloc.Snapshot, after: tracemalloc.Snapshot, limit: int
+) -> list[AllocationSite]:
+    sites = []
+    for stat in after.compare_to(before, "lineno"):
+        if stat.size_diff <= 0:
+            continue
+        frame = stat.traceback[0]
+        sites.append(
+            AllocationSite(
+                location=f"{os.path.basename(frame.filename)}:{frame.lineno}",
+                size_kib=round(stat.size_diff / 1024, 2),
+                count=int(stat.count_diff),
+            )
+        )
+        if len(sites) >= limit:
+            break
+    return sites
+
+
+@contextmanager
+def profile_turn(session_id: str, turn_index: int) -> Iterator[TurnProfile]:
+    """
+    Profiles one agent turn with cProfile and tracemalloc.
+
+    Writes `<session>-turn<NN>.pstats` and `.folded` files into
+    `CALENDAR_PROFILE_DIR` and fills the yielded `TurnProfile` with the
+    hottest functions and allocation sites once the block exits.
+    """
+    profile = TurnProfile(turn_index=turn_index)
+    limit = _top_n()
+    started_tracemalloc = not tracemalloc.is_tracing()
+    if started_tracemalloc:
+        tracemalloc.start()
+    tracemalloc.reset_peak()
+    before = tracemalloc.take_snapshot()
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        yield profile
+    finally:
+        profiler.disable()
+        after = tracemalloc.take_snapshot()
+        _, peak = tracemalloc.get_traced_memory()
+        if started_tracemalloc:
+            tracemalloc.stop()
+
+        out_dir = _profile_dir()
+        os.makedirs(out_dir, exist_ok=True)
+        base = os.path.join(out_dir, f"{session_id[:8]}-turn{turn_index:02d}")
+        stats = pstats.Stats(profiler)
+        profile.pstats_path = f"{base}.pstats"
+        profile.collapsed_path = f"{base}.folded"
+        stats.dump_stats(profile.pstats_path)
+        _write_collapsed(stats, profile.collapsed_path)
+
+        profile.peak_memory_kib = round(peak / 1024, 2)
+        profile.hot_functions = _hot_functions(stats, limit)
+        profile.allocation_sites = _allocation_sites(before, after, limit)
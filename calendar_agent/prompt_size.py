@@ -0,0 +1,133 @@
+import inspect
+import json
+import math
+import os
+import threading
+from dataclasses import dataclass, field
+from functools import wraps
+from typing import Any
+
+from datapizza.type import FunctionCallBlock, FunctionCallResultBlock, TextBlock
+from opentelemetry import trace
+
+# Prompt components in the order they are sent to the model.
+COMPONENTS = ("system", "tools", "memory", "tool_outputs", "input")
+
+
+def _chars_per_token() -> float:
+    try:
+        return max(1.0, float(os.getenv("CALENDAR_CHARS_PER_TOKEN", "4")))
+    except ValueError:
+        return 4.0
+
+
+def estimate_tokens(chars: int) -> int:
+    """Rough token count for `chars` characters (no tokenizer round trip)."""
+    return math.ceil(chars / _chars_per_token())
+
+
+def _block_chars(block: Any) -> int:
+    if isinstance(block, TextBlock):
+        return len(block.content or "")
+    if isinstance(block, FunctionCallBlock):
+        return len(block.name) + len(json.dumps(block.arguments, default=str))
+    if isinstance(block, FunctionCallResultBlock):
+        return len(str(block.result))
+    return len(str(block))
+
+
+@dataclass
+class PromptBreakdown:
+    """Characters each prompt component contributes to one LLM call."""
+
+    chars: dict[str, int] = field(default_factory=lambda: dict.fromkeys(COMPONENTS, 0))
+
+    def tokens(self) -> dict[str, int]:
+        return {name: estimate_tokens(count) for name, count in self.chars.items()}
+
+    def __iadd__(self, other: "PromptBreakdown") -> "PromptBreakdown":
+        for name, count in other.chars.items():
+            self.chars[name] = self.chars.get(name, 0) + count
+        return self
+
+
+def measure_prompt(
+    input: Any, tools: list | None, memory: Any, system_prompt: str | None
+) -> PromptBreakdown:
+    breakdown = PromptBreakdown()
+    chars = breakdown.chars
+    chars["system"] = len(system_prompt or "")
+    chars["tools"] = sum(len(json.dumps(tool.schema, default=str)) for tool in tools or [])
+    for block in memory.iter_blocks() if memory is not None else []:
+        # Tool results (e.g. long list_events outputs) are reported apart from
+        # the rest of the conversation since they are the usual trim target.
+        key = "tool_outputs" if isinstance(block, FunctionCallResultBlock) else "memory"
+        chars[key] += _block_chars(block)
+    if isinstance(input, str):
+        chars["input"] = len(input)
+    else:
+        chars["input"] = sum(_block_chars(b) for b in input or [])
+    return breakdown
+
+
+def _record(breakdown: PromptBreakdown) -> None:
+    span = trace.get_current_span()
+    if span is None or not getattr(span, "is_recording", lambda: False)():
+        return
+    tokens = breakdown.tokens()
+    for name in COMPONENTS:
+        span.set_attribute(f"prompt.{name}_chars", breakdown.chars[name])
+        span.set_attribute(f"prompt.{name}_tokens_est", tokens[name])
+
+
+class PromptTotals:
+    """Per-session sum of the prompt breakdowns of every model call."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.calls = 0
+        self.breakdown = PromptBreakdown()
+
+    def add(self, breakdown: PromptBreakdown) -> None:
+        with self._lock:
+            self.calls += 1
+            self.breakdown += breakdown
+
+
+def instrument_prompt_size(client: Any, totals: PromptTotals | None = None) -> PromptTotals:
+    """
+    Wraps the client's provider calls so every generation span carries a
+    `prompt.<component>_chars` / `prompt.<component>_tokens_est` breakdown.
+    Cache hits never reach the provider and are therefore not counted.
+    Pass `totals` to share one session total across several clients.
+    """
+    existing = getattr(client, "_prompt_totals", None)
+    if existing is not None:
+        return existing
+    totals = totals or PromptTotals()
+    client._prompt_totals = totals
+
+    def measured(call):
+        signature = inspect.signature(call)
+
+        @wraps(call)
+        def wrapper(*args, **kwargs):
+            # Client.invoke passes keywords, Client.stream_invoke positionals.
+            bound = signature.bind_partial(*args, **kwargs).arguments
+            extra = bound.get("kwargs", {})
+            breakdown = measure_prompt(
+                bound.get("input"),
+                bound.get("tools"),
+                bound.get("memory"),
+                bound.get("system_prompt", extra.get("system_prompt")),
+            )
+            _record(breakdown)
+            totals.add(breakdown)
+            return call(*args, **kwargs)
+
+        return wrapper
+
+    for name in ("_invoke", "_a_invoke", "_stream_invoke", "_a_stream_invoke"):
+        if hasattr(client, name):
+            setattr(client, name, measured(getattr(client, name)))
+    return totals
@@ -0,0 +1,211 @@
+import sqlite3
+import sys
+import threading
+from array import array
+from bisect import bisect_left
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Iterable
+from zoneinfo import ZoneInfo
+
+from .utils import env_truthy
+
+ROME_TZ = ZoneInfo("Europe/Rome")
+
+
+def read_model_enabled() -> bool:
+    return env_truthy("CALENDAR_READ_MODEL", "0")
+
+
+def _epoch(ts: str) -> float:
+    dt = datetime.fromisoformat(ts)
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=ROME_TZ)
+    return dt.timestamp()
+
+
+def _iso(epoch: float) -> str:
+    return datetime.fromtimestamp(epoch, ROME_TZ).isoformat()
+
+
+@dataclass
+class ReadModelChanges:
+    """Write-through delta recorded by one write tool."""
+
+    upserts: list[dict] = field(default_factory=list)
+    deletes: list[int] = field(default_factory=list)
+
+
+class CalendarIndex:
+    """
+    One calendar's `events` rows held in parallel array-backed columns
+    sorted by (start, id).
+
+    Starts and ends are epoch seconds in `array('d')`, ids and versions in
+    `array('q')`; titles are interned so recurring titles share one string.
+    Overlap queries bisect on the start column: every event starting before
+    the range end is a candidate, and `max_duration` bounds how far back an
+    event can start and still reach into the range.
+    """
+
+    def __init__(self, revision: int, archive_horizon: float | None) -> None:
+        self.revision = revision
+        # Ranges starting before this may include archived events.
+        self.archive_horizon = archive_horizon
+        self.lock = threading.RLock()
+        self.starts = array("d")
+        self.ends = array("d")
+        self.ids = array("q")
+        self.versions = array("q")
+        self.titles: list[str] = []
+        self.locations: list[str | None] = []
+        self.notes: list[str | None] = []
+        self.max_duration = 0.0
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def nbytes(self) -> int:
+        """Approximate footprint of the columns (strings counted once)."""
+        arrays = sum(a.itemsize * len(a) for a in (self.starts, self.ends, self.ids, self.versions))
+        lists = sum(sys.getsizeof(col) for col in (self.titles, self.locations, self.notes))
+        strings = sum(
+            sys.getsizeof(s)
+            for s in {id(t): t for t in (*self.titles, *self.locations, *self.notes) if t}.values()
+        )
+        return arrays + lists + strings
+
+    def load(self, rows: Iterable) -> None:
+        entries = sorted(
+            (
+                _epoch(r["start_ts"]),
+                int(r["id"]),
+                _epoch(r["end_ts"]),
+                r["title"],
+                r["location"],
+                r["notes"],
+                int(r["version"]),
+            )
+            for r in rows
+        )
+        for start, event_id, end, title, location, notes, version in entries:
+            self.starts.append(start)
+            self.ids.append(event_id)
+            self.ends.append(end)
+            self.titles.append(sys.intern(title))
+            self.locations.append(sys.intern(location) if location else location)
+            self.notes.append(notes)
+            self.versions.append(version)
+            self.max_duration = max(self.max_duration, end - start)
+
+    def covers(self, start_iso: str) -> bool:
+        """False if archived events may overlap a range starting at `start_iso`."""
+        return self.archive_horizon is None or self.archive_horizon <= _epoch(start_iso)
+
+    def query(self, start_iso: str, end_iso: str) -> list[dict]:
+        s, e = _epoch(start_iso), _epoch(end_iso)
+        with self.lock:
+            hi = bisect_left(self.starts, e)
+            lo = bisect_left(self.starts, s - self.max_duration, 0, hi)
+            return [self._row(i) for i in range(lo, hi) if self.ends[i] > s]
+
+    def _row(self, i: int) -> dict:
+        return {
+            "id": self.ids[i],
+            "title": self.titles[i],
+            "start_ts": _iso(self.starts[i]),
+            "end_ts": _iso(self.ends[i]),
+            "location": self.locations[i],
+            "notes": self.notes[i],
+            "version": self.versions[i],
+        }
+
+    def _remove(self, event_id: int) -> None:
+        try:
+            i = self.ids.index(event_id)
+        except ValueError:
+            return
+        for col in (self.starts, self.ends, self.ids, self.versions, self.titles, self.locations, self.notes):
+            del col[i]
+
+    def apply(self, changes: ReadModelChanges) -> None:
+        with self.lock:
+            for event_id in changes.deletes:
+                self._remove(event_id)
+            for row in changes.upserts:
+                event_id = int(row["id"])
+                self._remove(event_id)
+                start, end = _epoch(row["start_ts"]), _epoch(row["end_ts"])
+                i = bisect_left(self.starts, start)
+                while i < len(self.starts) and self.starts[i] == start and self.ids[i] < event_id:
+                    i += 1
+                self.starts.insert(i, start)
+                self.ids.insert(i, event_id)
+                self.ends.insert(i, end)
+                self.versions.insert(i, int(row.get("version", 1)))
+                self.titles.insert(i, sys.intern(row["title"]))
+                location = row.get("location")
+                self.locations.insert(i, sys.intern(location) if location else location)
+                self.notes.insert(i, row.get("notes"))
+                self.max_duration = max(self.max_duration, end - start)
+
+
+class ReadModel:
+    """Process-wide registry of loaded `CalendarIndex`es, keyed by (db_path, calendar_id)."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._indexes: dict[tuple[str, str], CalendarIndex] = {}
+
+    def get(self, db_path: str, calendar_id: str) -> CalendarIndex | None:
+        with self._lock:
+            return self._indexes.get((db_path, calendar_id))
+
+    def load(
+        self, conn: sqlite3.Connection, db_path: str, calendar_id: str, revision: int
+    ) -> CalendarIndex:
+        horizon = conn.execute(
+            "SELECT MAX(end_ts) FROM events_archive WHERE calendar_id = ?", (calendar_id,)
+        ).fetchone()[0]
+        index = CalendarIndex(revision, _epoch(horizon) if horizon else None)
+        index.load(
+            conn.execute(
+                "SELECT id, title, start_ts, end_ts, location, notes, version "
+                "FROM events WHERE calendar_id = ?",
+                (calendar_id,),
+            )
+        )
+        with self._lock:
+            self._indexes[(db_path, calendar_id)] = index
+        return index
+
+    def advance(
+        self,
+        db_path: str,
+        calendar_id: str,
+        old_revision: int,
+        new_revision: int,
+        changes: list[ReadModelChanges] | None,
+    ) -> None:
+        """
+        Applies the write-through deltas of a committed write. Without deltas
+        (external writers, archiving) or if the index missed a revision, the
+        index is dropped and reloaded on the next read.
+        """
+        with self._lock:
+            index = self._indexes.get((db_path, calendar_id))
+            if index is None:
+                return
+            if changes is None or index.revision != old_revision:
+                del self._indexes[(db_path, calendar_id)]
+                return
+        for delta in changes:
+            index.apply(delta)
+        index.revision = new_revision
+
+    def clear(self) -> None:
+        with self._lock:
+            self._indexes.clear()
+
+
+READ_MODEL = ReadModel()
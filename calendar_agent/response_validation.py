@@ -0,0 +1,214 @@
+import json
+import os
+import re
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Any, Callable
+
+from opentelemetry import trace
+from pydantic import TypeAdapter, ValidationError
+
+from .response_models import CalendarResponse
+
+REASK_PROMPT = (
+    "Your previous reply is not valid JSON for the required schema ({error}). "
+    "Reply again with ONLY the corrected JSON object, no other text."
+)
+
+_FENCE_RE = re.compile(r"```(?:json)?\s*(.*?)```", re.DOTALL | re.IGNORECASE)
+_ID_LISTS = ("created_ids", "updated_ids", "deleted_ids")
+_ACTIONS = {"list", "add", "update", "delete", "clarify", "other"}
+_STATUSES = {"ok", "needs_clarification", "error"}
+
+
+@dataclass
+class ValidationOutcome:
+    status: str  # "valid", "repaired" or "invalid"
+    text: str
+    response: CalendarResponse | None = None
+    repairs: list[str] = field(default_factory=list)
+    error: str | None = None
+
+
+@dataclass
+class ValidationStats:
+    valid: int = 0
+    repaired: int = 0
+    retried: int = 0
+    failed: int = 0
+
+
+STATS = ValidationStats()
+
+
+@lru_cache(maxsize=1)
+def _adapter() -> TypeAdapter[CalendarResponse]:
+    # Building the core schema is the expensive part; do it once per process.
+    return TypeAdapter(CalendarResponse)
+
+
+def _max_retries() -> int:
+    try:
+        return max(0, int(os.getenv("CALENDAR_STRUCTURED_MAX_RETRIES", "1")))
+    except ValueError:
+        return 1
+
+
+def _dump(response: CalendarResponse) -> str:
+    return response.model_dump_json(exclude_none=False)
+
+
+def _short_error(exc: ValidationError) -> str:
+    first = exc.errors()[0]
+    loc = ".".join(str(p) for p in first.get("loc", ())) or "root"
+    return f"{loc}: {first.get('msg', 'invalid')}"
+
+
+def _extract_json(text: str, repairs: list[str]) -> Any:
+    """Pulls the JSON object out of code fences or surrounding prose."""
+    fenced = _FENCE_RE.search(text)
+    if fenced:
+        text = fenced.group(1)
+        repairs.append("strip_fence")
+    start, end = text.find("{"), text.rfind("}")
+    if start == -1 or end <= start:
+        raise ValueError("no JSON object found")
+    if text[:start].strip() or text[end + 1:].strip():
+        repairs.append("strip_prose")
+    return json.loads(text[start:end + 1])
+
+
+def _to_int(value: Any) -> Any:
+    if isinstance(value, str) and value.strip().lstrip("#").isdigit():
+        return int(value.strip().lstrip("#"))
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    return value
+
+
+def _infer_action(data: dict) -> str:
+    if data.get("question"):
+        return "clarify"
+    for key, action in (("created_ids", "add"), ("updated_ids", "update"), ("deleted_ids", "delete")):
+        if data.get(key):
+            return action
+    return "list" if data.get("events") else "other"
+
+
+def _repair_fields(data: dict, repairs: list[str]) -> dict:
+    data = dict(data)
+    if data.get("mode") not in ("structured", "chat"):
+        data["mode"] = "structured"
+        repairs.append("mode")
+    for key in _ID_LISTS + ("events",):
+        value = data.get(key)
+        if value is None:
+            if key in data:
+                data[key] = []
+                repairs.append(f"{key}_null")
+            continue
+        if not isinstance(value, list):
+            data[key] = [value]
+            repairs.append(f"{key}_scalar")
+    for key in _ID_LISTS:
+        coerced = [_to_int(v) for v in data.get(key, [])]
+        if coerced != data.get(key, []):
+            data[key] = coerced
+            repairs.append(f"{key}_types")
+    events = []
+    for event in data.get("events", []):
+        if isinstance(event, dict) and "id" in event:
+            fixed_id = _to_int(event["id"])
+            if fixed_id != event["id"]:
+                event = {**event, "id": fixed_id}
+                repairs.append("event_id_types")
+        events.append(event)
+    if "events" in data:
+        data["events"] = events
+    action = str(data.get("action", "")).strip().lower()
+    if action not in _ACTIONS:
+        data["action"] = _infer_action(data)
+        repairs.append("action")
+    elif action != data.get("action"):
+        data["action"] = action
+        repairs.append("action_case")
+    status = str(data.get("status", "ok")).strip().lower()
+    if status not in _STATUSES:
+        status = "needs_clarification" if data.get("question") else "ok"
+        repairs.append("status")
+    data["status"] = status
+    return data
+
+
+def validate_response(text: str) -> ValidationOutcome:
+    """
+    Validates a structured reply against `CalendarResponse`, repairing common
+    defects locally: code fences or prose around the JSON, null or scalar
+    lists, string IDs, and a missing or unknown mode/action/status.
+    """
+    adapter = _adapter()
+    try:
+        response = adapter.validate_json(text)
+        return ValidationOutcome("valid", text, response)
+    except ValidationError as exc:
+        error = _short_error(exc)
+
+    repairs: list[str] = []
+    try:
+        data = _extract_json(text, repairs)
+    except ValueError as exc:
+        return ValidationOutcome("invalid", text, error=str(exc) or error)
+    if not isinstance(data, dict):
+        return ValidationOutcome("invalid", text, error="top-level value is not an object")
+    try:
+        response = adapter.validate_python(_repair_fields(data, repairs))
+    except ValidationError as exc:
+        return ValidationOutcome("invalid", text, repairs=repairs, error=_short_error(exc))
+    return ValidationOutcome("repaired", _dump(response), response, repairs)
+
+
+def _fallback(error: str | None) -> str:
+    return _dump(
+        CalendarResponse(
+            action="other",
+            status="error",
+            message=f"The assistant returned an invalid response ({error}). Please try again.",
+        )
+    )
+
+
+def finalize_response(text: str, reask: Callable[[str], str]) -> str:
+    """
+    Returns schema-valid JSON for a structured reply. Repairs locally when
+    possible and calls `reask` (one more model call) only when it can't, up to
+    `CALENDAR_STRUCTURED_MAX_RETRIES` times. The outcome is counted in `STATS`
+    and recorded as a `structured.validation` event on the current span.
+    """
+    outcome = validate_response(text)
+    retries = 0
+    while outcome.status == "invalid" and retries < _max_retries():
+        retries += 1
+        STATS.retried += 1
+        outcome = validate_response(reask(REASK_PROMPT.format(error=outcome.error)))
+
+    if outcome.status == "valid":
+        STATS.valid += 1
+    elif outcome.status == "repaired":
+        STATS.repaired += 1
+    else:
+        STATS.failed += 1
+
+    span = trace.get_current_span()
+    if span is not None and getattr(span, "is_recording", lambda: False)():
+        span.add_event(
+            "structured.validation",
+            {
+                "structured.outcome": outcome.status,
+                "structured.retries": retries,
+                "structured.repairs": ",".join(outcome.repairs),
+            },
+        )
+
+    if outcome.status == "invalid":
+        return _fallback(outcome.error)
+    return outcome.text
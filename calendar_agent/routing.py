@@ -0,0 +1,146 @@
+import logging
+import os
+import re
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Iterator
+
+from opentelemetry import trace
+
+from .timeparse import resolve_range
+from .utils import env_truthy
+
+log = logging.getLogger(__name__)
+
+LIGHT = "light"
+FULL = "full"
+
+
+def routing_enabled() -> bool:
+    return env_truthy("CALENDAR_MODEL_ROUTING", "0")
+
+
+def light_model() -> str:
+    return os.getenv("MODEL_LIGHT", "gemini-2.5-flash-lite")
+
+
+def _max_light_words() -> int:
+    try:
+        return max(1, int(os.getenv("CALENDAR_ROUTER_MAX_LIGHT_WORDS", "16")))
+    except ValueError:
+        return 16
+
+
+_WORD_RE = re.compile(r"[a-z]+")
+_WRITE_WORDS = {
+    "add", "create", "book", "schedule", "put", "move", "reschedule", "shift",
+    "postpone", "delete", "remove", "cancel", "clear", "drop", "rename",
+    "update", "change", "edit", "set", "make",
+}
+_READ_WORDS = {
+    "what", "whats", "show", "list", "agenda", "events", "event", "anything",
+    "planned", "happening", "calendar", "when", "free", "busy", "summary",
+    "summarize", "how", "many",
+}
+
+
+def classify_turn(text: str, now: datetime) -> str:
+    """
+    Picks the model tier for a turn from local features only: write verbs
+    and long or unrecognized requests go to the full model; short reads
+    with a resolvable range or a read cue go to the light one.
+    """
+    lowered = text.lower()
+    words = _WORD_RE.findall(lowered)
+    if not words or len(words) > _max_light_words():
+        return FULL
+    if any(w in _WRITE_WORDS for w in words):
+        return FULL
+    if resolve_range(lowered, now) is not None or any(w in _READ_WORDS for w in words):
+        return LIGHT
+    return FULL
+
+
+@dataclass
+class TierStats:
+    turns: int = 0
+    total_ms: float = 0.0
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+
+    @property
+    def avg_ms(self) -> float:
+        return self.total_ms / self.turns if self.turns else 0.0
+
+
+@dataclass
+class RouteDecision:
+    tier: str
+    model: str
+    # Set by the caller once the turn's response is known.
+    usage: Any | None = None
+    duration_ms: float | None = None
+
+
+class ModelRouter:
+    """Holds one client per tier and points the agent at the chosen one each turn."""
+
+    def __init__(self, clients: dict[str, Any]) -> None:
+        self.clients = clients
+        self._lock = threading.Lock()
+        self.stats: dict[str, TierStats] = {tier: TierStats() for tier in clients}
+
+    def route(self, agent: Any, message: str, now: datetime) -> RouteDecision:
+        tier = classify_turn(message, now)
+        client = self.clients[tier]
+        agent._client = client
+        decision = RouteDecision(tier, getattr(client, "model_name", ""))
+        span = trace.get_current_span()
+        if span is not None and getattr(span, "is_recording", lambda: False)():
+            span.set_attribute("route.tier", decision.tier)
+            span.set_attribute("route.model", decision.model)
+        return decision
+
+    def record(self, decision: RouteDecision) -> None:
+        usage = decision.usage
+        prompt_tokens = int(getattr(usage, "prompt_tokens", 0) or 0)
+        completion_tokens = int(getattr(usage, "completion_tokens", 0) or 0)
+        with self._lock:
+            stats = self.stats[decision.tier]
+            stats.turns += 1
+            stats.total_ms += decision.duration_ms or 0.0
+            stats.prompt_tokens += prompt_tokens
+            stats.completion_tokens += completion_tokens
+        log.info(
+            "route tier=%s model=%s duration_ms=%.1f prompt_tokens=%d completion_tokens=%d "
+            "tier_turns=%d tier_avg_ms=%.1f",
+            decision.tier,
+            decision.model,
+            decision.duration_ms or 0.0,
+            prompt_tokens,
+            completion_tokens,
+            stats.turns,
+            stats.avg_ms,
+        )
+
+
+@contextmanager
+def routed_turn(agent: Any, message: str, now: datetime) -> Iterator[RouteDecision | None]:
+    """
+    Routes one turn when the agent has a `router`; yields None otherwise.
+    Set `decision.usage` inside the block so token outcomes are recorded.
+    """
+    router = getattr(agent, "router", None)
+    if router is None:
+        yield None
+        return
+    decision = router.route(agent, message, now)
+    started = time.perf_counter()
+    try:
+        yield decision
+    finally:
+        decision.duration_ms = (time.perf_counter() - started) * 1000
+        router.record(decision)
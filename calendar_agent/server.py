@@ -0,0 +1,470 @@
+import argparse
+import asyncio
+import json
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Callable
+from urllib.parse import urlsplit
+from zoneinfo import ZoneInfo
+
+from . import tools
+from .agent import create_calendar_agent
+from .archive import archive_after_days, archive_interval_seconds, retention_days
+from .intent_cache import INTENT_CACHE, remember_turn
+from .routing import routed_turn
+from .response_validation import finalize_response
+from .tools import (
+    WriteSlotTimeout,
+    _calendar_id,
+    _validate_calendar_id,
+    archive_old_events,
+    init_db,
+    unit_of_work,
+    use_calendar,
+)
+
+ROME_TZ = ZoneInfo("Europe/Rome")
+MAX_BODY_BYTES = 64 * 1024
+
+_REASONS = {
+    200: "OK",
+    400: "Bad Request",
+    404: "Not Found",
+    405: "Method Not Allowed",
+    409: "Conflict",
+    413: "Payload Too Large",
+    500: "Internal Server Error",
+    503: "Service Unavailable",
+}
+
+
+def _env_int(name: str, default: int) -> int:
+    try:
+        return int(os.getenv(name, str(default)))
+    except ValueError:
+        return default
+
+
+class HTTPError(Exception):
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+
+@dataclass
+class Session:
+    session_id: str
+    calendar_id: str
+    agent: Any
+    last_used: float = field(default_factory=time.monotonic)
+    lock: asyncio.Lock = field(default_factory=asyncio.Lock)
+    turns: int = 0
+
+
+class SessionManager:
+    """Keeps one stateful agent (and its memory) per session id."""
+
+    def __init__(
+        self,
+        agent_factory: Callable[[], Any],
+        *,
+        idle_timeout_s: float,
+        max_sessions: int,
+    ):
+        self._agent_factory = agent_factory
+        self.idle_timeout_s = idle_timeout_s
+        self.max_sessions = max_sessions
+        self._sessions: dict[str, Session] = {}
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+    def __contains__(self, session_id: str) -> bool:
+        return session_id in self._sessions
+
+    def get_or_create(self, session_id: str, calendar_id: str | None) -> Session:
+        session = self._sessions.get(session_id)
+        if session is not None:
+            if calendar_id and calendar_id != session.calendar_id:
+                raise HTTPError(409, "Session is bound to a different calendar.")
+            session.last_used = time.monotonic()
+            return session
+
+        if len(self._sessions) >= self.max_sessions:
+            self._evict_lru()
+        session = Session(
+            session_id=session_id,
+            calendar_id=calendar_id or _calendar_id(),
+            agent=self._agent_factory(),
+        )
+        self._sessions[session_id] = session
+        return session
+
+    def _evict_lru(self) -> None:
+        idle = [s for s in self._sessions.values() if not s.lock.locked()]
+        if not idle:
+            raise HTTPError(503, "Too many active sessions.")
+        oldest = min(idle, key=lambda s: s.last_used)
+        del self._sessions[oldest.session_id]
+
+    def evict_idle(self, now: float | None = None) -> list[str]:
+        now = time.monotonic() if now is None else now
+        expired = [
+            sid
+            for sid, s in self._sessions.items()
+            if now - s.last_used > self.idle_timeout_s and not s.lock.locked()
+        ]
+        for sid in expired:
+            del self._sessions[sid]
+        return expired
+
+    def close(self, session_id: str) -> bool:
+        return self._sessions.pop(session_id, None) is not None
+
+
+def _with_time_context(message: str, now_rome: datetime | None = None) -> str:
+    now_rome = now_rome or datetime.now(ROME_TZ)
+    return f"[CURRENT_TIME_ROME={now_rome.isoformat()}] {message}"
+
+
+def _final_text(agent: Any, text: str) -> str:
+    if not tools.STRUCTURED:
+        return text
+    return finalize_response(text, lambda prompt: agent.run(prompt).text)
+
+
+def _run_agent_turn(agent: Any, calendar_id: str, message: str) -> str:
+    now_rome = datetime.now(ROME_TZ)
+    with use_calendar(calendar_id):
+        lookup = INTENT_CACHE.lookup(message, now_rome, tools.STRUCTURED)
+        if lookup.hit:
+            remember_turn(agent, _with_time_context(message, now_rome), lookup.text)
+            return lookup.text
+        with routed_turn(agent, message, now_rome) as route, unit_of_work():
+            response = agent.run(_with_time_context(message, now_rome))
+            text = _final_text(agent, response.text if response is not None else "")
+            if route is not None:
+                route.usage = getattr(response, "usage", None)
+        INTENT_CACHE.store(lookup, text, getattr(response, "usage", None))
+        return text
+
+
+def _stream_agent_turn(
+    agent: Any, calendar_id: str, message: str, emit: Callable[[dict], None]
+) -> None:
+    final_text = ""
+    usage = None
+    now_rome = datetime.now(ROME_TZ)
+    with use_calendar(calendar_id):
+        lookup = INTENT_CACHE.lookup(message, now_rome, tools.STRUCTURED)
+        if lookup.hit:
+            remember_turn(agent, _with_time_context(message, now_rome), lookup.text)
+            emit({"type": "final", "text": lookup.text, "cached": True})
+            return
+        with routed_turn(agent, message, now_rome) as route, unit_of_work():
+            for item in agent.stream_invoke(_with_time_context(message, now_rome)):
+                delta = getattr(item, "delta", None)
+                if delta:
+                    emit({"type": "delta", "text": delta})
+                elif hasattr(item, "tools_used"):
+                    final_text = item.text
+                    usage = item.usage if usage is None else usage + item.usage
+                    emit(
+                        {
+                            "type": "step",
+                            "index": item.index,
+                            "tools": [call.name for call in item.tools_used],
+                        }
+                    )
+            final_text = _final_text(agent, final_text)
+            if route is not None:
+                route.usage = usage
+        INTENT_CACHE.store(lookup, final_text, usage)
+    emit({"type": "final", "text": final_text})
+
+
+class CalendarServer:
+    """
+    Minimal asyncio HTTP/1.1 front-end for the calendar agent.
+
+    Routes:
+        GET    /health
+        POST   /sessions/{id}/messages          -> {"session_id", "text"}
+        POST   /sessions/{id}/messages/stream   -> NDJSON events (chunked)
+        DELETE /sessions/{id}
+    """
+
+    def __init__(
+        self,
+        agent_factory: Callable[[], Any] = create_calendar_agent,
+        *,
+        host: str = "127.0.0.1",
+        port: int = 8765,
+        max_concurrency: int = 4,
+        idle_timeout_s: float = 900.0,
+        max_sessions: int = 256,
+    ):
+        self.host = host
+        self.port = port
+        self.sessions = SessionManager(
+            agent_factory, idle_timeout_s=idle_timeout_s, max_sessions=max_sessions
+        )
+        self._llm_slots = asyncio.Semaphore(max_concurrency)
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_concurrency, thread_name_prefix="calendar-turn"
+        )
+        self._server: asyncio.Server | None = None
+        self._evict_task: asyncio.Task | None = None
+        self._archive_task: asyncio.Task | None = None
+
+    @classmethod
+    def from_env(cls, agent_factory: Callable[[], Any] = create_calendar_agent):
+        return cls(
+            agent_factory,
+            host=os.getenv("CALENDAR_SERVER_HOST", "127.0.0.1"),
+            port=_env_int("CALENDAR_SERVER_PORT", 8765),
+            max_concurrency=max(1, _env_int("CALENDAR_SERVER_MAX_CONCURRENCY", 4)),
+            idle_timeout_s=float(_env_int("CALENDAR_SESSION_IDLE_SECONDS", 900)),
+            max_sessions=max(1, _env_int("CALENDAR_SERVER_MAX_SESSIONS", 256)),
+        )
+
+    async def start(self) -> tuple[str, int]:
+        self._server = await asyncio.start_server(
+            self._handle_connection, self.host, self.port
+        )
+        self._evict_task = asyncio.create_task(self._evict_loop())
+        if archive_after_days() or retention_days():
+            self._archive_task = asyncio.create_task(self._archive_loop())
+        host, port = self._server.sockets[0].getsockname()[:2]
+        self.port = port
+        return host, port
+
+    async def serve_forever(self) -> None:
+        if self._server is None:
+            await self.start()
+        async with self._server:
+            await self._server.serve_forever()
+
+    async def close(self) -> None:
+        for task in (self._evict_task, self._archive_task):
+            if task is not None:
+                task.cancel()
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    async def _evict_loop(self) -> None:
+        interval = max(1.0, min(self.sessions.idle_timeout_s / 2, 30.0))
+        while True:
+            await asyncio.sleep(interval)
+            self.sessions.evict_idle()
+
+    async def _archive_loop(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            await asyncio.sleep(archive_interval_seconds())
+            try:
+                await loop.run_in_executor(self._executor, archive_old_events)
+            except Exception as e:
+                print(f"Archiving failed: {e}")
+
+    async def _handle_connection(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        try:
+            try:
+                method, path, headers, body = await self._read_request(reader)
+                await self._route(method, path, headers, body, writer)
+            except HTTPError as e:
+                await self._send_json(writer, e.status, {"error": e.message})
+            except WriteSlotTimeout as e:
+                await self._send_json(writer, 503, {"error": str(e)})
+            except Exception as e:
+                await self._send_json(writer, 500, {"error": str(e)})
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def _read_request(
+        self, reader: asyncio.StreamReader
+    ) -> tuple[str, str, dict[str, str], bytes]:
+        request_line = (await reader.readline()).decode("latin-1").strip()
+        parts = request_line.split(" ")
+        if len(parts) != 3:
+            raise HTTPError(400, "Malformed request line.")
+        method, target, _ = parts
+
+        headers: dict[str, str] = {}
+        while True:
+            line = (await reader.readline()).decode("latin-1")
+            if line in ("\r\n", "\n", ""):
+                break
+            name, _, value = line.partition(":")
+            headers[name.strip().lower()] = value.strip()
+
+        try:
+            length = int(headers.get("content-length", "0"))
+        except ValueError:
+            raise HTTPError(400, "Invalid Content-Length.")
+        if length > MAX_BODY_BYTES:
+            raise HTTPError(413, "Request body too large.")
+        body = await reader.readexactly(length) if length else b""
+        return method.upper(), urlsplit(target).path, headers, body
+
+    async def _route(
+        self,
+        method: str,
+        path: str,
+        headers: dict[str, str],
+        body: bytes,
+        writer: asyncio.StreamWriter,
+    ) -> None:
+        segments = [p for p in path.split("/") if p]
+        if segments == ["health"]:
+            if method != "GET":
+                raise HTTPError(405, "Use GET.")
+            await self._send_json(
+                writer, 200, {"status": "ok", "sessions": len(self.sessions)}
+            )
+            return
+
+        if len(segments) < 2 or segments[0] != "sessions":
+            raise HTTPError(404, "Not found.")
+        session_id = segments[1]
+        rest = segments[2:]
+
+        if not rest:
+            if method != "DELETE":
+                raise HTTPError(405, "Use DELETE.")
+            closed = self.sessions.close(session_id)
+            await self._send_json(writer, 200, {"closed": closed})
+            return
+
+        if rest not in (["messages"], ["messages", "stream"]):
+            raise HTTPError(404, "Not found.")
+        if method != "POST":
+            raise HTTPError(405, "Use POST.")
+
+        message, calendar_id = self._parse_message(body, headers)
+        session = self.sessions.get_or_create(session_id, calendar_id)
+        if rest == ["messages"]:
+            text = await self._run_turn(session, message)
+            await self._send_json(
+                writer, 200, {"session_id": session_id, "text": text}
+            )
+        else:
+            await self._stream_turn(session, message, writer)
+
+    def _parse_message(
+        self, body: bytes, headers: dict[str, str]
+    ) -> tuple[str, str | None]:
+        try:
+            payload = json.loads(body or b"{}")
+        except json.JSONDecodeError:
+            raise HTTPError(400, "Body must be JSON.")
+        message = payload.get("message") if isinstance(payload, dict) else None
+        if not isinstance(message, str) or not message.strip():
+            raise HTTPError(400, "Field 'message' is required.")
+        calendar_id = payload.get("calendar_id") or headers.get("x-calendar-id")
+        if calendar_id is not None:
+            try:
+                _validate_calendar_id(str(calendar_id))
+            except ValueError as e:
+                raise HTTPError(400, str(e))
+        return message.strip(), calendar_id
+
+    async def _run_turn(self, session: Session, message: str) -> str:
+        loop = asyncio.get_running_loop()
+        async with session.lock, self._llm_slots:
+            text = await loop.run_in_executor(
+                self._executor,
+                _run_agent_turn,
+                session.agent,
+                session.calendar_id,
+                message,
+            )
+        session.turns += 1
+        session.last_used = time.monotonic()
+        return text
+
+    async def _stream_turn(
+        self, session: Session, message: str, writer: asyncio.StreamWriter
+    ) -> None:
+        loop = asyncio.get_running_loop()
+        queue: asyncio.Queue[dict | None] = asyncio.Queue()
+
+        def emit(event: dict | None) -> None:
+            loop.call_soon_threadsafe(queue.put_nowait, event)
+
+        def worker() -> None:
+            try:
+                _stream_agent_turn(session.agent, session.calendar_id, message, emit)
+            except Exception as e:
+                emit({"type": "error", "error": str(e)})
+            finally:
+                emit(None)
+
+        writer.write(
+            b"HTTP/1.1 200 OK\r\n"
+            b"Content-Type: application/x-ndjson\r\n"
+            b"Transfer-Encoding: chunked\r\n"
+            b"Connection: close\r\n\r\n"
+        )
+        async with session.lock, self._llm_slots:
+            future = loop.run_in_executor(self._executor, worker)
+            while (event := await queue.get()) is not None:
+                line = (json.dumps(event) + "\n").encode("utf-8")
+                writer.write(f"{len(line):X}\r\n".encode("ascii") + line + b"\r\n")
+                await writer.drain()
+            await future
+        writer.write(b"0\r\n\r\n")
+        await writer.drain()
+        session.turns += 1
+        session.last_used = time.monotonic()
+
+    async def _send_json(
+        self, writer: asyncio.StreamWriter, status: int, payload: dict
+    ) -> None:
+        body = json.dumps(payload).encode("utf-8")
+        head = (
+            f"HTTP/1.1 {status} {_REASONS.get(status, 'OK')}\r\n"
+            "Content-Type: application/json\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            "Connection: close\r\n\r\n"
+        )
+        writer.write(head.encode("latin-1") + body)
+        await writer.drain()
+
+
+def serve_main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(prog="python -m calendar_agent serve")
+    parser.add_argument("--host", default=None)
+    parser.add_argument("--port", type=int, default=None)
+    args = parser.parse_args(argv)
+
+    init_db()
+    archive_old_events()
+    server = CalendarServer.from_env()
+    if args.host:
+        server.host = args.host
+    if args.port is not None:
+        server.port = args.port
+
+    async def run() -> None:
+        host, port = await server.start()
+        print(f"Calendar Assistant serving on http://{host}:{port}")
+        try:
+            await server.serve_forever()
+        finally:
+            await server.close()
+
+    try:
+        asyncio.run(run())
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,177 @@
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+
+from .utils import env_truthy
+
+log = logging.getLogger(__name__)
+
+
+def shared_cache_enabled() -> bool:
+    return env_truthy("CALENDAR_SHARED_CACHE", "0")
+
+
+def _shared_cache_path() -> str:
+    return os.getenv("CALENDAR_SHARED_CACHE_PATH", "./data/tool_cache.db")
+
+
+def _shared_cache_max_entries() -> int:
+    try:
+        return max(1, int(os.getenv("CALENDAR_SHARED_CACHE_MAX_ENTRIES", "1024")))
+    except ValueError:
+        return 1024
+
+
+def make_key(
+    db_path: str, calendar_id: str, start: str, end: str, mode: str, revision: int
+) -> str:
+    """Stable cross-process key for one formatted `list_events` result."""
+    return json.dumps(
+        [os.path.abspath(db_path), calendar_id, start, end, mode, revision],
+        separators=(",", ":"),
+    )
+
+
+class SharedToolCache:
+    """
+    Machine-local tool-result cache shared by every worker process.
+
+    Entries live in a small WAL-mode SQLite file. A publish is a single
+    `INSERT OR REPLACE` transaction, so readers see either the old or the new
+    value. Once the file holds more than `max_entries` rows, the least
+    recently used ones are evicted. Any SQLite error (lock timeout, corrupt
+    file) is treated as a miss so the shared tier can never fail a tool call.
+
+    Hits stay read-only: access times are batched in memory and written with
+    the next publish, or once `touch_batch` keys are pending. Writing them is
+    best-effort, so a locked file never turns a hit into a miss.
+    """
+
+    touch_batch = 32
+
+    def __init__(self, path: str, max_entries: int = 1024):
+        self.path = path
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        # key -> last access time not yet written to the file
+        self._touched: dict[str, float] = {}
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._conn = sqlite3.connect(
+            path, timeout=0.2, check_same_thread=False, isolation_level=None
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS tool_results (
+                key TEXT PRIMARY KEY,
+                value TEXT NOT NULL,
+                accessed_at REAL NOT NULL
+            )
+        """)
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_tool_results_accessed "
+            "ON tool_results (accessed_at)"
+        )
+
+    def get(self, key: str) -> str | None:
+        try:
+            with self._lock:
+                row = self._conn.execute(
+                    "SELECT value FROM tool_results WHERE key = ?", (key,)
+                ).fetchone()
+        except sqlite3.Error as e:
+            log.debug(f"Shared cache get failed: {e}")
+            return None
+        if row is None:
+            return None
+        with self._lock:
+            self._touched[key] = time.time()
+            if len(self._touched) >= self.touch_batch:
+                self._flush_touched()
+        return row[0]
+
+    def _write_touched(self) -> None:
+        """Applies pending access times; the caller holds the lock and a write transaction."""
+        if self._touched:
+            self._conn.executemany(
+                "UPDATE tool_results SET accessed_at = ? WHERE key = ?",
+                [(accessed_at, key) for key, accessed_at in self._touched.items()],
+            )
+
+    def _flush_touched(self) -> None:
+        """Best-effort; on a busy file the access times stay pending for the next try."""
+        try:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._write_touched()
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+        except sqlite3.Error as e:
+            log.debug(f"Shared cache access-time update failed: {e}")
+            return
+        self._touched.clear()
+
+    def set(self, key: str, value: str) -> None:
+        try:
+            with self._lock:
+                self._conn.execute("BEGIN IMMEDIATE")
+                try:
+                    # Pending access times go first so eviction sees them.
+                    self._write_touched()
+                    self._conn.execute(
+                        "INSERT OR REPLACE INTO tool_results (key, value, accessed_at) "
+                        "VALUES (?, ?, ?)",
+                        (key, value, time.time()),
+                    )
+                    count = self._conn.execute(
+                        "SELECT COUNT(*) FROM tool_results"
+                    ).fetchone()[0]
+                    excess = count - self.max_entries
+                    if excess > 0:
+                        self._conn.execute(
+                            "DELETE FROM tool_results WHERE key IN ("
+                            "SELECT key FROM tool_results ORDER BY accessed_at ASC LIMIT ?)",
+                            (excess,),
+                        )
+                    self._conn.execute("COMMIT")
+                except BaseException:
+                    self._conn.execute("ROLLBACK")
+                    raise
+                self._touched.clear()
+        except sqlite3.Error as e:
+            log.debug(f"Shared cache set failed: {e}")
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM tool_results").fetchone()[0]
+
+    def close(self) -> None:
+        with self._lock:
+            self._flush_touched()
+            self._conn.close()
+
+
+_SHARED_CACHES: dict[str, SharedToolCache] = {}
+_SHARED_CACHES_LOCK = threading.Lock()
+
+
+def get_shared_cache() -> SharedToolCache | None:
+    """Returns the process-wide shared cache, or None when it is disabled."""
+    if not shared_cache_enabled():
+        return None
+    path = _shared_cache_path()
+    with _SHARED_CACHES_LOCK:
+        cache = _SHARED_CACHES.get(path)
+        if cache is None:
+            try:
+                cache = SharedToolCache(path, _shared_cache_max_entries())
+            except sqlite3.Error as e:
+                log.warning(f"Shared tool cache unavailable at {path}: {e}")
+                return None
+            _SHARED_CACHES[path] = cache
+        return cache
@@ -0,0 +1,118 @@
+import functools
+import hashlib
+import inspect
+import time
+from dataclasses import dataclass
+from typing import Any, Callable
+
+from datapizza.core.clients import ClientResponse
+from datapizza.core.clients.models import TokenUsage
+from datapizza.tracing.tracing import agent_span
+
+from .utils import env_truthy
+
+
+def streaming_enabled() -> bool:
+    # Structured replies must be validated before anything is printed.
+    return env_truthy("CALENDAR_STREAMING", "0") and not env_truthy(
+        "CALENDAR_STRUCTURED_OUTPUT", "0"
+    )
+
+
+def cache_streamed_calls(client: Any) -> None:
+    """
+    Routes `client.stream_invoke` through the client's cache, which
+    datapizza's `@cacheable` only applies to `invoke`. A streaming agent
+    calls `stream_invoke` for every step (tool calls included), so without
+    this streaming mode would bypass the client cache, single-flight and the
+    per-tier caches. A hit is replayed as a single delta with no model call;
+    a miss streams as usual and stores the final response under the key
+    `invoke` would use.
+    """
+    cache = getattr(client, "cache", None)
+    if cache is None or getattr(client, "_streams_through_cache", False):
+        return
+    stream_invoke = client.stream_invoke
+    signature = inspect.signature(stream_invoke)
+
+    @functools.wraps(stream_invoke)
+    def cached_stream(*args: Any, **kwargs: Any):
+        try:
+            bound = dict(signature.bind_partial(*args, **kwargs).arguments)
+            bound.update(bound.pop("kwargs", {}))
+            key = hashlib.sha256(client._get_cache_key(bound).encode()).hexdigest()
+        except Exception:
+            yield from stream_invoke(*args, **kwargs)
+            return
+        cached = cache.get(key)
+        if cached is not None:
+            yield ClientResponse(
+                content=cached.content,
+                delta=cached.text or None,
+                stop_reason=cached.stop_reason,
+                usage=cached.usage,
+            )
+            return
+        last = None
+        try:
+            for chunk in stream_invoke(*args, **kwargs):
+                last = chunk
+                yield chunk
+        except BaseException:
+            # Includes an abandoned generator; lets single-flight waiters go.
+            if hasattr(cache, "abandon"):
+                cache.abandon()
+            raise
+        if last is not None:
+            cache.set(key, last)
+        elif hasattr(cache, "abandon"):
+            cache.abandon()
+
+    client.stream_invoke = cached_stream
+    client._streams_through_cache = True
+
+
+@dataclass
+class StreamedTurn:
+    """Outcome of `run_streaming`: the final step plus time-to-first-token."""
+
+    result: Any
+    ttft_ms: float | None
+    streamed: bool
+
+    @property
+    def text(self) -> str:
+        return self.result.text if self.result is not None else ""
+
+    @property
+    def usage(self) -> TokenUsage | None:
+        return getattr(self.result, "usage", None)
+
+
+def run_streaming(
+    agent: Any, task_input: str, on_delta: Callable[[str], None]
+) -> StreamedTurn:
+    """
+    Drop-in replacement for `agent.run` that forwards text deltas to
+    `on_delta` as the client streams them. Every step, tool calls included,
+    goes through `stream_invoke` (client-cached by `cache_streamed_calls`);
+    only model text reaches `on_delta`. Usage is summed across steps like
+    `Agent.run` does, and the time to the first delta is returned.
+    """
+    started = time.perf_counter()
+    ttft_ms = None
+    usage = TokenUsage()
+    last_step = None
+    with agent_span(f"Agent {agent.name}"):
+        for item in agent.stream_invoke(task_input):
+            if isinstance(item, ClientResponse):
+                if item.delta:
+                    if ttft_ms is None:
+                        ttft_ms = (time.perf_counter() - started) * 1000
+                    on_delta(item.delta)
+            elif hasattr(item, "tools_used"):
+                usage += item.usage
+                last_step = item
+    if last_step is not None:
+        last_step.usage = usage
+    return StreamedTurn(last_step, ttft_ms, streamed=ttft_ms is not None)
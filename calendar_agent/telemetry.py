@@ -1,9 +1,16 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
-from typing import Any
+import threading
+from contextlib import contextmanager
+from dataclasses import dataclass, replace
+from typing import Any, Iterator
 
 from datapizza.tracing import console
+from opentelemetry import trace
+from opentelemetry.sdk.trace import SpanProcessor, TracerProvider
+from opentelemetry.trace import ProxyTracerProvider
+
+from .prompt_size import COMPONENTS, estimate_tokens
 from rich.console import Group
 from rich.panel import Panel
 from rich.table import Table
@@ -31,46 +38,239 @@ def _span_duration_ms(span: Any) -> float:
     return round((end - start) / 1_000_000, 2)
 
 
-def _collect_tool_stats(spans: list[Any]) -> dict[str, ToolStats]:
-    stats: dict[str, ToolStats] = {}
-    for span in spans:
-        if span.attributes.get("type") != "tool":
-            continue
-        name = span.name or "tool"
-        duration_ms = _span_duration_ms(span)
-        entry = stats.setdefault(name, ToolStats())
-        entry.count += 1
-        entry.total_ms += duration_ms
-    return stats
-
-
-def _collect_cache_savings(spans: list[Any]) -> CacheSavings:
-    savings = CacheSavings()
-    for span in spans:
-        for event in getattr(span, "events", []) or []:
-            if getattr(event, "name", "") != "cache.hit":
-                continue
-            attrs = getattr(event, "attributes", {}) or {}
-            savings.prompt_tokens += int(attrs.get("cache.saved_prompt_tokens", 0) or 0)
-            savings.completion_tokens += int(
-                attrs.get("cache.saved_completion_tokens", 0) or 0
+class TurnAggregator:
+    """
+    Folds finished spans into the per-turn summary one at a time.
+
+    `add` touches only the span it is given (and that span's own events), so
+    spans can be aggregated as they end and dropped immediately instead of
+    being kept until the turn is over.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.span_count = 0
+        self.tool_stats: dict[str, ToolStats] = {}
+        self.cache_savings = CacheSavings()
+        self.cache_hits: dict[str, int] = {}
+        self.model_tokens: dict[str, dict[str, int]] = {}
+        self._structured_outcomes: dict[str, int] = {}
+        self._structured_retries = 0
+        self._structured_repairs: list[str] = []
+        self._intent_cache: dict[str, Any] = {}
+        self._prompt_calls = 0
+        self._prompt_chars = dict.fromkeys(COMPONENTS, 0)
+
+    def add(self, span: Any) -> None:
+        attributes = getattr(span, "attributes", None) or {}
+        with self._lock:
+            self.span_count += 1
+            span_type = attributes.get("type")
+            if span_type == "tool":
+                entry = self.tool_stats.setdefault(span.name or "tool", ToolStats())
+                entry.count += 1
+                entry.total_ms += _span_duration_ms(span)
+            elif span_type == "generation":
+                tokens = self.model_tokens.setdefault(
+                    attributes.get("model_name", "unknown"),
+                    {"prompt_tokens": 0, "completion_tokens": 0, "cached_tokens": 0},
+                )
+                tokens["prompt_tokens"] += int(attributes.get("prompt_tokens_used", 0) or 0)
+                tokens["completion_tokens"] += int(
+                    attributes.get("completion_tokens_used", 0) or 0
+                )
+                tokens["cached_tokens"] += int(attributes.get("cached_tokens_used", 0) or 0)
+                if "prompt.system_chars" in attributes:
+                    self._prompt_calls += 1
+                    for name in COMPONENTS:
+                        self._prompt_chars[name] += int(attributes.get(f"prompt.{name}_chars", 0) or 0)
+            for event in getattr(span, "events", []) or []:
+                self._add_event(getattr(event, "name", ""), getattr(event, "attributes", {}) or {})
+
+    def _add_event(self, name: str, attrs: Any) -> None:
+        if name == "cache.hit":
+            # Client hits emit a second event carrying the saved tokens; count
+            # only the marker event so every hit is counted once.
+            if "cache.saved_total_tokens" in attrs:
+                savings = self.cache_savings
+                savings.prompt_tokens += int(attrs.get("cache.saved_prompt_tokens", 0) or 0)
+                savings.completion_tokens += int(
+                    attrs.get("cache.saved_completion_tokens", 0) or 0
+                )
+                savings.cached_tokens += int(attrs.get("cache.saved_cached_tokens", 0) or 0)
+                savings.total_tokens += int(attrs.get("cache.saved_total_tokens", 0) or 0)
+            else:
+                layer = str(attrs.get("cache.layer", "unknown"))
+                self.cache_hits[layer] = self.cache_hits.get(layer, 0) + 1
+        elif name == "structured.validation":
+            outcome = str(attrs.get("structured.outcome", "unknown"))
+            self._structured_outcomes[outcome] = self._structured_outcomes.get(outcome, 0) + 1
+            self._structured_retries += int(attrs.get("structured.retries", 0) or 0)
+            self._structured_repairs.extend(
+                r for r in str(attrs.get("structured.repairs", "")).split(",") if r
             )
-            savings.cached_tokens += int(attrs.get("cache.saved_cached_tokens", 0) or 0)
-            savings.total_tokens += int(attrs.get("cache.saved_total_tokens", 0) or 0)
-    return savings
+        elif name == "intent_cache.lookup":
+            self._intent_cache = {
+                "outcome": str(attrs.get("intent_cache.outcome", "unknown")),
+                "session_hits": int(attrs.get("intent_cache.session_hits", 0) or 0),
+                "session_lookups": int(attrs.get("intent_cache.session_lookups", 0) or 0),
+            }
+
+    def summary(self) -> dict[str, Any]:
+        with self._lock:
+            tool_stats = {name: ToolStats(s.count, s.total_ms) for name, s in self.tool_stats.items()}
+            structured: dict[str, Any] = {}
+            if self._structured_outcomes:
+                structured = {
+                    "outcomes": dict(self._structured_outcomes),
+                    "retries": self._structured_retries,
+                    "repairs": list(self._structured_repairs),
+                }
+            return {
+                "tool_stats": tool_stats,
+                "tool_calls": sum(s.count for s in tool_stats.values()),
+                "tool_total_ms": round(sum(s.total_ms for s in tool_stats.values()), 2),
+                "cache_savings": replace(self.cache_savings),
+                "cache_hits": dict(self.cache_hits),
+                "structured": structured,
+                "intent_cache": dict(self._intent_cache),
+                "prompt_breakdown": (
+                    {"calls": self._prompt_calls, "chars": dict(self._prompt_chars)}
+                    if self._prompt_calls
+                    else {}
+                ),
+            }
 
 
 def summarize_spans(spans: list[Any]) -> dict[str, Any]:
-    tool_stats = _collect_tool_stats(spans)
-    total_tool_ms = round(sum(s.total_ms for s in tool_stats.values()), 2)
-    tool_calls = sum(s.count for s in tool_stats.values())
-    cache_savings = _collect_cache_savings(spans)
-    return {
-        "tool_stats": tool_stats,
-        "tool_calls": tool_calls,
-        "tool_total_ms": total_tool_ms,
-        "cache_savings": cache_savings,
-    }
+    aggregator = TurnAggregator()
+    for span in spans:
+        aggregator.add(span)
+    return aggregator.summary()
+
+
+class StreamingSpanProcessor(SpanProcessor):
+    """
+    Aggregates the spans of each traced turn in `on_end` and keeps no span
+    objects; spans of traces that are not being watched are ignored.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._aggregators: dict[int, TurnAggregator] = {}
+
+    def start_trace(self, trace_id: int) -> TurnAggregator:
+        aggregator = TurnAggregator()
+        with self._lock:
+            self._aggregators[trace_id] = aggregator
+        return aggregator
+
+    def stop_trace(self, trace_id: int) -> None:
+        with self._lock:
+            self._aggregators.pop(trace_id, None)
+
+    def on_end(self, span: Any) -> None:
+        context = span.get_span_context()
+        with self._lock:
+            aggregator = self._aggregators.get(context.trace_id) if context else None
+        if aggregator is not None:
+            aggregator.add(span)
+
+
+_PROCESSOR: StreamingSpanProcessor | None = None
+_PROCESSOR_LOCK = threading.Lock()
+
+
+def _processor() -> StreamingSpanProcessor:
+    global _PROCESSOR
+    with _PROCESSOR_LOCK:
+        if _PROCESSOR is None:
+            if isinstance(trace.get_tracer_provider(), ProxyTracerProvider):
+                trace.set_tracer_provider(TracerProvider())
+            _PROCESSOR = StreamingSpanProcessor()
+            trace.get_tracer_provider().add_span_processor(_PROCESSOR)  # type: ignore[attr-defined]
+        return _PROCESSOR
+
+
+@contextmanager
+def turn_trace(name: str) -> Iterator[TurnAggregator]:
+    """
+    Replacement for datapizza's `ContextTracing().trace`: opens the root span
+    of a turn and yields its live `TurnAggregator`, whose `summary()` is
+    complete as soon as the turn's child spans have ended. Prints the same
+    trace summary panel (span count, duration, tokens per model) on exit.
+    """
+    processor = _processor()
+    tracer = trace.get_tracer(__name__)
+    root = aggregator = None
+    try:
+        with tracer.start_as_current_span(name) as root:
+            trace_id = root.get_span_context().trace_id
+            aggregator = processor.start_trace(trace_id)
+            yield aggregator
+    finally:
+        if root is not None:
+            processor.stop_trace(root.get_span_context().trace_id)
+            if aggregator is not None and root.end_time is not None:
+                _render_trace_panel(name, aggregator, _span_duration_ms(root) / 1000)
+
+
+def _render_trace_panel(name: str, aggregator: TurnAggregator, duration_s: float) -> None:
+    table = Table(title="Token Usage")
+    table.add_column("Model")
+    table.add_column("Prompt Tokens")
+    table.add_column("Completion Tokens")
+    table.add_column("Cached Tokens")
+    for model, usage in aggregator.model_tokens.items():
+        table.add_row(
+            model,
+            str(usage["prompt_tokens"]),
+            str(usage["completion_tokens"]),
+            str(usage["cached_tokens"]),
+        )
+    console.print(
+        Panel(
+            Group(
+                f"Total Spans: {aggregator.span_count}\nDuration: {round(duration_s, 2)}s",
+                table if aggregator.model_tokens else "No token usage",
+            ),
+            title=f"Trace Summary of [bold]{name}[/bold]",
+        )
+    )
+
+
+def _memory_outgrew_overhead(chars: dict[str, int]) -> bool:
+    # Conversation state outgrowing the fixed prompt is the signal to trim.
+    conversation = chars.get("memory", 0) + chars.get("tool_outputs", 0)
+    return conversation > chars.get("system", 0) + chars.get("tools", 0)
+
+
+def _prompt_size_table(
+    turn: dict[str, Any], prompt_totals: Any | None
+) -> Table | None:
+    columns = []
+    if turn:
+        columns.append((f"Turn ({turn['calls']} call(s))", turn["chars"]))
+    if prompt_totals is not None and prompt_totals.calls:
+        columns.append(
+            (f"Session ({prompt_totals.calls} call(s))", prompt_totals.breakdown.chars)
+        )
+    if not columns:
+        return None
+    flagged = any(_memory_outgrew_overhead(chars) for _, chars in columns)
+    table = Table(
+        title="Prompt Size (chars / est. tokens)",
+        caption="memory exceeds fixed overhead" if flagged else None,
+    )
+    table.add_column("Component")
+    for label, _ in columns:
+        table.add_column(label)
+    for name in COMPONENTS:
+        table.add_row(
+            name.replace("_", " "),
+            *(f"{chars.get(name, 0)} / {estimate_tokens(chars.get(name, 0))}" for _, chars in columns),
+        )
+    return table
 
 
 def render_turn_summary(
@@ -78,6 +278,10 @@ def render_turn_summary(
     *,
     duration_ms: float | None = None,
     usage: Any | None = None,
+    ttft_ms: float | None = None,
+    prompt_totals: Any | None = None,
+    route: Any | None = None,
+    warmup: Any | None = None,
 ) -> None:
     tool_stats: dict[str, ToolStats] = summary.get("tool_stats", {})
     cache_savings: CacheSavings = summary.get("cache_savings", CacheSavings())
@@ -87,6 +291,26 @@ def render_turn_summary(
     if duration_ms is not None:
         sections.append(f"Turn Duration: {round(duration_ms, 2)} ms")
 
+    if ttft_ms is not None:
+        sections.append(f"Time to First Token: {round(ttft_ms, 2)} ms")
+
+    if warmup is not None:
+        if warmup.background:
+            sections.append(
+                f"Start-up Warm-up: {round(warmup.total_ms, 2)} ms in background, "
+                f"first turn waited {round(warmup.waited_ms, 2)} ms "
+                f"({round(warmup.hidden_ms, 2)} ms hidden, "
+                f"{warmup.warmed_ranges} range(s) prefilled)"
+            )
+        else:
+            sections.append(
+                f"Start-up Warm-up: {round(warmup.total_ms, 2)} ms before the prompt "
+                "(background warm-up off)"
+            )
+
+    if route is not None:
+        sections.append(f"Model Route: {route.tier} ({route.model})")
+
     if usage is not None:
         prompt_tokens = int(getattr(usage, "prompt_tokens", 0) or 0)
         completion_tokens = int(getattr(usage, "completion_tokens", 0) or 0)
@@ -107,6 +331,32 @@ def render_turn_summary(
             f"{cache_savings.total_tokens} total"
         )
 
+    cache_hits: dict[str, int] = summary.get("cache_hits", {})
+    if cache_hits:
+        sections.append(
+            "Cache Hits: "
+            + ", ".join(f"{layer} {count}" for layer, count in sorted(cache_hits.items()))
+        )
+
+    intent_cache: dict[str, Any] = summary.get("intent_cache", {})
+    if intent_cache:
+        hits, lookups = intent_cache["session_hits"], intent_cache["session_lookups"]
+        rate = round(100 * hits / lookups, 1) if lookups else 0.0
+        sections.append(
+            f"Intent Cache: {intent_cache['outcome']} "
+            f"(session {hits}/{lookups} hits, {rate}%)"
+        )
+
+    structured: dict[str, Any] = summary.get("structured", {})
+    if structured:
+        outcomes = ", ".join(
+            f"{name} {count}" for name, count in sorted(structured["outcomes"].items())
+        )
+        line = f"Structured Output: {outcomes}, {structured['retries']} re-ask(s)"
+        if structured["repairs"]:
+            line += f" (repairs: {', '.join(structured['repairs'])})"
+        sections.append(line)
+
     tool_table = None
     if tool_stats:
         tool_table = Table(title="Tool Timing")
@@ -116,11 +366,44 @@ def render_turn_summary(
         for name, stats in tool_stats.items():
             tool_table.add_row(name, str(stats.count), f"{round(stats.total_ms, 2)}")
 
-    if not sections and tool_table is None:
+    prompt_table = _prompt_size_table(summary.get("prompt_breakdown", {}), prompt_totals)
+
+    if not sections and tool_table is None and prompt_table is None:
         return
 
     panel = Panel(
-        Group(*sections, tool_table if tool_table else ""),
+        Group(*sections, tool_table if tool_table else "", prompt_table if prompt_table else ""),
         title="Turn Telemetry",
     )
     console.print(panel)
+
+
+def render_turn_profile(profile: Any) -> None:
+    hot_table = Table(title="Hot Functions (self time)")
+    hot_table.add_column("Function")
+    hot_table.add_column("Calls")
+    hot_table.add_column("Self ms")
+    hot_table.add_column("Cumulative ms")
+    for fn in profile.hot_functions:
+        hot_table.add_row(
+            fn.name, str(fn.calls), f"{fn.self_ms}", f"{fn.cumulative_ms}"
+        )
+
+    alloc_table = Table(title="Allocation Sites (net growth)")
+    alloc_table.add_column("Location")
+    alloc_table.add_column("KiB")
+    alloc_table.add_column("Blocks")
+    for site in profile.allocation_sites:
+        alloc_table.add_row(site.location, f"{site.size_kib}", str(site.count))
+
+    panel = Panel(
+        Group(
+            f"Peak Traced Memory: {profile.peak_memory_kib} KiB",
+            f"Stats: {profile.pstats_path}",
+            f"Collapsed Stacks: {profile.collapsed_path}",
+            hot_table,
+            alloc_table,
+        ),
+        title=f"Turn Profile (turn {profile.turn_index})",
+    )
+    console.print(panel)
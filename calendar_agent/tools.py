@@ -1,18 +1,85 @@
 import sqlite3
 import os
 import json
-from contextlib import nullcontext
-from datetime import datetime
+import re
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager, nullcontext
+from contextvars import ContextVar
+from datetime import date, datetime, timedelta
+from typing import Iterator
 from zoneinfo import ZoneInfo
 from datapizza.tools import tool
 from opentelemetry import trace
+from .archive import (
+    ArchiveReport,
+    analyze,
+    archive_after_days,
+    archive_reaches,
+    ensure_archive_schema,
+    horizon,
+    move_to_archive,
+    purge_archive,
+    retention_days,
+    vacuum_if_fragmented,
+)
+from .aggregates import (
+    days_touched,
+    ensure_aggregate_schema,
+    has_dirty_buckets,
+    read_day_buckets,
+    refresh_day_buckets,
+)
+from .prefetch import PREFETCHER, adjacent_ranges, prefetch_enabled
+from .read_model import READ_MODEL, CalendarIndex, ReadModelChanges, read_model_enabled
+from .shared_cache import get_shared_cache, make_key
 from .utils import env_truthy
 
 ROME_TZ = ZoneInfo("Europe/Rome")
-DB_REVISION = 0
-LIST_CACHE: dict[tuple[str, str, int], str] = {}
+DEFAULT_CALENDAR_ID = "default"
+# Per-tenant tool cache state: calendar_id -> revision / cached list results.
+DB_REVISIONS: dict[str, int] = {}
+LIST_CACHE: dict[str, dict[tuple[str, str, int], str]] = {}
+# LIST_CACHE keys filled by the prefetcher and not yet served, per calendar;
+# reset with the calendar's cache whenever its revision moves.
+_PREFETCHED_KEYS: dict[str, set[tuple[str, str, int]]] = {}
+# Same, for entries filled by the REPL start-up warm-up.
+_WARMED_KEYS: dict[str, set[tuple[str, str, int]]] = {}
+# Serializes revision bumps and the cache invalidation that goes with them;
+# the server runs turns (and so writes) on several worker threads.
+_REVISION_LOCK = threading.RLock()
 STRUCTURED = env_truthy("CALENDAR_STRUCTURED_OUTPUT", "0")
 
+def _max_writers() -> int:
+    try:
+        return max(1, int(os.getenv("CALENDAR_DB_MAX_WRITERS", "1")))
+    except ValueError:
+        return 1
+
+# Bounds concurrent SQLite writers when tools run on several worker threads.
+_WRITE_SLOTS = threading.BoundedSemaphore(_max_writers())
+
+def _write_wait_seconds() -> float:
+    try:
+        return max(0.0, float(os.getenv("CALENDAR_DB_WRITE_WAIT_SECONDS", "10")))
+    except ValueError:
+        return 10.0
+
+class WriteSlotTimeout(RuntimeError):
+    """No writer slot freed up within `CALENDAR_DB_WRITE_WAIT_SECONDS`."""
+
+def _acquire_write_slot() -> None:
+    wait = _write_wait_seconds()
+    if not _WRITE_SLOTS.acquire(timeout=wait):
+        raise WriteSlotTimeout(
+            f"Calendar is busy: another turn has held the write lock for over {wait:g}s. "
+            "Try again shortly."
+        )
+
+_CALENDAR_ID_RE = re.compile(r"^[A-Za-z0-9_.-]{1,64}$")
+_CURRENT_CALENDAR: ContextVar[str | None] = ContextVar("calendar_id", default=None)
+_CURRENT_UOW: ContextVar["UnitOfWork | None"] = ContextVar("unit_of_work", default=None)
+
 def _tracing_enabled() -> bool:
     return os.getenv("CALENDAR_TRACING", "").strip().lower() in {"1", "true"}
 
@@ -36,21 +103,418 @@ def _span(name: str):
     tracer = trace.get_tracer(__name__)
     return tracer.start_as_current_span(name)
 
-def _invalidate_tool_cache() -> None:
-    global DB_REVISION, LIST_CACHE
-    DB_REVISION += 1
-    LIST_CACHE.clear()
+def _validate_calendar_id(calendar_id: str) -> str:
+    if not _CALENDAR_ID_RE.match(calendar_id):
+        raise ValueError(f"Invalid calendar id: {calendar_id!r}")
+    return calendar_id
+
+def _calendar_id() -> str:
+    """Returns the calendar (tenant) the current tool call operates on."""
+    current = _CURRENT_CALENDAR.get()
+    if current:
+        return current
+    return _validate_calendar_id(os.getenv("CALENDAR_ID", DEFAULT_CALENDAR_ID))
+
+@contextmanager
+def use_calendar(calendar_id: str) -> Iterator[str]:
+    """Scopes every tool call in the block to `calendar_id`."""
+    token = _CURRENT_CALENDAR.set(_validate_calendar_id(calendar_id))
+    try:
+        yield calendar_id
+    finally:
+        _CURRENT_CALENDAR.reset(token)
+
+def _list_cache() -> dict[tuple[str, str, int], str]:
+    return LIST_CACHE.setdefault(_calendar_id(), {})
+
+def _invalidate_tool_cache(
+    calendar_id: str | None = None, changes: ReadModelChanges | None = None
+) -> None:
+    """
+    Marks `calendar_id` as changed. `changes` carries the written rows so the
+    read model can be patched in place; without it the read model reloads.
+    """
+    calendar_id = calendar_id or _calendar_id()
+    PREFETCHER.cancel(calendar_id)
+    uow = _CURRENT_UOW.get()
+    if uow is not None:
+        # Deferred until the unit of work commits; reads bypass the cache meanwhile.
+        uow.dirty_calendars.add(calendar_id)
+        pending = uow.read_model_changes.get(calendar_id, [])
+        if pending is not None:
+            uow.read_model_changes[calendar_id] = pending + [changes] if changes else None
+        return
+    _bump_revision(calendar_id, [changes] if changes else None)
+
+def _bump_revision(calendar_id: str, changes: list[ReadModelChanges] | None) -> None:
+    with use_calendar(calendar_id):
+        db_path = _get_db_path()
+    with _REVISION_LOCK:
+        old = DB_REVISIONS.get(calendar_id, 0)
+        DB_REVISIONS[calendar_id] = old + 1
+        LIST_CACHE.pop(calendar_id, None)
+        _PREFETCHED_KEYS.pop(calendar_id, None)
+        _WARMED_KEYS.pop(calendar_id, None)
+        for key in [k for k in _CACHE_STORED_REVISIONS if k[1] == calendar_id]:
+            del _CACHE_STORED_REVISIONS[key]
+        # Under the lock so concurrent writers advance the read model in order.
+        READ_MODEL.advance(db_path, calendar_id, old, old + 1, changes)
+
+def _has_pending_writes() -> bool:
+    uow = _CURRENT_UOW.get()
+    return uow is not None and _calendar_id() in uow.dirty_calendars
+
+def _shard_dir() -> str | None:
+    return os.getenv("CALENDAR_SHARD_DIR") or None
 
 def _get_db_path() -> str:
+    shard_dir = _shard_dir()
+    if shard_dir:
+        return os.path.join(shard_dir, f"{_calendar_id()}.db")
     return os.getenv("CALENDAR_DB_PATH", "./data/calendar.db")
 
+def _casefold(text: str | None) -> str | None:
+    # SQLite's lower() and LIKE only fold ASCII; this covers "Ò", "ß", etc.
+    return text.casefold() if text is not None else None
+
 def _connect() -> sqlite3.Connection:
     db_path = _get_db_path()
     os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
-    conn = sqlite3.connect(db_path)
+    conn = sqlite3.connect(db_path, check_same_thread=_shard_dir() is None)
     conn.row_factory = sqlite3.Row
+    conn.create_function("py_casefold", 1, _casefold, deterministic=True)
     return conn
 
+def _ensure_schema(conn: sqlite3.Connection) -> None:
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS events (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            title TEXT NOT NULL,
+            start_ts TEXT NOT NULL,
+            end_ts TEXT NOT NULL,
+            location TEXT,
+            notes TEXT,
+            created_at TEXT NOT NULL,
+            updated_at TEXT NOT NULL,
+            calendar_id TEXT NOT NULL DEFAULT 'default',
+            version INTEGER NOT NULL DEFAULT 1
+        )
+    """)
+    columns = {row[1] for row in conn.execute("PRAGMA table_info(events)")}
+    if "calendar_id" not in columns:
+        # Databases created before multi-calendar support
+        conn.execute(
+            "ALTER TABLE events ADD COLUMN calendar_id TEXT NOT NULL DEFAULT 'default'"
+        )
+    if "version" not in columns:
+        # Databases created before optimistic concurrency on update_event
+        conn.execute("ALTER TABLE events ADD COLUMN version INTEGER NOT NULL DEFAULT 1")
+    conn.execute(
+        "CREATE INDEX IF NOT EXISTS idx_events_calendar_start "
+        "ON events (calendar_id, start_ts)"
+    )
+    # Per-calendar revision counter bumped by triggers, so writes from any
+    # process (other REPLs, batch jobs, imports) are visible to every cache.
+    conn.executescript("""
+        CREATE TABLE IF NOT EXISTS calendar_revisions (
+            calendar_id TEXT PRIMARY KEY,
+            revision INTEGER NOT NULL
+        );
+        CREATE TRIGGER IF NOT EXISTS trg_events_rev_insert AFTER INSERT ON events
+        BEGIN
+            INSERT INTO calendar_revisions (calendar_id, revision) VALUES (NEW.calendar_id, 1)
+            ON CONFLICT(calendar_id) DO UPDATE SET revision = revision + 1;
+        END;
+        CREATE TRIGGER IF NOT EXISTS trg_events_rev_update AFTER UPDATE ON events
+        BEGIN
+            INSERT INTO calendar_revisions (calendar_id, revision) VALUES (NEW.calendar_id, 1)
+            ON CONFLICT(calendar_id) DO UPDATE SET revision = revision + 1;
+        END;
+        CREATE TRIGGER IF NOT EXISTS trg_events_rev_move AFTER UPDATE OF calendar_id ON events
+        WHEN OLD.calendar_id <> NEW.calendar_id
+        BEGIN
+            INSERT INTO calendar_revisions (calendar_id, revision) VALUES (OLD.calendar_id, 1)
+            ON CONFLICT(calendar_id) DO UPDATE SET revision = revision + 1;
+        END;
+        CREATE TRIGGER IF NOT EXISTS trg_events_rev_delete AFTER DELETE ON events
+        BEGIN
+            INSERT INTO calendar_revisions (calendar_id, revision) VALUES (OLD.calendar_id, 1)
+            ON CONFLICT(calendar_id) DO UPDATE SET revision = revision + 1;
+        END;
+    """)
+    ensure_archive_schema(conn)
+    ensure_aggregate_schema(conn)
+
+# Database files whose schema (and day-bucket backfill) this process has
+# already ensured; the DDL, backfill probe and bucket refresh run once per file.
+_SCHEMA_READY: set[str] = set()
+_SCHEMA_LOCK = threading.Lock()
+
+def _prepare_db(conn: sqlite3.Connection, db_path: str) -> None:
+    """Ensures the schema on the first connection to `db_path`, then commits."""
+    with _SCHEMA_LOCK:
+        if db_path in _SCHEMA_READY:
+            return
+        with conn:
+            _ensure_schema(conn)
+        _SCHEMA_READY.add(db_path)
+
+def _shard_pool_size() -> int:
+    try:
+        return max(1, int(os.getenv("CALENDAR_SHARD_POOL_SIZE", "8")))
+    except ValueError:
+        return 8
+
+class _ShardHandle:
+    def __init__(self, conn: sqlite3.Connection) -> None:
+        self.conn = conn
+        self.lock = threading.RLock()
+        self.users = 0
+        self.evicted = False
+
+class _ShardPool:
+    """Bounded LRU of open per-tenant SQLite handles (shard mode only)."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._handles: OrderedDict[str, _ShardHandle] = OrderedDict()
+
+    def acquire(self, db_path: str) -> _ShardHandle:
+        with self._lock:
+            handle = self._handles.pop(db_path, None)
+            if handle is None:
+                conn = _connect()
+                _prepare_db(conn, db_path)
+                handle = _ShardHandle(conn)
+            self._handles[db_path] = handle
+            handle.users += 1
+            while len(self._handles) > _shard_pool_size():
+                _, old = self._handles.popitem(last=False)
+                old.evicted = True
+                if old.users == 0:
+                    old.conn.close()
+            return handle
+
+    def release(self, handle: _ShardHandle) -> None:
+        with self._lock:
+            handle.users -= 1
+            if handle.evicted and handle.users == 0:
+                handle.conn.close()
+
+    def close_all(self) -> None:
+        with self._lock:
+            while self._handles:
+                _, handle = self._handles.popitem()
+                handle.evicted = True
+                if handle.users == 0:
+                    handle.conn.close()
+
+    def __len__(self) -> int:
+        return len(self._handles)
+
+SHARD_POOL = _ShardPool()
+
+class _RevisionWatcher:
+    """
+    Long-lived read connection used to validate cached results.
+
+    `PRAGMA data_version` changes whenever another connection (in this or any
+    other process) commits to the file, so the revision table is only
+    re-read after a commit has actually happened.
+    """
+
+    def __init__(self, conn: sqlite3.Connection) -> None:
+        self.conn = conn
+        self.lock = threading.Lock()
+        self.data_version: int | None = None
+        self.revisions: dict[str, int] = {}
+
+    def revision(self, calendar_id: str) -> int:
+        with self.lock:
+            data_version = self.conn.execute("PRAGMA data_version").fetchone()[0]
+            if data_version != self.data_version:
+                self.data_version = data_version
+                self.revisions.clear()
+            revision = self.revisions.get(calendar_id)
+            if revision is None:
+                row = self.conn.execute(
+                    "SELECT revision FROM calendar_revisions WHERE calendar_id = ?",
+                    (calendar_id,),
+                ).fetchone()
+                revision = int(row[0]) if row else 0
+                self.revisions[calendar_id] = revision
+            return revision
+
+_WATCHERS: OrderedDict[str, _RevisionWatcher] = OrderedDict()
+_WATCHERS_LOCK = threading.Lock()
+# Persisted revision each calendar's LIST_CACHE was filled against,
+# keyed by (db_path, calendar_id).
+_CACHE_STORED_REVISIONS: dict[tuple[str, str], int] = {}
+
+def _revision_watcher() -> _RevisionWatcher:
+    db_path = _get_db_path()
+    with _WATCHERS_LOCK:
+        watcher = _WATCHERS.pop(db_path, None)
+        if watcher is None:
+            os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+            conn = sqlite3.connect(db_path, check_same_thread=False)
+            _prepare_db(conn, db_path)
+            watcher = _RevisionWatcher(conn)
+        _WATCHERS[db_path] = watcher
+        while len(_WATCHERS) > _shard_pool_size():
+            _, old = _WATCHERS.popitem(last=False)
+            with old.lock:
+                old.conn.close()
+        return watcher
+
+def _stored_revision(calendar_id: str) -> int:
+    """Current persisted revision of `calendar_id`, shared by all processes."""
+    return _revision_watcher().revision(calendar_id)
+
+def _validate_tool_cache(calendar_id: str) -> int:
+    """
+    Drops this calendar's cached results if another connection changed it.
+
+    Returns the persisted revision the cache is now valid for.
+    """
+    stored = _stored_revision(calendar_id)
+    key = (_get_db_path(), calendar_id)
+    with _REVISION_LOCK:
+        known = _CACHE_STORED_REVISIONS.get(key)
+        if known is not None and known != stored:
+            # The change is already committed elsewhere, so unlike our own writes
+            # it must not be deferred to the end of the current unit of work.
+            PREFETCHER.cancel(calendar_id)
+            _bump_revision(calendar_id, None)
+        _CACHE_STORED_REVISIONS[key] = stored
+    return stored
+
+class UnitOfWork:
+    """
+    Turn-scoped transaction shared by every tool call inside `unit_of_work()`.
+
+    Connections are opened lazily per database file. The first write takes a
+    writer slot (waiting at most `CALENDAR_DB_WRITE_WAIT_SECONDS`) that is held,
+    together with SQLite's write lock, until the single commit (or rollback)
+    at the end of the turn, including any model calls after that write.
+    """
+
+    def __init__(self) -> None:
+        self._connections: dict[str, sqlite3.Connection] = {}
+        self._holds_write_slot = False
+        self.dirty_calendars: set[str] = set()
+        # Write-through deltas per calendar, applied to the read model on
+        # commit; None once some write could not describe its rows.
+        self.read_model_changes: dict[str, list[ReadModelChanges] | None] = {}
+        self.writes = 0
+
+    def connection(self) -> sqlite3.Connection:
+        db_path = _get_db_path()
+        conn = self._connections.get(db_path)
+        if conn is None:
+            conn = _connect()
+            _prepare_db(conn, db_path)
+            self._connections[db_path] = conn
+        return conn
+
+    def begin_write(self) -> None:
+        if not self._holds_write_slot:
+            _acquire_write_slot()
+            self._holds_write_slot = True
+        self.writes += 1
+
+    def commit(self) -> None:
+        with _span("sqlite.commit") as span:
+            if span is not None:
+                span.set_attribute("writes", self.writes)
+                span.set_attribute("connections", len(self._connections))
+            for conn in self._connections.values():
+                conn.commit()
+        dirty, self.dirty_calendars = self.dirty_calendars, set()
+        changes, self.read_model_changes = self.read_model_changes, {}
+        for calendar_id in dirty:
+            PREFETCHER.cancel(calendar_id)
+            _bump_revision(calendar_id, changes.get(calendar_id))
+
+    def rollback(self) -> None:
+        for conn in self._connections.values():
+            conn.rollback()
+        self.dirty_calendars.clear()
+        self.read_model_changes.clear()
+
+    def close(self) -> None:
+        for conn in self._connections.values():
+            conn.close()
+        self._connections.clear()
+        if self._holds_write_slot:
+            self._holds_write_slot = False
+            _WRITE_SLOTS.release()
+
+@contextmanager
+def unit_of_work() -> Iterator[UnitOfWork]:
+    """
+    Groups all tool writes in the block into one transaction.
+
+    Commits once when the block exits (invalidating each touched calendar's
+    cache once) and rolls back if it raises. Nested calls join the outer unit.
+    """
+    current = _CURRENT_UOW.get()
+    if current is not None:
+        yield current
+        return
+    uow = UnitOfWork()
+    token = _CURRENT_UOW.set(uow)
+    try:
+        try:
+            yield uow
+        except BaseException:
+            uow.rollback()
+            raise
+        _CURRENT_UOW.reset(token)
+        token = None
+        uow.commit()
+    finally:
+        if token is not None:
+            _CURRENT_UOW.reset(token)
+        uow.close()
+
+@contextmanager
+def _write_db() -> Iterator[sqlite3.Connection]:
+    """Like `_db`, but holds one of the `CALENDAR_DB_MAX_WRITERS` write slots."""
+    uow = _CURRENT_UOW.get()
+    if uow is not None:
+        uow.begin_write()
+        yield uow.connection()
+        return
+    _acquire_write_slot()
+    try:
+        with _db() as conn:
+            yield conn
+    finally:
+        _WRITE_SLOTS.release()
+
+@contextmanager
+def _db() -> Iterator[sqlite3.Connection]:
+    """Yields a connection for the active calendar and commits on success."""
+    uow = _CURRENT_UOW.get()
+    if uow is not None:
+        yield uow.connection()
+        return
+    if _shard_dir():
+        handle = SHARD_POOL.acquire(_get_db_path())
+        try:
+            with handle.lock, handle.conn as conn:
+                yield conn
+        finally:
+            SHARD_POOL.release(handle)
+        return
+    conn = _connect()
+    try:
+        with conn:
+            yield conn
+    finally:
+        conn.close()
+
 def _parse_iso_rome(s: str) -> datetime:
     """
     Parses an ISO-8601 string. 
@@ -76,35 +540,239 @@ def _event_row_to_dict(row: sqlite3.Row) -> dict:
         "end": _parse_iso_rome(row["end_ts"]).isoformat(),
         "location": row["location"] if row["location"] else None,
         "notes": notes,
+        "version": int(row["version"]) if "version" in row.keys() else 1,
     }
 
 def init_db() -> None:
     with _span("sqlite.init_db"):
-        with _connect() as conn:
-            conn.execute("""
-                CREATE TABLE IF NOT EXISTS events (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    title TEXT NOT NULL,
-                    start_ts TEXT NOT NULL,
-                    end_ts TEXT NOT NULL,
-                    location TEXT,
-                    notes TEXT,
-                    created_at TEXT NOT NULL,
-                    updated_at TEXT NOT NULL
-                )
-            """)
+        with _write_db() as conn:
+            _ensure_schema(conn)
+        _SCHEMA_READY.add(_get_db_path())
             # One-time cleanup: removed DELETE to persist data across sessions
+        if read_model_enabled():
+            _read_model_index(_calendar_id())
 
 def seed_db() -> None:
-    with _connect() as conn:
-        count = conn.execute("SELECT COUNT(*) FROM events").fetchone()[0]
-        if count == 0:
+    calendar_id = _calendar_id()
+    with _db() as conn:
+        # Existence probes instead of COUNT(*): seeding must not scan history.
+        seeded = conn.execute(
+            """
+            SELECT EXISTS (SELECT 1 FROM events WHERE calendar_id = ?)
+                OR EXISTS (SELECT 1 FROM events_archive WHERE calendar_id = ?)
+            """,
+            (calendar_id, calendar_id),
+        ).fetchone()[0]
+        if not seeded:
             now = datetime.now(ROME_TZ).isoformat()
             # Seeding with normalized Rome TZ timestamps
             conn.execute("""
-                INSERT INTO events (title, start_ts, end_ts, location, notes, created_at, updated_at)
-                VALUES (?, ?, ?, ?, ?, ?, ?)
-            """, ("Project Kickoff", "2026-02-10T10:00:00+01:00", "2026-02-10T11:00:00+01:00", "Meeting Room A", "Discuss initial roadmap", now, now))
+                INSERT INTO events (title, start_ts, end_ts, location, notes, created_at, updated_at, calendar_id)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            """, ("Project Kickoff", "2026-02-10T10:00:00+01:00", "2026-02-10T11:00:00+01:00", "Meeting Room A", "Discuss initial roadmap", now, now, calendar_id))
+
+def _archive_db(now: datetime) -> ArchiveReport:
+    report = ArchiveReport()
+    after_days = archive_after_days()
+    keep_days = retention_days()
+    touched: set[str] = set()
+    with _write_db() as conn:
+        if after_days:
+            moved = move_to_archive(conn, horizon(after_days, now), now)
+            report.archived = len(moved)
+            touched.update(moved)
+        if keep_days:
+            purged = purge_archive(conn, horizon(keep_days, now))
+            report.purged = len(purged)
+            touched.update(purged)
+        if touched:
+            refresh_day_buckets(conn)
+    for calendar_id in touched:
+        _invalidate_tool_cache(calendar_id)
+    if touched and _CURRENT_UOW.get() is None:
+        with _write_db() as conn:
+            analyze(conn, now)
+            conn.commit()
+            report.analyzed = True
+            report.vacuumed = vacuum_if_fragmented(conn, now)
+    return report
+
+def archive_old_events(now: datetime | None = None) -> ArchiveReport:
+    """
+    Applies the retention policy: moves events that ended more than
+    `CALENDAR_ARCHIVE_AFTER_DAYS` ago into `events_archive`, purges archived
+    events older than `CALENDAR_ARCHIVE_RETENTION_DAYS`, then refreshes
+    planner statistics and VACUUMs if the file became fragmented. In shard
+    mode every calendar file under `CALENDAR_SHARD_DIR` is processed.
+    """
+    now = now or datetime.now(ROME_TZ)
+    if not archive_after_days() and not retention_days():
+        return ArchiveReport()
+    with _span("sqlite.archive_old_events") as span:
+        shard_dir = _shard_dir()
+        if shard_dir is None:
+            report = _archive_db(now)
+        else:
+            report = ArchiveReport()
+            files = os.listdir(shard_dir) if os.path.isdir(shard_dir) else []
+            for name in sorted(f[:-3] for f in files if f.endswith(".db")):
+                if not _CALENDAR_ID_RE.match(name):
+                    continue
+                with use_calendar(name):
+                    shard = _archive_db(now)
+                report.archived += shard.archived
+                report.purged += shard.purged
+                report.analyzed |= shard.analyzed
+                report.vacuumed |= shard.vacuumed
+        if span is not None:
+            span.set_attribute("archived", report.archived)
+            span.set_attribute("purged", report.purged)
+            span.set_attribute("vacuumed", report.vacuumed)
+        return report
+
+def analyze_db(now: datetime | None = None) -> None:
+    """Refreshes planner statistics for the active calendar's database."""
+    now = now or datetime.now(ROME_TZ)
+    with _span("sqlite.analyze"):
+        with _write_db() as conn:
+            analyze(conn, now)
+
+def warm_list_cache(ranges: list[tuple[str, str]]) -> int:
+    """
+    Fills the tool cache for `ranges` ahead of the first turn, rendered in the
+    active output mode, so a later `list_events` for the same range is a hit.
+    Returns how many ranges are now cached.
+    """
+    if not _tool_cache_enabled():
+        return 0
+    calendar_id = _calendar_id()
+    warmed = 0
+    for start_iso, end_iso in ranges:
+        s_norm = _parse_iso_rome(start_iso).isoformat()
+        e_norm = _parse_iso_rome(end_iso).isoformat()
+        list_events(s_norm, e_norm)
+        cache_key = (s_norm, e_norm, DB_REVISIONS.get(calendar_id, 0))
+        if cache_key in _list_cache():
+            _WARMED_KEYS.setdefault(calendar_id, set()).add(cache_key)
+            warmed += 1
+    return warmed
+
+# Columns every event read returns; `version` lets callers pass `expected_version`.
+_ROW_COLUMNS = "id, title, start_ts, end_ts, location, notes, version"
+
+def _event_line(r: sqlite3.Row) -> str:
+    loc = f" @ {r['location']}" if r['location'] else ""
+    start_p = _pretty_time(r['start_ts'])
+    end_p = _parse_iso_rome(r['end_ts']).strftime("%H:%M")
+    # Only edited events show their version, keeping the common line short.
+    ver = f" (v{r['version']})" if "version" in r.keys() and r['version'] > 1 else ""
+    return f"[{r['id']}] {start_p}–{end_p} | {r['title']}{loc}{ver}"
+
+def _render_event_rows(rows: list[sqlite3.Row], s_norm: str, e_norm: str) -> str:
+    if STRUCTURED:
+        result_obj = {
+            "events": [_event_row_to_dict(r) for r in rows],
+            "start": s_norm,
+            "end": e_norm,
+        }
+        return json.dumps(result_obj, separators=(",", ":"))
+
+    if not rows:
+        return "No events found in this range."
+
+    return "\n".join(_event_line(r) for r in rows)
+
+def _read_model_index(calendar_id: str) -> CalendarIndex | None:
+    """
+    The calendar's in-memory index, (re)loaded if it is missing or behind.
+    None when the read model is off or this unit of work has pending writes.
+    """
+    if not read_model_enabled() or _has_pending_writes():
+        return None
+    _validate_tool_cache(calendar_id)
+    db_path = _get_db_path()
+    revision = DB_REVISIONS.get(calendar_id, 0)
+    index = READ_MODEL.get(db_path, calendar_id)
+    if index is not None and index.revision == revision:
+        return index
+    with _span("readmodel.load") as span:
+        with _db() as conn:
+            index = READ_MODEL.load(conn, db_path, calendar_id, revision)
+        if span is not None:
+            span.set_attribute("rows_loaded", len(index))
+    return index
+
+def _query_range(calendar_id: str, s_norm: str, e_norm: str) -> list[sqlite3.Row]:
+    index = _read_model_index(calendar_id)
+    if index is not None and index.covers(s_norm):
+        span = trace.get_current_span() if _tracing_enabled() else None
+        if span is not None:
+            span.set_attribute("read_model", True)
+        return index.query(s_norm, e_norm)
+    with _db() as conn:
+        # The archive is only scanned when the range reaches back into it.
+        if archive_reaches(conn, calendar_id, s_norm):
+            span = trace.get_current_span() if _tracing_enabled() else None
+            if span is not None:
+                span.set_attribute("archive_consulted", True)
+            return conn.execute(f"""
+                SELECT {_ROW_COLUMNS}
+                FROM events
+                WHERE calendar_id = ? AND start_ts < ? AND end_ts > ?
+                UNION ALL
+                SELECT {_ROW_COLUMNS}
+                FROM events_archive
+                WHERE calendar_id = ? AND start_ts < ? AND end_ts > ?
+                ORDER BY start_ts ASC
+            """, (calendar_id, e_norm, s_norm) * 2).fetchall()
+        # Overlap logic: start_ts < end_iso AND end_ts > start_iso
+        return conn.execute(f"""
+            SELECT {_ROW_COLUMNS}
+            FROM events 
+            WHERE calendar_id = ? AND start_ts < ? AND end_ts > ?
+            ORDER BY start_ts ASC
+        """, (calendar_id, e_norm, s_norm)).fetchall()
+
+def _prefetch_ranges(
+    generation: int, calendar_id: str, revision: int, ranges: list[tuple[str, str]]
+) -> None:
+    """Runs on the prefetch thread; stops as soon as a write cancels it."""
+    with use_calendar(calendar_id):
+        _validate_tool_cache(calendar_id)
+        for s_norm, e_norm in ranges:
+            if not PREFETCHER.is_current(calendar_id, generation):
+                return
+            if DB_REVISIONS.get(calendar_id, 0) != revision:
+                return
+            cache_key = (s_norm, e_norm, revision)
+            if cache_key in _list_cache():
+                continue
+            with _span("prefetch.list_events"):
+                result = _render_event_rows(
+                    _query_range(calendar_id, s_norm, e_norm), s_norm, e_norm
+                )
+            if not PREFETCHER.is_current(calendar_id, generation):
+                return
+            _list_cache()[cache_key] = result
+            _PREFETCHED_KEYS.setdefault(calendar_id, set()).add(cache_key)
+            PREFETCHER.stats.filled += 1
+
+def _schedule_prefetch(calendar_id: str, s_norm: str, e_norm: str) -> None:
+    if not prefetch_enabled() or _has_pending_writes():
+        return
+    ranges = adjacent_ranges(
+        datetime.fromisoformat(s_norm),
+        datetime.fromisoformat(e_norm),
+        datetime.now(ROME_TZ),
+    )
+    if ranges:
+        PREFETCHER.schedule(
+            calendar_id,
+            _prefetch_ranges,
+            calendar_id,
+            DB_REVISIONS.get(calendar_id, 0),
+            ranges,
+        )
 
 @tool
 def list_events(start_iso: str, end_iso: str) -> str:
@@ -121,57 +789,63 @@ def list_events(start_iso: str, end_iso: str) -> str:
     except ValueError:
         return "Error: Invalid ISO format for start or end time."
 
+    calendar_id = _calendar_id()
     cache_key = None
-    if _tool_cache_enabled():
-        cache_key = (s_norm, e_norm, DB_REVISION)
-        cached = LIST_CACHE.get(cache_key)
+    shared_cache = None
+    shared_key = None
+    if _tool_cache_enabled() and not _has_pending_writes():
+        stored_revision = _validate_tool_cache(calendar_id)
+        cache_key = (s_norm, e_norm, DB_REVISIONS.get(calendar_id, 0))
+        cached = _list_cache().get(cache_key)
         if cached is not None:
-            _mark_cache_hit("tool")
+            prefetched = _PREFETCHED_KEYS.get(calendar_id, set())
+            if cache_key in prefetched:
+                prefetched.discard(cache_key)
+                PREFETCHER.stats.hits += 1
+                _mark_cache_hit("prefetch")
+            elif cache_key in _WARMED_KEYS.get(calendar_id, set()):
+                _WARMED_KEYS.get(calendar_id, set()).discard(cache_key)
+                _mark_cache_hit("warmup")
+            else:
+                _mark_cache_hit("tool")
+            _schedule_prefetch(calendar_id, s_norm, e_norm)
             return cached
 
+        shared_cache = get_shared_cache()
+        if shared_cache is not None:
+            shared_key = make_key(
+                _get_db_path(),
+                calendar_id,
+                s_norm,
+                e_norm,
+                "structured" if STRUCTURED else "chat",
+                stored_revision,
+            )
+            cached = shared_cache.get(shared_key)
+            if cached is not None:
+                _list_cache()[cache_key] = cached
+                _mark_cache_hit("shared")
+                _schedule_prefetch(calendar_id, s_norm, e_norm)
+                return cached
+
     with _span("sqlite.list_events") as span:
         if span is not None:
+            span.set_attribute("calendar_id", calendar_id)
             span.set_attribute("query_range_start", s_norm)
             span.set_attribute("query_range_end", e_norm)
 
-        with _connect() as conn:
-            # Overlap logic: start_ts < end_iso AND end_ts > start_iso
-            rows = conn.execute("""
-                SELECT id, title, start_ts, end_ts, location, notes
-                FROM events 
-                WHERE start_ts < ? AND end_ts > ?
-                ORDER BY start_ts ASC
-            """, (e_norm, s_norm)).fetchall()
+        rows = _query_range(calendar_id, s_norm, e_norm)
 
         if span is not None:
             span.set_attribute("rows_returned", len(rows))
-        
-        if STRUCTURED:
-            result_obj = {
-                "events": [_event_row_to_dict(r) for r in rows],
-                "start": s_norm,
-                "end": e_norm,
-            }
-            result = json.dumps(result_obj, separators=(",", ":"))
-            if cache_key is not None:
-                LIST_CACHE[cache_key] = result
-            return result
-
-        if not rows:
-            result = "No events found in this range."
-            if cache_key is not None:
-                LIST_CACHE[cache_key] = result
-            return result
-            
-        lines = []
-        for r in rows:
-            loc = f" @ {r['location']}" if r['location'] else ""
-            start_p = _pretty_time(r['start_ts'])
-            end_p = _parse_iso_rome(r['end_ts']).strftime("%H:%M")
-            lines.append(f"[{r['id']}] {start_p}–{end_p} | {r['title']}{loc}")
-        result = "\n".join(lines)
+
+        result = _render_event_rows(rows, s_norm, e_norm)
+        if cache_key is not None:
+            _list_cache()[cache_key] = result
+        if shared_key is not None:
+            shared_cache.set(shared_key, result)
         if cache_key is not None:
-            LIST_CACHE[cache_key] = result
+            _schedule_prefetch(calendar_id, s_norm, e_norm)
         return result
 
 @tool
@@ -198,24 +872,54 @@ def add_event(title: str, start_iso: str, end_iso: str, location: str = "", note
         return "Error: Invalid ISO format."
 
     now = datetime.now(ROME_TZ).isoformat()
+    calendar_id = _calendar_id()
     with _span("sqlite.add_event") as span:
-        with _connect() as conn:
+        if span is not None:
+            span.set_attribute("calendar_id", calendar_id)
+        with _write_db() as conn:
             cursor = conn.execute("""
-                INSERT INTO events (title, start_ts, end_ts, location, notes, created_at, updated_at)
-                VALUES (?, ?, ?, ?, ?, ?, ?)
-            """, (title, start_iso_norm, end_iso_norm, location, notes, now, now))
+                INSERT INTO events (title, start_ts, end_ts, location, notes, created_at, updated_at, calendar_id)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            """, (title, start_iso_norm, end_iso_norm, location, notes, now, now, calendar_id))
             event_id = cursor.lastrowid
             rows_affected = cursor.rowcount
+            refresh_day_buckets(conn)
 
         if span is not None:
             span.set_attribute("rows_affected", 1 if rows_affected == -1 else rows_affected)
 
-        _invalidate_tool_cache()
+        _invalidate_tool_cache(changes=ReadModelChanges(upserts=[{
+            "id": event_id, "title": title, "start_ts": start_iso_norm, "end_ts": end_iso_norm,
+            "location": location, "notes": notes, "version": 1,
+        }]))
         print(f"Created event {event_id} for {_pretty_time(start_iso_norm)}")
         if STRUCTURED:
             return json.dumps({"created_id": event_id}, separators=(",", ":"))
         return f"Event added successfully with ID: {event_id}"
 
+def _update_failure(
+    conn: sqlite3.Connection, calendar_id: str, event_id: int, expected_version: int | None
+) -> str:
+    """Explains why update_event matched no row; only runs on the error path."""
+    current = conn.execute(
+        "SELECT version FROM events WHERE id = ? AND calendar_id = ?",
+        (event_id, calendar_id),
+    ).fetchone()
+    if current is None:
+        archived = conn.execute(
+            "SELECT 1 FROM events_archive WHERE id = ? AND calendar_id = ?",
+            (event_id, calendar_id),
+        ).fetchone()
+        if archived:
+            return f"Error: Event {event_id} is archived and can no longer be edited."
+        return f"Error: Event with ID {event_id} not found."
+    if expected_version is not None and current["version"] != expected_version:
+        return (
+            f"Error: Event {event_id} was changed by someone else (now version "
+            f"{current['version']}, expected {expected_version}). List it again before retrying."
+        )
+    return "Error: Updated start time must be before updated end time."
+
 @tool
 def update_event(
     event_id: int, 
@@ -223,7 +927,8 @@ def update_event(
     start_iso: str | None = None, 
     end_iso: str | None = None, 
     location: str | None = None, 
-    notes: str | None = None
+    notes: str | None = None,
+    expected_version: int | None = None,
 ) -> str:
     """
     Updates an existing calendar event.
@@ -235,68 +940,123 @@ def update_event(
         end_iso: New end time.
         location: New location.
         notes: New notes.
+        expected_version: Version last seen for the event; the update is rejected if it changed since.
     """
-    fields = {k: v for k, v in {
-        "title": title, "start_iso": start_iso, "end_iso": end_iso,
-        "location": location, "notes": notes
-    }.items() if v is not None}
-    
-    if not fields:
+    try:
+        dt_s = _parse_iso_rome(start_iso) if start_iso is not None else None
+        dt_e = _parse_iso_rome(end_iso) if end_iso is not None else None
+    except ValueError:
+        return "Error: Invalid ISO format in update."
+    if dt_s is not None and dt_e is not None and dt_s >= dt_e:
+        return "Error: Updated start time must be before updated end time."
+
+    columns: dict[str, str] = {}
+    if dt_s is not None:
+        columns["start_ts"] = dt_s.isoformat()
+    if dt_e is not None:
+        columns["end_ts"] = dt_e.isoformat()
+    times_changed = bool(columns)
+    columns.update({k: v for k, v in {
+        "title": title, "location": location, "notes": notes
+    }.items() if v is not None})
+
+    if not columns:
         return "Error: No fields provided for update."
 
+    # One statement: the time-order check runs in SQL against the row as it is
+    # at write time, and `version` turns a lost update into a detected conflict.
+    sql = (
+        f"UPDATE events SET {', '.join(f'{c} = ?' for c in columns)}, "
+        "updated_at = ?, version = version + 1 WHERE id = ? AND calendar_id = ?"
+    )
+    calendar_id = _calendar_id()
+    params: list = [*columns.values(), datetime.now(ROME_TZ).isoformat(), event_id, calendar_id]
+    if times_changed:
+        sql += " AND julianday(COALESCE(?, start_ts)) < julianday(COALESCE(?, end_ts))"
+        params += [columns.get("start_ts"), columns.get("end_ts")]
+    if expected_version is not None:
+        sql += " AND version = ?"
+        params.append(expected_version)
+    sql += f" RETURNING {_ROW_COLUMNS}"
+
     with _span("sqlite.update_event") as span:
-        with _connect() as conn:
-            event = conn.execute("SELECT * FROM events WHERE id = ?", (event_id,)).fetchone()
-            if not event:
-                if span is not None:
-                    span.set_attribute("rows_affected", 0)
-                return f"Error: Event with ID {event_id} not found."
-                
-            new_start_iso = start_iso or event["start_ts"]
-            new_end_iso = end_iso or event["end_ts"]
-            
-            try:
-                dt_s = _parse_iso_rome(new_start_iso)
-                dt_e = _parse_iso_rome(new_end_iso)
-                if dt_s >= dt_e:
-                    if span is not None:
-                        span.set_attribute("rows_affected", 0)
-                    return "Error: Updated start time must be before updated end time."
-                
-                # Update fields with normalized strings if they were provided
-                if "start_iso" in fields: fields["start_iso"] = dt_s.isoformat()
-                if "end_iso" in fields: fields["end_iso"] = dt_e.isoformat()
-            except ValueError:
+        if span is not None:
+            span.set_attribute("calendar_id", calendar_id)
+        with _write_db() as conn:
+            row = conn.execute(sql, params).fetchone()
+            if row is None:
                 if span is not None:
                     span.set_attribute("rows_affected", 0)
-                return "Error: Invalid ISO format in update."
-
-            update_sqls = []
-            params = []
-            for k, v in fields.items():
-                col_name = k
-                if k == "start_iso": col_name = "start_ts"
-                if k == "end_iso": col_name = "end_ts"
-                update_sqls.append(f"{col_name} = ?")
-                params.append(v)
-            
-            params.append(datetime.now(ROME_TZ).isoformat())
-            params.append(event_id)
-            
-            cursor = conn.execute(
-                f"UPDATE events SET {', '.join(update_sqls)}, updated_at = ? WHERE id = ?",
-                params
-            )
-            rows_affected = cursor.rowcount
+                return _update_failure(conn, calendar_id, event_id, expected_version)
+            if times_changed:
+                refresh_day_buckets(conn)
 
         if span is not None:
-            span.set_attribute("rows_affected", 0 if rows_affected == -1 else rows_affected)
+            span.set_attribute("rows_affected", 1)
 
-        _invalidate_tool_cache()
+        _invalidate_tool_cache(changes=ReadModelChanges(upserts=[dict(row)]))
         print(f"Edited event {event_id}")
         if STRUCTURED:
-            return json.dumps({"updated_id": event_id}, separators=(",", ":"))
-        return f"Event {event_id} updated successfully."
+            result_obj = {
+                "updated_id": event_id,
+                "version": int(row["version"]),
+                "event": _event_row_to_dict(row),
+            }
+            return json.dumps(result_obj, separators=(",", ":"))
+        return f"Event {event_id} updated successfully: {_event_line(row)}"
+
+# Stays well under SQLite's host-parameter limit (999 on older builds).
+_ID_CHUNK_SIZE = 500
+
+def _id_chunks(ids: list[int]) -> Iterator[list[int]]:
+    for i in range(0, len(ids), _ID_CHUNK_SIZE):
+        yield ids[i:i + _ID_CHUNK_SIZE]
+
+def _like_pattern(text: str) -> str:
+    escaped = text.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return f"%{escaped}%"
+
+def _match_filters(
+    calendar_id: str,
+    s_norm: str | None,
+    e_norm: str | None,
+    title_contains: str | None,
+    location_contains: str | None,
+) -> tuple[str, list]:
+    """WHERE clause shared by the predicate tools; LIKE matching is case-insensitive."""
+    clauses = ["calendar_id = ?"]
+    params: list = [calendar_id]
+    if e_norm is not None:
+        clauses.append("start_ts < ?")
+        params.append(e_norm)
+    if s_norm is not None:
+        clauses.append("end_ts > ?")
+        params.append(s_norm)
+    if title_contains:
+        clauses.append("title LIKE ? ESCAPE '\\'")
+        params.append(_like_pattern(title_contains))
+    if location_contains:
+        clauses.append("location LIKE ? ESCAPE '\\'")
+        params.append(_like_pattern(location_contains))
+    return " AND ".join(clauses), params
+
+def _render_matched(rows: list[sqlite3.Row], verb: str, dry_run: bool, count_key: str) -> str:
+    if STRUCTURED:
+        return json.dumps(
+            {
+                "dry_run": dry_run,
+                count_key: len(rows),
+                "events": [_event_row_to_dict(r) for r in rows],
+            },
+            separators=(",", ":"),
+        )
+    if not rows:
+        return "No matching events."
+    if dry_run:
+        header = f"Would {verb} {len(rows)} event(s):"
+    else:
+        header = f"{verb.capitalize()}d {len(rows)} event(s):"
+    return "\n".join([header, *(_event_line(r) for r in rows)])
 
 @tool
 def delete_events(event_ids: list[int]) -> str:
@@ -311,17 +1071,32 @@ def delete_events(event_ids: list[int]) -> str:
     if not all(isinstance(i, int) for i in event_ids):
         return "Error: All IDs must be integers."
 
+    calendar_id = _calendar_id()
     with _span("sqlite.delete_events") as span:
-        with _connect() as conn:
-            placeholders = ",".join("?" for _ in event_ids)
-            cursor = conn.execute(f"DELETE FROM events WHERE id IN ({placeholders})", event_ids)
-            rows_affected = cursor.rowcount
+        if span is not None:
+            span.set_attribute("calendar_id", calendar_id)
+        with _write_db() as conn:
+            rows_affected = 0
+            for chunk in _id_chunks(event_ids):
+                placeholders = ",".join("?" for _ in chunk)
+                deleted = conn.execute(
+                    f"DELETE FROM events WHERE calendar_id = ? AND id IN ({placeholders})",
+                    [calendar_id, *chunk],
+                ).rowcount
+                if deleted < len(chunk):
+                    # The remaining ids may belong to archived events.
+                    deleted += conn.execute(
+                        f"DELETE FROM events_archive WHERE calendar_id = ? AND id IN ({placeholders})",
+                        [calendar_id, *chunk],
+                    ).rowcount
+                rows_affected += deleted
+            refresh_day_buckets(conn)
 
         if span is not None:
             span.set_attribute("rows_affected", 0 if rows_affected == -1 else rows_affected)
             span.set_attribute("event_ids_count", len(event_ids))
 
-        _invalidate_tool_cache()
+        _invalidate_tool_cache(changes=ReadModelChanges(deletes=list(event_ids)))
         print(f"Deleted event(s) {event_ids}")
         if STRUCTURED:
             return json.dumps(
@@ -330,3 +1105,419 @@ def delete_events(event_ids: list[int]) -> str:
             )
         return f"Deleted {rows_affected} event(s). Attempted IDs: {event_ids}"
 
+
+# Ranges longer than this are summarized per month instead of per day.
+_SUMMARY_DAILY_MAX_DAYS = 62
+
+def _compress_days(days: list[date]) -> list[tuple[date, date]]:
+    runs: list[tuple[date, date]] = []
+    for day in days:
+        if runs and runs[-1][1] + timedelta(days=1) == day:
+            runs[-1] = (runs[-1][0], day)
+        else:
+            runs.append((day, day))
+    return runs
+
+def _hours(minutes: int) -> str:
+    return f"{minutes / 60:.1f} h"
+
+@tool
+def summarize_range(start_iso: str, end_iso: str) -> str:
+    """
+    Summarizes how busy the calendar is over a range (days, weeks, months or a year)
+    without listing individual events. Use it for questions like "how busy am I in
+    March" or "which days next month are free".
+
+    Args:
+        start_iso: Start of the range in ISO 8601 format.
+        end_iso: End of the range in ISO 8601 format.
+    """
+    try:
+        dt_s = _parse_iso_rome(start_iso)
+        dt_e = _parse_iso_rome(end_iso)
+    except ValueError:
+        return "Error: Invalid ISO format for start or end time."
+    if dt_s >= dt_e:
+        return "Error: Start time must be before end time."
+
+    calendar_id = _calendar_id()
+    days = days_touched(dt_s, dt_e)
+    first_day, end_day = days[0], days[-1] + timedelta(days=1)
+
+    with _span("sqlite.summarize_range") as span:
+        if span is not None:
+            span.set_attribute("calendar_id", calendar_id)
+            span.set_attribute("days", len(days))
+        with _db() as conn:
+            stale = has_dirty_buckets(conn)
+        if stale:
+            # Events were changed by a writer that didn't refresh the buckets.
+            with _write_db() as conn:
+                refresh_day_buckets(conn)
+        with _db() as conn:
+            buckets = read_day_buckets(conn, calendar_id, first_day, end_day)
+
+    by_day = {b.day: b for b in buckets}
+    free_days = [d for d in days if d not in by_day]
+    total_events = sum(b.event_count for b in buckets)
+    busy_minutes = sum(b.busy_minutes for b in buckets)
+    daily = len(days) <= _SUMMARY_DAILY_MAX_DAYS
+
+    months: dict[str, dict] = {}
+    if not daily:
+        for d in days:
+            entry = months.setdefault(
+                d.strftime("%Y-%m"),
+                {"month": d.strftime("%Y-%m"), "event_count": 0,
+                 "busy_days": 0, "busy_minutes": 0, "free_days": 0},
+            )
+            bucket = by_day.get(d)
+            if bucket is None:
+                entry["free_days"] += 1
+            else:
+                entry["event_count"] += bucket.event_count
+                entry["busy_days"] += 1
+                entry["busy_minutes"] += bucket.busy_minutes
+
+    if STRUCTURED:
+        result_obj = {
+            "start": dt_s.isoformat(),
+            "end": dt_e.isoformat(),
+            "granularity": "day" if daily else "month",
+            "total_events": total_events,
+            "busy_days": len(buckets),
+            "busy_minutes": busy_minutes,
+        }
+        if daily:
+            result_obj["buckets"] = [
+                {
+                    "day": b.day.isoformat(),
+                    "event_count": b.event_count,
+                    "busy_minutes": b.busy_minutes,
+                    "first_start": b.first_start.isoformat(),
+                    "last_end": b.last_end.isoformat(),
+                }
+                for b in buckets
+            ]
+            result_obj["free_days"] = [d.isoformat() for d in free_days]
+        else:
+            result_obj["buckets"] = list(months.values())
+        return json.dumps(result_obj, separators=(",", ":"))
+
+    lines = [
+        f"{first_day.strftime('%a %b %d, %Y')} – {days[-1].strftime('%a %b %d, %Y')}: "
+        f"{total_events} event(s) over {len(buckets)} busy day(s), "
+        f"{_hours(busy_minutes)} busy, {len(free_days)} free day(s)."
+    ]
+    if not daily:
+        for entry in months.values():
+            label = datetime.strptime(entry["month"], "%Y-%m").strftime("%b %Y")
+            lines.append(
+                f"{label}: {entry['event_count']} event(s) over {entry['busy_days']} busy day(s), "
+                f"{_hours(entry['busy_minutes'])} busy, {entry['free_days']} free day(s)"
+            )
+        return "\n".join(lines)
+
+    for b in buckets:
+        lines.append(
+            f"{b.day.strftime('%a %b %d')}: {b.event_count} event(s), "
+            f"{_hours(b.busy_minutes)} busy "
+            f"({b.first_start.strftime('%H:%M')}–{b.last_end.strftime('%H:%M')})"
+        )
+    if free_days:
+        runs = []
+        for first, last in _compress_days(free_days):
+            if first == last:
+                runs.append(first.strftime("%a %b %d"))
+            else:
+                runs.append(f"{first.strftime('%a %b %d')}–{last.strftime('%a %b %d')}")
+        lines.append("Free: " + ", ".join(runs))
+    return "\n".join(lines)
+
+@tool
+def delete_events_in_range(
+    start_iso: str,
+    end_iso: str,
+    title_contains: str | None = None,
+    location_contains: str | None = None,
+    dry_run: bool = False,
+) -> str:
+    """
+    Deletes every event overlapping a range in one step, optionally only those whose
+    title or location contains the given text. No list_events call is needed first.
+
+    Args:
+        start_iso: Start of the range in ISO 8601 format.
+        end_iso: End of the range in ISO 8601 format.
+        title_contains: Only delete events whose title contains this text (case-insensitive).
+        location_contains: Only delete events whose location contains this text (case-insensitive).
+        dry_run: If true, only return the events that would be deleted.
+    """
+    try:
+        s_norm = _parse_iso_rome(start_iso).isoformat()
+        e_norm = _parse_iso_rome(end_iso).isoformat()
+    except ValueError:
+        return "Error: Invalid ISO format for start or end time."
+    if s_norm >= e_norm:
+        return "Error: Start time must be before end time."
+
+    calendar_id = _calendar_id()
+    where, params = _match_filters(calendar_id, s_norm, e_norm, title_contains, location_contains)
+    columns = _ROW_COLUMNS
+    with _span("sqlite.delete_events_in_range") as span:
+        if span is not None:
+            span.set_attribute("calendar_id", calendar_id)
+            span.set_attribute("dry_run", dry_run)
+        if dry_run:
+            with _db() as conn:
+                rows = conn.execute(
+                    f"SELECT {columns} FROM events WHERE {where} ORDER BY start_ts ASC", params
+                ).fetchall()
+                if archive_reaches(conn, calendar_id, s_norm):
+                    rows += conn.execute(
+                        f"SELECT {columns} FROM events_archive WHERE {where}", params
+                    ).fetchall()
+        else:
+            with _write_db() as conn:
+                rows = conn.execute(
+                    f"DELETE FROM events WHERE {where} RETURNING {columns}", params
+                ).fetchall()
+                if archive_reaches(conn, calendar_id, s_norm):
+                    rows += conn.execute(
+                        f"DELETE FROM events_archive WHERE {where} RETURNING {columns}", params
+                    ).fetchall()
+                refresh_day_buckets(conn)
+        rows.sort(key=lambda r: r["start_ts"])
+
+        if span is not None:
+            span.set_attribute("rows_affected", 0 if dry_run else len(rows))
+
+    if not dry_run and rows:
+        _invalidate_tool_cache(changes=ReadModelChanges(deletes=[r["id"] for r in rows]))
+        print(f"Deleted event(s) {[r['id'] for r in rows]}")
+    return _render_matched(rows, "delete", dry_run, "deleted_count")
+
+@tool
+def update_events_matching(
+    title_contains: str | None = None,
+    location_contains: str | None = None,
+    start_iso: str | None = None,
+    end_iso: str | None = None,
+    new_title: str | None = None,
+    new_location: str | None = None,
+    new_notes: str | None = None,
+    dry_run: bool = False,
+) -> str:
+    """
+    Updates every event matching the filters in one step, e.g. renaming all events
+    titled "Standup". At least one filter and one new value are required.
+
+    Args:
+        title_contains: Match events whose title contains this text (case-insensitive).
+        location_contains: Match events whose location contains this text (case-insensitive).
+        start_iso: Only match events ending after this ISO 8601 time.
+        end_iso: Only match events starting before this ISO 8601 time.
+        new_title: New title for the matched events.
+        new_location: New location for the matched events.
+        new_notes: New notes for the matched events.
+        dry_run: If true, only return the events that would be updated.
+    """
+    updates = {k: v for k, v in {
+        "title": new_title, "location": new_location, "notes": new_notes
+    }.items() if v is not None}
+    if not updates:
+        return "Error: No new values provided for update."
+    if not (title_contains or location_contains or start_iso or end_iso):
+        return "Error: At least one filter is required."
+    try:
+        s_norm = _parse_iso_rome(start_iso).isoformat() if start_iso else None
+        e_norm = _parse_iso_rome(end_iso).isoformat() if end_iso else None
+    except ValueError:
+        return "Error: Invalid ISO format for start or end time."
+
+    calendar_id = _calendar_id()
+    where, params = _match_filters(calendar_id, s_norm, e_norm, title_contains, location_contains)
+    columns = _ROW_COLUMNS
+    with _span("sqlite.update_events_matching") as span:
+        if span is not None:
+            span.set_attribute("calendar_id", calendar_id)
+            span.set_attribute("dry_run", dry_run)
+        if dry_run:
+            with _db() as conn:
+                rows = conn.execute(
+                    f"SELECT {columns} FROM events WHERE {where} ORDER BY start_ts ASC", params
+                ).fetchall()
+        else:
+            assignments = ", ".join(f"{col} = ?" for col in updates)
+            with _write_db() as conn:
+                rows = conn.execute(
+                    f"UPDATE events SET {assignments}, updated_at = ?, version = version + 1 "
+                    f"WHERE {where} RETURNING {columns}",
+                    [*updates.values(), datetime.now(ROME_TZ).isoformat(), *params],
+                ).fetchall()
+            rows.sort(key=lambda r: r["start_ts"])
+
+        if span is not None:
+            span.set_attribute("rows_affected", 0 if dry_run else len(rows))
+
+    if not dry_run and rows:
+        _invalidate_tool_cache(changes=ReadModelChanges(upserts=[dict(r) for r in rows]))
+        print(f"Edited event(s) {[r['id'] for r in rows]}")
+    return _render_matched(rows, "update", dry_run, "updated_count")
+
+def _title_search_days() -> int:
+    try:
+        return max(1, int(os.getenv("CALENDAR_TITLE_SEARCH_DAYS", "31")))
+    except ValueError:
+        return 31
+
+# Enough to disambiguate without flooding the model's context.
+_MAX_TITLE_CANDIDATES = 5
+
+def _title_search_range(
+    search_start_iso: str | None, search_end_iso: str | None
+) -> tuple[str, str]:
+    """Bounds a title lookup; defaults to today through `CALENDAR_TITLE_SEARCH_DAYS` ahead."""
+    if search_start_iso:
+        start = _parse_iso_rome(search_start_iso)
+    else:
+        start = datetime.now(ROME_TZ).replace(hour=0, minute=0, second=0, microsecond=0)
+    if search_end_iso:
+        end = _parse_iso_rome(search_end_iso)
+    else:
+        end = start + timedelta(days=_title_search_days())
+    return start.isoformat(), end.isoformat()
+
+def _find_by_title(calendar_id: str, title: str, s_norm: str, e_norm: str) -> list[sqlite3.Row]:
+    """
+    Events starting in [s_norm, e_norm) whose title contains `title`, via the
+    (calendar_id, start_ts) index. Matching is case-insensitive for any script
+    (Unicode casefold). Exact title matches win over substring matches, so
+    "Sync" does not collide with "Sync prep"; they are ordered first so the
+    candidate LIMIT cannot cut them off.
+    """
+    wanted = title.strip().casefold()
+    with _db() as conn:
+        rows = conn.execute(
+            f"""
+            SELECT {_ROW_COLUMNS} FROM events
+            WHERE calendar_id = ? AND start_ts >= ? AND start_ts < ?
+              AND instr(py_casefold(title), ?) > 0
+            ORDER BY trim(py_casefold(title)) = ? DESC, start_ts ASC
+            LIMIT ?
+            """,
+            (
+                calendar_id,
+                s_norm,
+                e_norm,
+                title.casefold(),
+                wanted,
+                _MAX_TITLE_CANDIDATES + 1,
+            ),
+        ).fetchall()
+    exact = [r for r in rows if r["title"].strip().casefold() == wanted]
+    return exact or rows
+
+def _title_lookup_failure(title: str, rows: list[sqlite3.Row], s_norm: str, e_norm: str) -> str:
+    if not rows:
+        if STRUCTURED:
+            return json.dumps(
+                {"status": "not_found", "title": title, "start": s_norm, "end": e_norm},
+                separators=(",", ":"),
+            )
+        return (
+            f"Error: No event titled '{title}' between "
+            f"{_pretty_time(s_norm)} and {_pretty_time(e_norm)}."
+        )
+    shown = rows[:_MAX_TITLE_CANDIDATES]
+    if STRUCTURED:
+        return json.dumps(
+            {
+                "status": "ambiguous",
+                "candidates": [_event_row_to_dict(r) for r in shown],
+                "truncated": len(rows) > len(shown),
+            },
+            separators=(",", ":"),
+        )
+    more = " (more not shown)" if len(rows) > len(shown) else ""
+    return "\n".join(
+        [f"Ambiguous: {len(shown)} events match '{title}'{more}. Ask which one, or retry by ID:"]
+        + [_event_line(r) for r in shown]
+    )
+
+@tool
+def reschedule_by_title(
+    title: str,
+    new_start_iso: str,
+    new_end_iso: str | None = None,
+    search_start_iso: str | None = None,
+    search_end_iso: str | None = None,
+) -> str:
+    """
+    Finds a single event by title and moves it, in one step (no list_events needed).
+    If several events match, returns the candidates and changes nothing.
+
+    Args:
+        title: Title (or part of it) of the event to move.
+        new_start_iso: New start time in ISO 8601 format.
+        new_end_iso: New end time; if omitted the event keeps its duration.
+        search_start_iso: Start of the search window (default: today).
+        search_end_iso: End of the search window (default: 31 days after its start).
+    """
+    try:
+        s_norm, e_norm = _title_search_range(search_start_iso, search_end_iso)
+        new_start = _parse_iso_rome(new_start_iso)
+        new_end = _parse_iso_rome(new_end_iso) if new_end_iso else None
+    except ValueError:
+        return "Error: Invalid ISO format."
+
+    calendar_id = _calendar_id()
+    with _span("sqlite.find_by_title") as span:
+        rows = _find_by_title(calendar_id, title, s_norm, e_norm)
+        if span is not None:
+            span.set_attribute("calendar_id", calendar_id)
+            span.set_attribute("rows_returned", len(rows))
+    if len(rows) != 1:
+        return _title_lookup_failure(title, rows, s_norm, e_norm)
+
+    event = rows[0]
+    if new_end is None:
+        duration = _parse_iso_rome(event["end_ts"]) - _parse_iso_rome(event["start_ts"])
+        new_end = new_start + duration
+    # The version guard catches edits that land between the lookup and the update.
+    return update_event(
+        event["id"],
+        start_iso=new_start.isoformat(),
+        end_iso=new_end.isoformat(),
+        expected_version=event["version"],
+    )
+
+@tool
+def delete_by_title(
+    title: str,
+    search_start_iso: str | None = None,
+    search_end_iso: str | None = None,
+) -> str:
+    """
+    Finds a single event by title and deletes it, in one step (no list_events needed).
+    If several events match, returns the candidates and deletes nothing.
+
+    Args:
+        title: Title (or part of it) of the event to delete.
+        search_start_iso: Start of the search window (default: today).
+        search_end_iso: End of the search window (default: 31 days after its start).
+    """
+    try:
+        s_norm, e_norm = _title_search_range(search_start_iso, search_end_iso)
+    except ValueError:
+        return "Error: Invalid ISO format."
+
+    calendar_id = _calendar_id()
+    with _span("sqlite.find_by_title") as span:
+        rows = _find_by_title(calendar_id, title, s_norm, e_norm)
+        if span is not None:
+            span.set_attribute("calendar_id", calendar_id)
+            span.set_attribute("rows_returned", len(rows))
+    if len(rows) != 1:
+        return _title_lookup_failure(title, rows, s_norm, e_norm)
+    return delete_events([rows[0]["id"]])
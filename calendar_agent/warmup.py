@@ -0,0 +1,101 @@
+import threading
+import time
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Callable
+from zoneinfo import ZoneInfo
+
+from .timeparse import resolve_range
+from .tools import analyze_db, archive_old_events, init_db, seed_db, warm_list_cache
+from .utils import env_truthy
+
+ROME_TZ = ZoneInfo("Europe/Rome")
+# Ranges the first turn most often asks for; resolved with timeparse against "now".
+WARMUP_PHRASES = ("today", "this week")
+
+
+def warmup_enabled() -> bool:
+    return env_truthy("CALENDAR_WARMUP", "1")
+
+
+@dataclass
+class WarmupReport:
+    background: bool = True
+    steps: dict[str, float] = field(default_factory=dict)
+    total_ms: float = 0.0
+    # How long the first turn blocked on the warm-up after the user hit enter.
+    waited_ms: float = 0.0
+    warmed_ranges: int = 0
+
+    @property
+    def hidden_ms(self) -> float:
+        """Start-up work that overlapped with the user typing."""
+        if not self.background:
+            return 0.0
+        return max(0.0, self.total_ms - self.waited_ms)
+
+
+class Warmup:
+    """
+    Runs the REPL start-up work (DB open and seed, archiving, ANALYZE, tool
+    cache prefill, agent construction) on a background thread so it overlaps
+    with the user typing the first message. `result()` joins it and returns
+    the agent; errors raised by the warm-up are re-raised there.
+    """
+
+    def __init__(
+        self,
+        build_agent: Callable[[], Any],
+        now: datetime | None = None,
+    ) -> None:
+        self._build_agent = build_agent
+        self._now = now
+        self._thread: threading.Thread | None = None
+        self._agent: Any = None
+        self._error: BaseException | None = None
+        self._joined = False
+        self.report = WarmupReport()
+
+    def start(self) -> "Warmup":
+        """Starts the background thread, or runs inline when `CALENDAR_WARMUP=0`."""
+        if not warmup_enabled():
+            self.report.background = False
+            self._run()
+            return self
+        self._thread = threading.Thread(target=self._run, name="calendar-warmup", daemon=True)
+        self._thread.start()
+        return self
+
+    def _step(self, name: str, fn: Callable[[], Any]) -> Any:
+        started = time.perf_counter()
+        try:
+            return fn()
+        finally:
+            self.report.steps[name] = (time.perf_counter() - started) * 1000
+
+    def _run(self) -> None:
+        started = time.perf_counter()
+        try:
+            now = self._now or datetime.now(ROME_TZ)
+            self._step("db", lambda: (init_db(), seed_db()))
+            archived = self._step("archive", lambda: archive_old_events(now))
+            if not archived.analyzed:
+                self._step("analyze", lambda: analyze_db(now))
+            ranges = [r for r in (resolve_range(p, now) for p in WARMUP_PHRASES) if r]
+            self.report.warmed_ranges = self._step("list_cache", lambda: warm_list_cache(ranges))
+            self._agent = self._step("agent", self._build_agent)
+        except BaseException as e:
+            self._error = e
+        finally:
+            self.report.total_ms = (time.perf_counter() - started) * 1000
+
+    def result(self) -> Any:
+        if not self._joined:
+            started = time.perf_counter()
+            if self._thread is not None:
+                self._thread.join()
+                self.report.waited_ms = (time.perf_counter() - started) * 1000
+            self._joined = True
+        if self._error is not None:
+            raise self._error
+        return self._agent
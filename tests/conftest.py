@@ -0,0 +1,120 @@
+from collections.abc import Callable
+from uuid import uuid4
+
+import pytest
+from datapizza.core.clients import Client, ClientResponse
+from datapizza.core.clients.models import TokenUsage
+from datapizza.type import FunctionCallBlock, TextBlock
+
+from calendar_agent import tools
+from calendar_agent.intent_cache import INTENT_CACHE
+from calendar_agent.read_model import READ_MODEL
+
+
+class StubClient(Client):
+    """
+    Offline stand-in for GoogleClient.
+
+    `script` is a list of steps, consumed one per model call: a string is a
+    final text answer, a `(tool_name, arguments)` tuple is a tool call. When
+    the script runs out the client echoes the latest user input.
+    """
+
+    def __init__(self, script: list | None = None, model_name: str = "stub", cache=None):
+        super().__init__(model_name=model_name, system_prompt="", cache=cache)
+        self.script = list(script or [])
+        self.calls: list[dict] = []
+
+    def _next_response(self, input, tools, **kwargs) -> ClientResponse:
+        self.calls.append({"input": input, "tools": tools, **kwargs})
+        usage = TokenUsage(prompt_tokens=10, completion_tokens=5)
+        if self.script:
+            step = self.script.pop(0)
+            if isinstance(step, tuple):
+                name, arguments = step
+                tool = next(t for t in tools or [] if t.name == name)
+                block = FunctionCallBlock(
+                    id=str(uuid4()), arguments=arguments, name=name, tool=tool
+                )
+                return ClientResponse(content=[block], usage=usage)
+            return ClientResponse(content=[TextBlock(content=step)], usage=usage)
+        text = " ".join(b.content for b in input or [] if isinstance(b, TextBlock))
+        return ClientResponse(content=[TextBlock(content=f"Echo: {text}")], usage=usage)
+
+    def _invoke(self, input, tools=None, memory=None, tool_choice="auto", **kwargs):
+        return self._next_response(input, tools, memory=memory, **kwargs)
+
+    async def _a_invoke(self, input, tools=None, memory=None, tool_choice="auto", **kwargs):
+        return self._next_response(input, tools, memory=memory, **kwargs)
+
+    def _stream_invoke(self, input, tools=None, memory=None, tool_choice="auto", *args, **kwargs):
+        response = self._next_response(input, tools, memory=memory)
+        text = response.text
+        if not text:
+            yield response
+            return
+        words = text.split(" ")
+        emitted = ""
+        for i, word in enumerate(words):
+            delta = word if i == 0 else f" {word}"
+            emitted += delta
+            yield ClientResponse(content=[TextBlock(content=emitted)], delta=delta)
+        yield ClientResponse(content=response.content, usage=response.usage)
+
+    async def _a_stream_invoke(self, input, tools=None, memory=None, tool_choice="auto", *args, **kwargs):
+        for chunk in self._stream_invoke(input, tools, memory):
+            yield chunk
+
+    def _convert_tool_choice(self, tool_choice):
+        return {"tool_choice": tool_choice}
+
+    def _structured_response(self, *args, **kwargs):
+        raise NotImplementedError
+
+    async def _a_structured_response(self, *args, **kwargs):
+        raise NotImplementedError
+
+
+@pytest.fixture
+def stub_client() -> Callable[..., StubClient]:
+    return StubClient
+
+
+def reset_tools_state() -> None:
+    """Drops every process-wide cache and handle the tools module keeps."""
+    tools.DB_REVISIONS.clear()
+    tools.LIST_CACHE.clear()
+    tools._PREFETCHED_KEYS.clear()
+    tools._WARMED_KEYS.clear()
+    tools._CACHE_STORED_REVISIONS.clear()
+    tools._SCHEMA_READY.clear()
+    with tools._WATCHERS_LOCK:
+        while tools._WATCHERS:
+            _, watcher = tools._WATCHERS.popitem()
+            watcher.conn.close()
+    tools.SHARD_POOL.close_all()
+    READ_MODEL.clear()
+    INTENT_CACHE.clear()
+
+
+@pytest.fixture(autouse=True)
+def _isolated_tools_state():
+    reset_tools_state()
+    yield
+    reset_tools_state()
+
+
+@pytest.fixture
+def calendar_db_path(tmp_path, monkeypatch):
+    """Points the tools at a fresh single-file database without creating it."""
+    db_path = tmp_path / "calendar.db"
+    monkeypatch.setenv("CALENDAR_DB_PATH", str(db_path))
+    monkeypatch.delenv("CALENDAR_SHARD_DIR", raising=False)
+    return db_path
+
+
+@pytest.fixture
+def calendar_db(calendar_db_path):
+    """A fresh single-file database with the schema in place."""
+    tools.init_db()
+    return calendar_db_path
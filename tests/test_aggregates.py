@@ -0,0 +1,119 @@
+import json
+import sqlite3
+
+import pytest
+
+from calendar_agent import tools
+
+
+@pytest.fixture
+def agg_db(calendar_db, monkeypatch):
+    monkeypatch.setattr(tools, "STRUCTURED", True)
+    return calendar_db
+
+
+def _bucket_rows(db_path):
+    with sqlite3.connect(db_path) as conn:
+        return {
+            row[0]: (row[1], row[2])
+            for row in conn.execute(
+                "SELECT day, event_count, busy_minutes FROM day_buckets ORDER BY day"
+            )
+        }
+
+
+def test_buckets_follow_writes_and_union_overlaps(agg_db):
+    tools.add_event("A", "2026-03-02T09:00:00", "2026-03-02T10:00:00")
+    tools.add_event("B", "2026-03-02T09:30:00", "2026-03-02T11:00:00")
+    assert _bucket_rows(agg_db) == {"2026-03-02": (2, 120)}
+
+    event_id = json.loads(
+        tools.add_event("Offsite", "2026-03-03T22:00:00", "2026-03-05T00:00:00")
+    )["created_id"]
+    rows = _bucket_rows(agg_db)
+    assert rows["2026-03-03"] == (1, 120)
+    assert rows["2026-03-04"] == (1, 1440)
+    assert "2026-03-05" not in rows
+
+    tools.update_event(event_id, start_iso="2026-03-10T09:00:00", end_iso="2026-03-10T10:00:00")
+    rows = _bucket_rows(agg_db)
+    assert "2026-03-03" not in rows and "2026-03-04" not in rows
+    assert rows["2026-03-10"] == (1, 60)
+
+    tools.delete_events([event_id])
+    assert "2026-03-10" not in _bucket_rows(agg_db)
+
+
+def test_existing_events_are_backfilled(agg_db):
+    with sqlite3.connect(agg_db) as conn:
+        conn.execute("DELETE FROM day_buckets")
+        conn.execute("DELETE FROM day_bucket_dirty")
+        conn.execute(
+            "INSERT INTO events (title, start_ts, end_ts, created_at, updated_at, calendar_id) "
+            "VALUES ('Old', '2026-03-02T09:00:00+01:00', '2026-03-02T09:45:00+01:00', '', '', 'default')"
+        )
+        conn.execute("DELETE FROM day_buckets")
+        conn.execute("DELETE FROM day_bucket_dirty")
+    tools.init_db()
+    assert _bucket_rows(agg_db) == {"2026-03-02": (1, 45)}
+
+
+def test_summarize_range_daily_lists_busy_and_free_days(agg_db):
+    tools.add_event("A", "2026-03-02T09:00:00", "2026-03-02T10:30:00")
+    tools.add_event("B", "2026-03-04T14:00:00", "2026-03-04T15:00:00")
+
+    result = json.loads(tools.summarize_range("2026-03-02T00:00:00", "2026-03-09T00:00:00"))
+    assert result["granularity"] == "day"
+    assert result["total_events"] == 2
+    assert result["busy_minutes"] == 150
+    assert [b["day"] for b in result["buckets"]] == ["2026-03-02", "2026-03-04"]
+    assert len(result["free_days"]) == 5
+
+
+def test_summarize_range_rolls_long_ranges_up_by_month(agg_db, monkeypatch):
+    tools.add_event("Jan", "2026-01-15T09:00:00", "2026-01-15T10:00:00")
+    tools.add_event("Mar", "2026-03-20T09:00:00", "2026-03-20T11:00:00")
+
+    result = json.loads(tools.summarize_range("2026-01-01T00:00:00", "2027-01-01T00:00:00"))
+    assert result["granularity"] == "month"
+    months = {m["month"]: m for m in result["buckets"]}
+    assert len(months) == 12
+    assert months["2026-01"]["busy_minutes"] == 60
+    assert months["2026-02"]["event_count"] == 0
+    assert months["2026-03"]["free_days"] == 30
+
+    monkeypatch.setattr(tools, "STRUCTURED", False)
+    text = tools.summarize_range("2026-01-01T00:00:00", "2027-01-01T00:00:00")
+    assert "Mar 2026: 1 event(s) over 1 busy day(s), 2.0 h busy" in text
+
+
+def test_summarize_range_refreshes_external_writes(agg_db):
+    with sqlite3.connect(agg_db) as conn:
+        conn.execute(
+            "INSERT INTO events (title, start_ts, end_ts, created_at, updated_at, calendar_id) "
+            "VALUES ('External', '2026-03-06T08:00:00+01:00', '2026-03-06T08:30:00+01:00', '', '', 'default')"
+        )
+
+    result = json.loads(tools.summarize_range("2026-03-06T00:00:00", "2026-03-07T00:00:00"))
+    assert result["buckets"][0]["busy_minutes"] == 30
+
+
+def test_schema_setup_runs_once_per_database(calendar_db_path, monkeypatch):
+    monkeypatch.setattr(tools, "STRUCTURED", True)
+    calls = []
+    real_ensure = tools.ensure_aggregate_schema
+    monkeypatch.setattr(
+        tools, "ensure_aggregate_schema", lambda conn: (calls.append(1), real_ensure(conn))
+    )
+
+    tools.init_db()
+    for hour in (9, 10, 11):
+        # Each turn opens its own unit-of-work connection.
+        with tools.unit_of_work():
+            tools.list_events("2026-03-02T00:00:00", "2026-03-03T00:00:00")
+            tools.add_event("Turn", f"2026-03-02T{hour:02d}:00:00", f"2026-03-02T{hour:02d}:30:00")
+
+    assert len(calls) == 1
+    # Buckets still follow the writes without the per-connection refresh.
+    result = json.loads(tools.summarize_range("2026-03-02T00:00:00", "2026-03-03T00:00:00"))
+    assert (result["total_events"], result["busy_minutes"]) == (3, 90)
@@ -0,0 +1,102 @@
+import json
+import sqlite3
+from datetime import datetime
+from zoneinfo import ZoneInfo
+
+import pytest
+
+from calendar_agent import tools
+
+NOW = datetime(2026, 6, 1, 12, 0, tzinfo=ZoneInfo("Europe/Rome"))
+
+
+@pytest.fixture
+def archive_db(calendar_db, monkeypatch):
+    monkeypatch.setenv("CALENDAR_ARCHIVE_AFTER_DAYS", "30")
+    monkeypatch.setattr(tools, "STRUCTURED", True)
+    old_id = json.loads(
+        tools.add_event("Old Review", "2026-02-10T09:00:00", "2026-02-10T10:00:00")
+    )["created_id"]
+    new_id = json.loads(
+        tools.add_event("Planning", "2026-06-03T09:00:00", "2026-06-03T10:00:00")
+    )["created_id"]
+    return calendar_db, old_id, new_id
+
+
+def _count(db_path, table):
+    with sqlite3.connect(db_path) as conn:
+        return conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+
+
+def test_old_events_move_to_archive_and_stay_listable(archive_db):
+    db_path, old_id, _ = archive_db
+    before = tools.summarize_range("2026-02-01T00:00:00", "2026-03-01T00:00:00")
+
+    report = tools.archive_old_events(now=NOW)
+
+    assert report.archived == 1
+    assert report.analyzed
+    assert _count(db_path, "events") == 1
+    assert _count(db_path, "events_archive") == 1
+    listed = json.loads(tools.list_events("2026-02-10T00:00:00", "2026-02-11T00:00:00"))
+    assert [e["id"] for e in listed["events"]] == [old_id]
+    assert tools.summarize_range("2026-02-01T00:00:00", "2026-03-01T00:00:00") == before
+
+
+def test_recent_ranges_skip_the_archive(archive_db, monkeypatch):
+    tools.archive_old_events(now=NOW)
+    statements = []
+    real_connect = tools._connect
+
+    def traced_connect():
+        conn = real_connect()
+        conn.set_trace_callback(statements.append)
+        return conn
+
+    monkeypatch.setattr(tools, "_connect", traced_connect)
+    tools.list_events("2026-06-01T00:00:00", "2026-06-08T00:00:00")
+
+    selects = [s for s in statements if "SELECT id, title" in s]
+    assert selects and all("events_archive" not in s for s in selects)
+
+
+def test_archived_events_can_be_deleted_but_not_edited(archive_db):
+    db_path, old_id, _ = archive_db
+    tools.archive_old_events(now=NOW)
+
+    assert "archived" in tools.update_event(old_id, title="Renamed")
+    assert json.loads(tools.delete_events([old_id]))["deleted_count"] == 1
+    assert _count(db_path, "events_archive") == 0
+    summary = json.loads(tools.summarize_range("2026-02-10T00:00:00", "2026-02-11T00:00:00"))
+    assert summary["total_events"] == 0
+
+
+def test_retention_purges_archive_and_seed_does_not_refill(archive_db, monkeypatch):
+    db_path, _, new_id = archive_db
+    tools.archive_old_events(now=NOW)
+    tools.delete_events([new_id])
+    tools.seed_db()
+    assert _count(db_path, "events") == 0
+
+    monkeypatch.setenv("CALENDAR_ARCHIVE_RETENTION_DAYS", "90")
+    report = tools.archive_old_events(now=NOW)
+    assert report.purged == 1
+    assert _count(db_path, "events_archive") == 0
+
+
+def test_vacuum_runs_only_when_fragmented(archive_db, monkeypatch):
+    db_path, _, _ = archive_db
+    monkeypatch.setenv("CALENDAR_VACUUM_FREE_RATIO", "0.01")
+    with sqlite3.connect(db_path) as conn:
+        conn.executemany(
+            "INSERT INTO events (title, start_ts, end_ts, created_at, updated_at) VALUES (?, ?, ?, '', '')",
+            [("x" * 2000, "2025-01-01T09:00:00+01:00", "2025-01-01T10:00:00+01:00")] * 200,
+        )
+    monkeypatch.setenv("CALENDAR_ARCHIVE_RETENTION_DAYS", "90")
+
+    report = tools.archive_old_events(now=NOW)
+    assert report.purged == 201
+    assert report.vacuumed
+
+    monkeypatch.setenv("CALENDAR_VACUUM_FREE_RATIO", "0")
+    assert not tools.archive_old_events(now=NOW).vacuumed
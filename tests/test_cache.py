@@ -4,14 +4,9 @@ from calendar_agent.cache import InMemoryLRUCache
 
 
 @pytest.fixture
-def temp_db(tmp_path, monkeypatch):
-    db_file = tmp_path / "test_cache.db"
-    monkeypatch.setenv("CALENDAR_DB_PATH", str(db_file))
+def temp_db(calendar_db, monkeypatch):
     monkeypatch.setenv("CALENDAR_TOOL_CACHE_ENABLED", "1")
-    tools.DB_REVISION = 0
-    tools.LIST_CACHE.clear()
-    tools.init_db()
-    return db_file
+    return calendar_db
 
 
 def _seed_event():
@@ -110,3 +105,167 @@ def test_client_cache_records_saved_tokens(monkeypatch):
     call_count["connect"] = 0
     tools.list_events("2026-02-10T00:00:00", "2026-02-11T00:00:00")
     assert call_count["connect"] == 1
+
+
+def test_list_events_cache_sees_writes_from_other_processes(temp_db):
+    import sqlite3
+
+    _seed_event()
+    first = tools.list_events("2026-02-10T00:00:00", "2026-02-11T00:00:00")
+    assert tools.list_events("2026-02-10T00:00:00", "2026-02-11T00:00:00") == first
+
+    # Simulates another process writing through its own connection.
+    with sqlite3.connect(temp_db) as other:
+        other.execute(
+            "UPDATE events SET title = 'Renamed Elsewhere' WHERE title = 'Cached Event'"
+        )
+    other.close()
+
+    refreshed = tools.list_events("2026-02-10T00:00:00", "2026-02-11T00:00:00")
+    assert "Renamed Elsewhere" in refreshed
+    assert "Cached Event" not in refreshed
+
+
+def test_external_writes_invalidate_cache_inside_unit_of_work(temp_db):
+    import sqlite3
+
+    tools.add_event("Orig", "2026-02-10T10:00:00", "2026-02-10T11:00:00")
+    assert "Orig" in tools.list_events("2026-02-10T00:00:00", "2026-02-11T00:00:00")
+
+    with sqlite3.connect(temp_db) as other:
+        other.execute("UPDATE events SET title = 'External' WHERE title = 'Orig'")
+    other.close()
+
+    # Every agent turn runs in a unit of work; the external change must not wait for its commit.
+    with tools.unit_of_work():
+        refreshed = tools.list_events("2026-02-10T00:00:00", "2026-02-11T00:00:00")
+    assert "External" in refreshed
+    assert "Orig" not in refreshed
+
+
+def test_concurrent_writes_never_lose_a_revision_bump(temp_db, monkeypatch):
+    import time
+    from concurrent.futures import ThreadPoolExecutor
+
+    class YieldingRevisions(dict):
+        # Hands the GIL over between the read and the write of each bump.
+        def get(self, *args):
+            value = super().get(*args)
+            time.sleep(0)
+            return value
+
+    monkeypatch.setattr(tools, "DB_REVISIONS", YieldingRevisions())
+
+    def bump_many(_):
+        for _ in range(50):
+            tools._bump_revision("default", None)
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        list(pool.map(bump_many, range(8)))
+
+    assert tools.DB_REVISIONS["default"] == 400
+
+
+def _slow_client(stub_client, cache, delay_s=0.2):
+    import time
+
+    class SlowStub(stub_client):
+        def _invoke(self, input, tools=None, memory=None, tool_choice="auto", **kwargs):
+            time.sleep(delay_s)
+            return super()._invoke(input, tools, memory, tool_choice, **kwargs)
+
+    return SlowStub(["Answer"] * 4, cache=cache)
+
+
+def test_client_cache_coalesces_concurrent_identical_calls(stub_client, monkeypatch):
+    from concurrent.futures import ThreadPoolExecutor
+
+    events = []
+    monkeypatch.setenv("CALENDAR_TRACING", "1")
+    monkeypatch.setattr(
+        "calendar_agent.cache._record_cache_savings",
+        lambda layer, value: events.append(layer),
+    )
+    cache = InMemoryLRUCache(maxsize=4)
+    client = _slow_client(stub_client, cache)
+
+    with ThreadPoolExecutor(max_workers=3) as pool:
+        results = list(pool.map(lambda _: client.invoke("same prompt").text, range(3)))
+
+    assert results == ["Answer"] * 3
+    assert len(client.calls) == 1
+    assert cache.stats.coalesced == 2
+    assert events.count("singleflight") == 2
+
+
+def test_client_cache_waiters_fall_back_when_leader_fails(stub_client, monkeypatch):
+    import threading
+
+    monkeypatch.setenv("CALENDAR_CLIENT_CACHE_WAIT_SECONDS", "0.1")
+    cache = InMemoryLRUCache(maxsize=4)
+    assert cache.get("k") is None  # this thread is now the leader and never sets
+
+    result = {}
+    waiter = threading.Thread(target=lambda: result.setdefault("value", cache.get("k")))
+    waiter.start()
+    waiter.join(timeout=2)
+
+    assert not waiter.is_alive()
+    assert result["value"] is None
+    assert cache.stats.coalesced == 0
+
+
+def test_client_cache_waiters_fall_back_at_once_when_leader_raises(stub_client, monkeypatch):
+    import threading
+    import time
+
+    from calendar_agent.cache import release_on_error
+
+    monkeypatch.setenv("CALENDAR_CLIENT_CACHE_WAIT_SECONDS", "10")
+    leader_started = threading.Event()
+
+    class FailingStub(stub_client):
+        def _invoke(self, input, tools=None, memory=None, tool_choice="auto", **kwargs):
+            if not leader_started.is_set():
+                leader_started.set()
+                time.sleep(0.2)
+                raise RuntimeError("quota exceeded")
+            return super()._invoke(input, tools, memory, tool_choice, **kwargs)
+
+    cache = InMemoryLRUCache(maxsize=4)
+    client = FailingStub(["Answer"], cache=cache)
+    release_on_error(client)
+
+    def lead():
+        with pytest.raises(RuntimeError):
+            client.invoke("same prompt")
+
+    leader = threading.Thread(target=lead)
+    leader.start()
+    leader_started.wait(2)
+    started = time.monotonic()
+    assert client.invoke("same prompt").text == "Answer"
+    leader.join()
+
+    assert time.monotonic() - started < 2
+    assert cache._inflight == {}
+    assert cache.stats.coalesced == 0
+
+
+def test_client_cache_waiters_share_the_leaders_deadline(monkeypatch):
+    import threading
+    import time
+
+    monkeypatch.setenv("CALENDAR_CLIENT_CACHE_WAIT_SECONDS", "5")
+    cache = InMemoryLRUCache(maxsize=4)
+    assert cache.get("k") is None
+    cache._inflight["k"].started -= 4.9  # the leader has almost used up its time
+
+    result = {}
+    started = time.monotonic()
+    waiter = threading.Thread(target=lambda: result.setdefault("value", cache.get("k")))
+    waiter.start()
+    waiter.join(timeout=5)
+
+    assert result["value"] is None
+    assert time.monotonic() - started < 2
@@ -0,0 +1,80 @@
+from datetime import datetime
+from types import SimpleNamespace
+from zoneinfo import ZoneInfo
+
+import pytest
+
+from calendar_agent.agent import create_calendar_agent
+from calendar_agent.intent_cache import INTENT_CACHE, classify_intent
+from calendar_agent.server import _run_agent_turn
+from calendar_agent.telemetry import summarize_spans
+
+NOW = datetime(2026, 3, 2, 9, 0, tzinfo=ZoneInfo("Europe/Rome"))
+TOMORROW = {"start_iso": "2026-03-03T00:00:00", "end_iso": "2026-03-04T00:00:00"}
+
+
+@pytest.fixture
+def intent_db(calendar_db, monkeypatch):
+    monkeypatch.setenv("CALENDAR_INTENT_CACHE", "1")
+
+
+def test_paraphrases_share_one_intent():
+    a = classify_intent("What's on tomorrow?", NOW, structured=False)
+    b = classify_intent("show me tomorrow's events", NOW, structured=False)
+    assert a is not None and a == b
+    assert a.start == "2026-03-03T00:00:00+01:00"
+    assert classify_intent("show me tomorrow's events", NOW, structured=True) != a
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        "Add lunch tomorrow at 13",
+        "what do I have tomorrow with Marco?",
+        "am I free tomorrow?",
+        "tomorrow",
+        "what's on Friday?",
+    ],
+)
+def test_writes_filters_and_unresolved_ranges_bypass(text):
+    assert classify_intent(text, NOW, structured=False) is None
+
+
+def test_hit_skips_the_agent_and_writes_invalidate(intent_db, stub_client):
+    client = stub_client(
+        [
+            ("list_events", TOMORROW),
+            "Tomorrow is free.",
+            ("add_event", {"title": "Dentist", "start_iso": "2026-03-03T15:00:00", "end_iso": "2026-03-03T16:00:00"}),
+            "Added.",
+            ("list_events", TOMORROW),
+            "Tomorrow: Dentist at 15:00.",
+        ]
+    )
+    agent = create_calendar_agent(client=client)
+
+    assert _run_agent_turn(agent, "default", "What's on tomorrow?") == "Tomorrow is free."
+    assert _run_agent_turn(agent, "default", "show me tomorrow's events") == "Tomorrow is free."
+    assert len(client.calls) == 2
+    assert INTENT_CACHE.stats.hits == 1
+
+    _run_agent_turn(agent, "default", "Add a dentist appointment tomorrow at 15")
+    assert _run_agent_turn(agent, "default", "what's on tomorrow") == "Tomorrow: Dentist at 15:00."
+    assert len(client.calls) == 6
+    assert (INTENT_CACHE.stats.hits, INTENT_CACHE.stats.misses) == (1, 2)
+
+
+def test_summary_reports_intent_layer():
+    lookup = SimpleNamespace(
+        name="intent_cache.lookup",
+        attributes={
+            "intent_cache.outcome": "hit",
+            "intent_cache.session_hits": 1,
+            "intent_cache.session_lookups": 4,
+        },
+    )
+    marker = SimpleNamespace(name="cache.hit", attributes={"cache.layer": "intent"})
+    span = SimpleNamespace(attributes={}, events=[lookup, marker], name="intent_cache.lookup")
+    summary = summarize_spans([span])
+    assert summary["cache_hits"] == {"intent": 1}
+    assert summary["intent_cache"] == {"outcome": "hit", "session_hits": 1, "session_lookups": 4}
@@ -3,15 +3,12 @@ import pytest
 import sqlite3
 from datetime import datetime
 from zoneinfo import ZoneInfo
-from calendar_agent.tools import init_db, list_events, add_event, update_event, delete_events
+from calendar_agent.tools import list_events, add_event, update_event, delete_events
 from calendar_agent.timeparse import resolve_range, resolve_event_start_end
 
 @pytest.fixture
-def temp_db(tmp_path, monkeypatch):
-    db_file = tmp_path / "test_calendar.db"
-    monkeypatch.setenv("CALENDAR_DB_PATH", str(db_file))
-    init_db()
-    return db_file
+def temp_db(calendar_db):
+    return calendar_db
 
 def test_db_crud(temp_db):
     # Add
@@ -0,0 +1,84 @@
+import json
+import sqlite3
+
+import pytest
+
+from calendar_agent import tools
+
+
+@pytest.fixture
+def pred_db(calendar_db, monkeypatch):
+    monkeypatch.setattr(tools, "STRUCTURED", True)
+    tools.add_event("Standup", "2026-03-02T09:00:00", "2026-03-02T09:15:00", location="Room 1")
+    tools.add_event("Standup", "2026-03-03T09:00:00", "2026-03-03T09:15:00", location="Room 1")
+    tools.add_event("Review", "2026-03-02T14:00:00", "2026-03-02T15:00:00", location="Room 2")
+    tools.add_event("100% focus", "2026-03-02T16:00:00", "2026-03-02T17:00:00")
+    return calendar_db
+
+
+def test_delete_in_range_dry_run_then_delete(pred_db):
+    preview = json.loads(
+        tools.delete_events_in_range("2026-03-02T12:00:00", "2026-03-02T18:00:00", dry_run=True)
+    )
+    assert preview["dry_run"] is True
+    assert [e["title"] for e in preview["events"]] == ["Review", "100% focus"]
+    assert json.loads(tools.list_events("2026-03-02T00:00:00", "2026-03-03T00:00:00"))["events"][1]["title"] == "Review"
+
+    result = json.loads(
+        tools.delete_events_in_range("2026-03-02T12:00:00", "2026-03-02T18:00:00")
+    )
+    assert result["deleted_count"] == 2
+    remaining = json.loads(tools.list_events("2026-03-02T00:00:00", "2026-03-03T00:00:00"))
+    assert [e["title"] for e in remaining["events"]] == ["Standup"]
+
+
+def test_delete_in_range_filters_and_escapes_like(pred_db):
+    result = json.loads(
+        tools.delete_events_in_range(
+            "2026-03-01T00:00:00", "2026-03-08T00:00:00", title_contains="100%"
+        )
+    )
+    assert [e["title"] for e in result["events"]] == ["100% focus"]
+
+    result = json.loads(
+        tools.delete_events_in_range(
+            "2026-03-01T00:00:00", "2026-03-08T00:00:00", location_contains="room 2"
+        )
+    )
+    assert [e["title"] for e in result["events"]] == ["Review"]
+
+
+def test_update_matching_renames_in_one_statement(pred_db, monkeypatch):
+    statements = []
+    real_connect = tools._connect
+
+    def traced_connect():
+        conn = real_connect()
+        conn.set_trace_callback(statements.append)
+        return conn
+
+    monkeypatch.setattr(tools, "_connect", traced_connect)
+    result = json.loads(tools.update_events_matching(title_contains="standup", new_title="Daily"))
+
+    assert result["updated_count"] == 2
+    assert {e["title"] for e in result["events"]} == {"Daily"}
+    # Trigger programs are traced under the parent statement's text.
+    assert not [s for s in statements if s.lstrip().upper().startswith("SELECT")]
+    assert len({s for s in statements if s.lstrip().upper().startswith("UPDATE")}) == 1
+
+
+def test_update_matching_requires_filter_and_value(pred_db):
+    assert tools.update_events_matching(new_title="X").startswith("Error")
+    assert tools.update_events_matching(title_contains="Standup").startswith("Error")
+
+
+def test_delete_events_chunks_large_id_lists(pred_db):
+    with sqlite3.connect(pred_db) as conn:
+        conn.executemany(
+            "INSERT INTO events (title, start_ts, end_ts, created_at, updated_at) VALUES ('Bulk', ?, ?, '', '')",
+            [("2026-04-01T09:00:00+02:00", "2026-04-01T10:00:00+02:00")] * 1200,
+        )
+        ids = [row[0] for row in conn.execute("SELECT id FROM events WHERE title = 'Bulk'")]
+
+    result = json.loads(tools.delete_events(ids + [999_999]))
+    assert result["deleted_count"] == 1200
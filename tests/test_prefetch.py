@@ -0,0 +1,96 @@
+from datetime import datetime
+from zoneinfo import ZoneInfo
+
+import pytest
+
+from calendar_agent import tools
+from calendar_agent.prefetch import PREFETCHER, adjacent_ranges
+from calendar_agent.telemetry import summarize_spans
+from calendar_agent.timeparse import resolve_range
+
+
+@pytest.fixture
+def prefetch_db(calendar_db, monkeypatch):
+    monkeypatch.setenv("CALENDAR_TOOL_CACHE_ENABLED", "1")
+    monkeypatch.setenv("CALENDAR_PREFETCH", "1")
+    tools.add_event("Tomorrow Sync", "2026-02-11T09:00:00", "2026-02-11T10:00:00")
+    yield
+    PREFETCHER.wait_idle()
+
+
+def test_adjacent_ranges_cover_next_day_and_rest_of_week():
+    rome = ZoneInfo("Europe/Rome")
+    start = datetime(2026, 2, 10, tzinfo=rome)  # Tuesday
+    end = datetime(2026, 2, 11, tzinfo=rome)
+    ranges = adjacent_ranges(start, end, now=start)
+
+    assert ranges[0] == (end.isoformat(), datetime(2026, 2, 12, tzinfo=rome).isoformat())
+    assert (end.isoformat(), datetime(2026, 2, 16, tzinfo=rome).isoformat()) in ranges
+    assert (start.isoformat(), end.isoformat()) not in ranges
+
+
+def test_week_phrases_survive_the_range_cap(monkeypatch):
+    monkeypatch.setenv("CALENDAR_PREFETCH_MAX_RANGES", "4")
+    rome = ZoneInfo("Europe/Rome")
+    start = datetime(2026, 2, 10, 10, tzinfo=rome)  # a one-hour window on Tuesday
+    ranges = adjacent_ranges(start, datetime(2026, 2, 10, 11, tzinfo=rome), now=start)
+
+    assert len(ranges) == 4
+    assert resolve_range("this week", start) in ranges
+    assert resolve_range("next week", start) in ranges
+
+
+def test_next_day_is_served_from_prefetch(prefetch_db, monkeypatch):
+    tools.list_events("2026-02-10T00:00:00", "2026-02-11T00:00:00")
+    PREFETCHER.wait_idle()
+
+    calls = {"connect": 0}
+    real_connect = tools._connect
+
+    def counted_connect():
+        calls["connect"] += 1
+        return real_connect()
+
+    monkeypatch.setattr(tools, "_connect", counted_connect)
+    hits_before = PREFETCHER.stats.hits
+    result = tools.list_events("2026-02-11T00:00:00", "2026-02-12T00:00:00")
+
+    assert "Tomorrow Sync" in result
+    assert calls["connect"] == 0
+    assert PREFETCHER.stats.hits == hits_before + 1
+
+
+def test_writes_cancel_pending_prefetch(prefetch_db):
+    generation = PREFETCHER.generation("default")
+    tools.add_event("Later", "2026-02-11T11:00:00", "2026-02-11T12:00:00")
+    assert PREFETCHER.generation("default") == generation + 1
+    assert not PREFETCHER.is_current("default", generation)
+
+
+def test_summary_counts_hits_per_layer():
+    class Event:
+        def __init__(self, attributes):
+            self.name = "cache.hit"
+            self.attributes = attributes
+
+    class Span:
+        name = "Tool list_events"
+        attributes = {}
+        start_time = end_time = None
+        events = [
+            Event({"cache.layer": "prefetch"}),
+            Event({"cache.layer": "client"}),
+            Event({"cache.layer": "client", "cache.saved_total_tokens": 10}),
+        ]
+
+    summary = summarize_spans([Span()])
+    assert summary["cache_hits"] == {"prefetch": 1, "client": 1}
+
+
+def test_writes_drop_unserved_prefetch_keys(prefetch_db):
+    tools.list_events("2026-02-10T00:00:00", "2026-02-11T00:00:00")
+    PREFETCHER.wait_idle()
+    assert tools._PREFETCHED_KEYS.get("default")
+
+    tools.add_event("Later", "2026-02-12T11:00:00", "2026-02-12T12:00:00")
+    assert "default" not in tools._PREFETCHED_KEYS
@@ -0,0 +1,65 @@
+import pstats
+
+from calendar_agent import tools
+from calendar_agent.profiling import profile_turn
+
+
+def test_profile_turn_writes_pstats_and_collapsed(calendar_db, tmp_path, monkeypatch):
+    monkeypatch.setenv("CALENDAR_PROFILE_DIR", str(tmp_path / "profiles"))
+
+    with profile_turn("abcdef123456", 3) as profile:
+        tools.add_event("Profiled", "2026-02-10T10:00:00", "2026-02-10T11:00:00")
+        payload = [str(i) * 50 for i in range(2000)]
+        tools.list_events("2026-02-10T00:00:00", "2026-02-11T00:00:00")
+
+    assert payload
+    assert profile.pstats_path.endswith("abcdef12-turn03.pstats")
+    stats = pstats.Stats(profile.pstats_path)
+    assert stats.total_calls > 0
+
+    with open(profile.collapsed_path, encoding="utf-8") as fh:
+        lines = [line.rstrip("\n") for line in fh if line.strip()]
+    assert lines
+    for line in lines:
+        stack, weight = line.rsplit(" ", 1)
+        assert stack
+        assert int(weight) > 0
+    assert any("add_event" in line for line in lines)
+
+    assert profile.hot_functions
+    assert profile.allocation_sites
+    assert profile.peak_memory_kib > 0
+
+
+class _FakeStats:
+    def __init__(self, raw):
+        self.stats = raw
+
+
+def test_collapsed_stacks_are_bounded_on_a_dense_call_graph():
+    import time
+
+    from calendar_agent.profiling import _collapsed_stacks
+
+    # 40 layers x 50 functions, each called from 5 functions of the layer
+    # above: ~1e27 distinct root-to-leaf paths, 2000 functions, 9750 edges.
+    layers, width, fan_in = 40, 50, 5
+    raw = {}
+    for layer in range(layers):
+        for i in range(width):
+            func = (f"mod{layer}.py", i, f"f{layer}_{i}")
+            callers = {}
+            if layer:
+                for k in range(fan_in):
+                    caller = (f"mod{layer - 1}.py", (i + k) % width, f"f{layer - 1}_{(i + k) % width}")
+                    callers[caller] = (1, 1, 0.001, 0.002)
+            raw[func] = (fan_in, fan_in, 0.001, 0.002 * (layers - layer), callers)
+
+    started = time.perf_counter()
+    stacks = _collapsed_stacks(_FakeStats(raw))
+    elapsed = time.perf_counter() - started
+
+    assert elapsed < 5
+    assert len(stacks) <= sum(max(1, len(entry[4])) for entry in raw.values())
+    assert abs(sum(stacks.values()) - len(raw) * 1000) < 1
+    assert max(key.count(";") + 1 for key in stacks) <= 64
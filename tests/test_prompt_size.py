@@ -0,0 +1,57 @@
+import pytest
+from datapizza.memory import Memory
+from datapizza.type import ROLE, FunctionCallResultBlock, TextBlock
+
+from calendar_agent import tools
+from calendar_agent.agent import create_calendar_agent
+from calendar_agent.prompt_size import estimate_tokens, measure_prompt
+from calendar_agent.telemetry import render_turn_summary, turn_trace
+
+
+@pytest.fixture
+def prompt_db(calendar_db):
+    return calendar_db
+
+
+def test_measure_splits_memory_from_tool_outputs():
+    memory = Memory()
+    memory.add_turn(TextBlock(content="what's on today?"), role=ROLE.USER)
+    memory.add_turn(
+        FunctionCallResultBlock(id="1", tool=tools.list_events, result="x" * 400), role=ROLE.TOOL
+    )
+    breakdown = measure_prompt("and tomorrow?", [tools.list_events], memory, "Be brief.")
+
+    assert breakdown.chars["system"] == len("Be brief.")
+    assert breakdown.chars["tools"] > 0
+    assert breakdown.chars["memory"] == len("what's on today?")
+    assert breakdown.chars["tool_outputs"] == 400
+    assert breakdown.chars["input"] == len("and tomorrow?")
+    assert breakdown.tokens()["tool_outputs"] == estimate_tokens(400) == 100
+
+
+def test_generation_spans_carry_the_breakdown(prompt_db, stub_client, capsys):
+    client = stub_client(
+        [("list_events", {"start_iso": "2026-03-02T00:00:00", "end_iso": "2026-03-03T00:00:00"}), "Nothing."]
+    )
+    agent = create_calendar_agent(client=client)
+
+    with turn_trace("calendar.turn") as turn_stats:
+        agent.run("What's on Monday?")
+        summary = turn_stats.summary()
+
+    breakdown = summary["prompt_breakdown"]
+    assert breakdown["calls"] == 2 == agent.prompt_totals.calls
+    assert breakdown["chars"]["tools"] > breakdown["chars"]["system"] > 0
+    # The second call carries the first list_events result.
+    assert breakdown["chars"]["tool_outputs"] == len("No events found in this range.")
+
+    render_turn_summary(summary, prompt_totals=agent.prompt_totals)
+    out = capsys.readouterr().out
+    assert "Turn (2 call(s))" in out
+    assert "Session (2 call(s))" in out
+
+
+def test_summary_flags_memory_outgrowing_fixed_overhead(capsys):
+    chars = {"system": 100, "tools": 100, "memory": 150, "tool_outputs": 100, "input": 20}
+    render_turn_summary({"prompt_breakdown": {"calls": 1, "chars": chars}})
+    assert "memory exceeds fixed overhead" in capsys.readouterr().out
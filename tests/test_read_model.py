@@ -0,0 +1,105 @@
+import json
+import sqlite3
+from datetime import datetime
+from zoneinfo import ZoneInfo
+
+import pytest
+
+from calendar_agent import tools
+from calendar_agent.read_model import READ_MODEL
+
+RANGES = [
+    ("2026-03-01T00:00:00", "2026-03-08T00:00:00"),
+    ("2026-03-02T10:15:00", "2026-03-02T10:20:00"),
+    ("2026-03-05T00:00:00", "2026-03-06T00:00:00"),
+    ("2026-04-01T00:00:00", "2026-04-02T00:00:00"),
+]
+
+
+@pytest.fixture
+def model_db(calendar_db, monkeypatch):
+    monkeypatch.setenv("CALENDAR_TOOL_CACHE_ENABLED", "0")
+    monkeypatch.setattr(tools, "STRUCTURED", True)
+    tools.add_event("Team Sync", "2026-03-02T10:00:00", "2026-03-02T10:30:00", "Room A")
+    tools.add_event("Conference", "2026-03-01T09:00:00", "2026-03-06T18:00:00")
+    tools.add_event("Dentist", "2026-03-03T15:00:00", "2026-03-03T15:45:00", notes="bring card")
+    monkeypatch.setenv("CALENDAR_READ_MODEL", "1")
+    return calendar_db
+
+
+def _listings(monkeypatch, enabled):
+    monkeypatch.setenv("CALENDAR_READ_MODEL", "1" if enabled else "0")
+    return [json.loads(tools.list_events(s, e)) for s, e in RANGES]
+
+
+def _index():
+    return READ_MODEL.get(tools._get_db_path(), tools._calendar_id())
+
+
+def test_bisect_results_match_sql(model_db, monkeypatch):
+    from_model = _listings(monkeypatch, True)
+    assert _index() is not None and len(_index()) == 3
+    # The five-day conference starts long before the later windows.
+    assert [e["title"] for e in from_model[2]["events"]] == ["Conference"]
+    assert from_model == _listings(monkeypatch, False)
+
+
+def test_writes_patch_the_index_without_reloading(model_db, monkeypatch):
+    tools.list_events(*RANGES[0])
+    index = _index()
+    loads = []
+    monkeypatch.setattr(READ_MODEL, "load", lambda *a: loads.append(a))
+
+    new_id = json.loads(tools.add_event("Lunch", "2026-03-04T12:00:00", "2026-03-04T13:00:00"))["created_id"]
+    tools.update_event(1, title="Team Standup")
+    tools.delete_events([3])
+    events = json.loads(tools.list_events(*RANGES[0]))["events"]
+
+    assert loads == [] and _index() is index
+    assert [(e["id"], e["title"], e["version"]) for e in events] == [
+        (2, "Conference", 1),
+        (1, "Team Standup", 2),
+        (new_id, "Lunch", 1),
+    ]
+
+
+def test_unit_of_work_applies_deltas_only_on_commit(model_db):
+    tools.list_events(*RANGES[0])
+    with pytest.raises(RuntimeError):
+        with tools.unit_of_work():
+            tools.delete_events([1, 2, 3])
+            raise RuntimeError("abort")
+    assert len(json.loads(tools.list_events(*RANGES[0]))["events"]) == 3
+
+    with tools.unit_of_work():
+        tools.delete_events_in_range(*RANGES[0], title_contains="sync")
+        tools.update_events_matching(title_contains="dentist", new_location="Clinic")
+    events = json.loads(tools.list_events(*RANGES[0]))["events"]
+    assert [(e["title"], e["location"]) for e in events] == [("Conference", None), ("Dentist", "Clinic")]
+
+
+def test_external_writes_and_archive_fall_back_to_sql(model_db, monkeypatch):
+    tools.list_events(*RANGES[0])
+    with sqlite3.connect(model_db) as other:
+        other.execute("UPDATE events SET title = 'Renamed' WHERE id = 3")
+    events = json.loads(tools.list_events(*RANGES[0]))["events"]
+    assert "Renamed" in [e["title"] for e in events]
+
+    monkeypatch.setenv("CALENDAR_ARCHIVE_AFTER_DAYS", "30")
+    tools.archive_old_events(now=datetime(2026, 5, 1, tzinfo=ZoneInfo("Europe/Rome")))
+    events = json.loads(tools.list_events(*RANGES[0]))["events"]
+    assert len(events) == 3
+    assert len(_index()) == 0 and not _index().covers(RANGES[0][0])
+
+
+def test_external_writes_reload_the_index_inside_unit_of_work(model_db):
+    tools.list_events(*RANGES[0])
+    stale = _index()
+    with sqlite3.connect(model_db) as other:
+        other.execute("UPDATE events SET title = 'Renamed' WHERE id = 3")
+    other.close()
+
+    with tools.unit_of_work():
+        events = json.loads(tools.list_events(*RANGES[0]))["events"]
+    assert "Renamed" in [e["title"] for e in events]
+    assert _index() is not stale
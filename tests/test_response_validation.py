@@ -0,0 +1,78 @@
+import json
+from types import SimpleNamespace
+
+from calendar_agent import response_validation
+from calendar_agent.response_validation import finalize_response, validate_response
+from calendar_agent.telemetry import summarize_spans
+
+
+def test_valid_response_passes_through_unchanged():
+    text = '{"mode":"structured","action":"list","status":"ok","events":[]}'
+    outcome = validate_response(text)
+    assert outcome.status == "valid"
+    assert outcome.text == text
+
+
+def test_prose_fences_and_id_types_are_repaired_locally():
+    text = (
+        "Sure! Here is the result:\n```json\n"
+        '{"action": "Delete", "deleted_ids": ["12", 13], "created_ids": null}\n'
+        "```\nLet me know if you need anything else."
+    )
+    outcome = validate_response(text)
+
+    assert outcome.status == "repaired"
+    assert {"strip_fence", "action_case", "created_ids_null"} <= set(outcome.repairs)
+    payload = json.loads(outcome.text)
+    assert payload["deleted_ids"] == [12, 13]
+    assert payload["mode"] == "structured"
+    assert payload["action"] == "delete"
+
+
+def test_missing_action_is_inferred():
+    outcome = validate_response('{"mode":"structured","created_ids":[7]}')
+    assert outcome.status == "repaired"
+    assert outcome.response.action == "add"
+
+
+def test_reask_only_when_unrepairable():
+    asked = []
+
+    def reask(prompt):
+        asked.append(prompt)
+        return '{"action":"other","message":"done"}'
+
+    repaired = finalize_response('{"action":"list","events":null}', reask)
+    assert json.loads(repaired)["events"] == []
+    assert asked == []
+
+    before = response_validation.STATS.retried
+    fixed = finalize_response("I could not do that.", reask)
+    assert json.loads(fixed)["message"] == "done"
+    assert len(asked) == 1
+    assert response_validation.STATS.retried == before + 1
+
+
+def test_unrepairable_after_retries_returns_error_payload(monkeypatch):
+    monkeypatch.setenv("CALENDAR_STRUCTURED_MAX_RETRIES", "0")
+    payload = json.loads(finalize_response("not json at all", lambda _: ""))
+    assert payload["status"] == "error"
+    assert payload["action"] == "other"
+
+
+def test_summary_counts_repairs_and_reasks():
+    event = SimpleNamespace(
+        name="structured.validation",
+        attributes={
+            "structured.outcome": "repaired",
+            "structured.retries": 1,
+            "structured.repairs": "strip_prose,action",
+        },
+    )
+    span = SimpleNamespace(attributes={}, events=[event], name="calendar.turn")
+    summary = summarize_spans([span])
+    assert summary["structured"] == {
+        "outcomes": {"repaired": 1},
+        "retries": 1,
+        "repairs": ["strip_prose", "action"],
+    }
@@ -0,0 +1,72 @@
+import logging
+from datetime import datetime
+from zoneinfo import ZoneInfo
+
+import pytest
+
+from calendar_agent.agent import create_calendar_agent
+from calendar_agent.routing import FULL, LIGHT, classify_turn
+from calendar_agent.server import _run_agent_turn
+
+NOW = datetime(2026, 3, 2, 9, 0, tzinfo=ZoneInfo("Europe/Rome"))
+
+
+@pytest.fixture
+def routing_db(calendar_db):
+    return calendar_db
+
+
+@pytest.mark.parametrize(
+    "text, tier",
+    [
+        ("What's on tomorrow?", LIGHT),
+        ("am I busy this afternoon", LIGHT),
+        ("Add lunch with Anna tomorrow at 13", FULL),
+        ("cancel the dentist", FULL),
+        ("hello there", FULL),
+        (
+            "find a two hour slot next week for a planning session that avoids my "
+            "gym mornings and any day I already have more than three meetings",
+            FULL,
+        ),
+    ],
+)
+def test_classify_turn(text, tier):
+    assert classify_turn(text, NOW) == tier
+
+
+def test_turns_go_to_their_tier_and_outcomes_are_logged(routing_db, stub_client, caplog):
+    light = stub_client(
+        [
+            ("list_events", {"start_iso": "2026-03-03T00:00:00", "end_iso": "2026-03-04T00:00:00"}),
+            "Nothing tomorrow.",
+        ],
+        model_name="light-stub",
+    )
+    full = stub_client(
+        [
+            ("add_event", {"title": "Dentist", "start_iso": "2026-03-03T15:00:00", "end_iso": "2026-03-03T16:00:00"}),
+            "Added.",
+        ],
+        model_name="full-stub",
+    )
+    agent = create_calendar_agent(client=full, light_client=light)
+
+    with caplog.at_level(logging.INFO, logger="calendar_agent.routing"):
+        assert _run_agent_turn(agent, "default", "What's on tomorrow?") == "Nothing tomorrow."
+        assert _run_agent_turn(agent, "default", "Add a dentist appointment tomorrow at 15") == "Added."
+
+    assert (len(light.calls), len(full.calls)) == (2, 2)
+    # The full model sees the turn the light model answered.
+    assert len(full.calls[0]["memory"]) > 0
+    stats = agent.router.stats
+    assert (stats[LIGHT].turns, stats[FULL].turns) == (1, 1)
+    assert stats[LIGHT].prompt_tokens == 20
+    assert agent.prompt_totals.calls == 4
+    assert "route tier=light model=light-stub" in caplog.text
+    assert "route tier=full model=full-stub" in caplog.text
+
+
+def test_no_router_without_light_client(stub_client, monkeypatch):
+    monkeypatch.delenv("CALENDAR_MODEL_ROUTING", raising=False)
+    assert create_calendar_agent(client=stub_client()).router is None
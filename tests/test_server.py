@@ -0,0 +1,130 @@
+import asyncio
+import json
+
+import pytest
+
+from calendar_agent import tools
+from calendar_agent.agent import create_calendar_agent
+from calendar_agent.server import CalendarServer
+
+
+@pytest.fixture
+def server_db(calendar_db, monkeypatch):
+    monkeypatch.setenv("GOOGLE_API_KEY", "mock_key")
+
+
+async def _request(port, method, path, payload=None):
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    body = json.dumps(payload).encode() if payload is not None else b""
+    writer.write(
+        f"{method} {path} HTTP/1.1\r\nHost: test\r\n"
+        f"Content-Length: {len(body)}\r\n\r\n".encode() + body
+    )
+    await writer.drain()
+    raw = await reader.read()
+    writer.close()
+    head, _, data = raw.partition(b"\r\n\r\n")
+    status = int(head.split(b" ")[1])
+    return status, head.decode(), data
+
+
+def _dechunk(data: bytes) -> list[dict]:
+    events = []
+    while data:
+        size_line, _, data = data.partition(b"\r\n")
+        size = int(size_line, 16)
+        if size == 0:
+            break
+        events.append(json.loads(data[:size]))
+        data = data[size + 2 :]
+    return events
+
+
+def test_sessions_run_tools_and_keep_memory(server_db, stub_client):
+    scripts = {
+        "a": [
+            ("add_event", {"title": "Alpha", "start_iso": "2026-02-10T10:00:00", "end_iso": "2026-02-10T11:00:00"}),
+            "Added Alpha.",
+        ],
+    }
+    clients = []
+
+    def factory():
+        client = stub_client(scripts.pop("a", None))
+        clients.append(client)
+        return create_calendar_agent(client=client)
+
+    async def scenario():
+        server = CalendarServer(factory, port=0, max_concurrency=2)
+        _, port = await server.start()
+        try:
+            status, _, data = await _request(port, "GET", "/health")
+            assert status == 200 and json.loads(data)["sessions"] == 0
+
+            status, _, data = await _request(
+                port, "POST", "/sessions/s1/messages",
+                {"message": "add alpha", "calendar_id": "alice"},
+            )
+            assert status == 200
+            assert json.loads(data)["text"] == "Added Alpha."
+
+            results = await asyncio.gather(
+                _request(port, "POST", "/sessions/s1/messages", {"message": "again"}),
+                _request(port, "POST", "/sessions/s2/messages", {"message": "hello"}),
+            )
+            assert [r[0] for r in results] == [200, 200]
+            assert json.loads(results[1][2])["text"].endswith("hello")
+            assert len(server.sessions) == 2
+
+            status, _, _ = await _request(
+                port, "POST", "/sessions/s1/messages",
+                {"message": "x", "calendar_id": "bob"},
+            )
+            assert status == 409
+
+            status, _, _ = await _request(port, "POST", "/sessions/s1/messages", {})
+            assert status == 400
+        finally:
+            await server.close()
+
+    asyncio.run(scenario())
+
+    with tools.use_calendar("alice"):
+        assert "Alpha" in tools.list_events("2026-02-10T00:00:00", "2026-02-11T00:00:00")
+    # Second turn of s1 saw the first turn in memory.
+    second_call_memory = clients[0].calls[2]["memory"]
+    assert "add alpha" in second_call_memory.json_dumps()
+
+
+def test_streaming_endpoint_emits_ndjson(server_db, stub_client):
+    def factory():
+        return create_calendar_agent(client=stub_client(["Nothing scheduled today."]))
+
+    async def scenario():
+        server = CalendarServer(factory, port=0)
+        _, port = await server.start()
+        try:
+            return await _request(port, "POST", "/sessions/s/messages/stream", {"message": "today?"})
+        finally:
+            await server.close()
+
+    status, head, data = asyncio.run(scenario())
+    assert status == 200
+    assert "chunked" in head
+    events = _dechunk(data)
+    assert events[-1] == {"type": "final", "text": "Nothing scheduled today."}
+    assert any(e["type"] == "step" for e in events)
+
+
+def test_idle_sessions_are_evicted(stub_client):
+    server = CalendarServer(lambda: object(), idle_timeout_s=10, max_sessions=2)
+    sessions = server.sessions
+    first = sessions.get_or_create("a", "default")
+    sessions.get_or_create("b", "default")
+    assert sessions.evict_idle(now=first.last_used + 5) == []
+    assert sorted(sessions.evict_idle(now=first.last_used + 60)) == ["a", "b"]
+
+    sessions.get_or_create("c", "default")
+    sessions.get_or_create("d", "default")
+    sessions.get_or_create("e", "default")
+    assert "c" not in sessions and len(sessions) == 2
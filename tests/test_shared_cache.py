@@ -0,0 +1,86 @@
+import pytest
+
+from calendar_agent import tools
+from calendar_agent.shared_cache import SharedToolCache
+
+
+@pytest.fixture
+def shared_env(calendar_db, tmp_path, monkeypatch):
+    monkeypatch.setenv("CALENDAR_TOOL_CACHE_ENABLED", "1")
+    monkeypatch.setenv("CALENDAR_SHARED_CACHE", "1")
+    monkeypatch.setenv("CALENDAR_SHARED_CACHE_PATH", str(tmp_path / "tool_cache.db"))
+    tools.add_event("Shared", "2026-02-10T10:00:00", "2026-02-10T11:00:00")
+    return tmp_path
+
+
+def _count_connects(monkeypatch):
+    calls = {"connect": 0}
+    real_connect = tools._connect
+
+    def counted_connect():
+        calls["connect"] += 1
+        return real_connect()
+
+    monkeypatch.setattr(tools, "_connect", counted_connect)
+    return calls
+
+
+def _list():
+    return tools.list_events("2026-02-10T00:00:00", "2026-02-11T00:00:00")
+
+
+def test_second_worker_reuses_published_result(shared_env, monkeypatch):
+    first = _list()
+    # A fresh worker process starts with an empty local cache.
+    tools.LIST_CACHE.clear()
+    calls = _count_connects(monkeypatch)
+
+    assert _list() == first
+    assert calls["connect"] == 0
+
+
+def test_shared_entries_are_revision_scoped(shared_env, monkeypatch):
+    _list()
+    tools.update_event(1, title="Renamed")
+    tools.LIST_CACHE.clear()
+
+    assert "Renamed" in _list()
+
+
+def test_shared_cache_evicts_least_recently_used(tmp_path):
+    cache = SharedToolCache(str(tmp_path / "bounded.db"), max_entries=2)
+    cache.set("a", "1")
+    cache.set("b", "2")
+    assert cache.get("a") == "1"
+    cache.set("c", "3")
+
+    assert len(cache) == 2
+    assert cache.get("b") is None
+    assert cache.get("a") == "1"
+    assert cache.get("c") == "3"
+    cache.close()
+
+
+def test_hits_survive_a_locked_file_and_touch_later(tmp_path):
+    import sqlite3
+
+    path = str(tmp_path / "busy.db")
+    cache = SharedToolCache(path, max_entries=8)
+    cache.touch_batch = 1
+    cache.set("a", "1")
+
+    def accessed_at():
+        with sqlite3.connect(path) as conn:
+            return conn.execute("SELECT accessed_at FROM tool_results WHERE key = 'a'").fetchone()[0]
+
+    before = accessed_at()
+    other = sqlite3.connect(path, isolation_level=None)
+    other.execute("BEGIN IMMEDIATE")  # another worker holds the write lock
+    assert cache.get("a") == "1"
+    other.execute("ROLLBACK")
+    other.close()
+    assert accessed_at() == before
+
+    assert cache.get("a") == "1"
+    assert accessed_at() > before
+    cache.close()
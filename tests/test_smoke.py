@@ -11,7 +11,7 @@ def test_agent_instantiation():
     
     agent = create_calendar_agent()
     assert agent is not None
-    assert len(agent.tools) == 4
+    assert len(agent.tools) == 9
 
 @pytest.mark.skipif(not os.getenv("GOOGLE_API_KEY") or os.getenv("GOOGLE_API_KEY") == "mock_key", 
                     reason="Valid GOOGLE_API_KEY not set")
@@ -0,0 +1,59 @@
+import gc
+import weakref
+
+from opentelemetry import trace
+
+from calendar_agent import telemetry
+from calendar_agent.telemetry import turn_trace
+
+
+def _tool_span(tracer, name, *events):
+    with tracer.start_as_current_span(name) as span:
+        span.set_attribute("type", "tool")
+        for attributes in events:
+            span.add_event("cache.hit", attributes)
+    return span
+
+
+def test_summary_is_ready_inside_the_turn(capsys):
+    tracer = trace.get_tracer(__name__)
+    with turn_trace("calendar.turn") as turn_stats:
+        _tool_span(tracer, "Tool list_events", {"cache.layer": "tool"})
+        _tool_span(
+            tracer,
+            "Tool list_events",
+            {"cache.layer": "client"},
+            {"cache.layer": "client", "cache.saved_total_tokens": 12, "cache.saved_prompt_tokens": 12},
+        )
+        with tracer.start_as_current_span("generation") as gen:
+            gen.set_attribute("type", "generation")
+            gen.set_attribute("model_name", "stub")
+            gen.set_attribute("prompt_tokens_used", 40)
+        summary = turn_stats.summary()
+
+    assert summary["tool_calls"] == 2
+    assert summary["tool_stats"]["Tool list_events"].count == 2
+    assert summary["cache_hits"] == {"tool": 1, "client": 1}
+    assert summary["cache_savings"].total_tokens == 12
+    assert turn_stats.model_tokens["stub"]["prompt_tokens"] == 40
+    # The root span is counted once it ends, like datapizza's trace summary.
+    assert turn_stats.span_count == 4
+    assert "Trace Summary of calendar.turn" in capsys.readouterr().out
+
+
+def test_spans_are_dropped_once_aggregated():
+    tracer = trace.get_tracer(__name__)
+    with turn_trace("calendar.turn") as turn_stats:
+        ref = weakref.ref(_tool_span(tracer, "Tool add_event"))
+        gc.collect()
+        assert ref() is None
+        assert turn_stats.summary()["tool_calls"] == 1
+    assert telemetry._processor()._aggregators == {}
+
+
+def test_spans_outside_a_turn_are_ignored():
+    tracer = trace.get_tracer(__name__)
+    with turn_trace("calendar.turn") as turn_stats:
+        pass
+    _tool_span(tracer, "Tool delete_events")
+    assert turn_stats.summary()["tool_calls"] == 0
@@ -0,0 +1,55 @@
+import pytest
+
+from calendar_agent.agent import create_calendar_agent
+from calendar_agent.streaming import run_streaming, streaming_enabled
+from calendar_agent.telemetry import render_turn_summary
+
+
+@pytest.fixture
+def stream_db(calendar_db, monkeypatch):
+    monkeypatch.setenv("CALENDAR_STREAMING", "1")
+
+
+def test_streaming_is_off_in_structured_mode(monkeypatch):
+    monkeypatch.setenv("CALENDAR_STREAMING", "1")
+    monkeypatch.setenv("CALENDAR_STRUCTURED_OUTPUT", "1")
+    assert not streaming_enabled()
+
+
+def test_deltas_arrive_after_tool_steps_and_match_final_text(stream_db, stub_client):
+    client = stub_client(
+        [
+            ("list_events", {"start_iso": "2026-02-10T00:00:00", "end_iso": "2026-02-11T00:00:00"}),
+            "You have nothing scheduled on Tuesday.",
+        ]
+    )
+    agent = create_calendar_agent(client=client)
+    deltas = []
+
+    turn = run_streaming(agent, "What do I have on Tuesday?", deltas.append)
+
+    assert turn.streamed
+    assert turn.ttft_ms is not None and turn.ttft_ms >= 0
+    assert "".join(deltas) == turn.text == "You have nothing scheduled on Tuesday."
+    assert len(deltas) > 1
+    assert len(client.calls) == 2
+    assert turn.usage.prompt_tokens == 20
+
+
+def test_summary_panel_shows_ttft(capsys):
+    render_turn_summary({}, duration_ms=120.0, ttft_ms=35.5)
+    assert "Time to First Token: 35.5 ms" in capsys.readouterr().out
+
+
+def test_streamed_steps_use_the_client_cache(stream_db, stub_client):
+    from calendar_agent.cache import InMemoryLRUCache
+
+    client = stub_client(["Nothing on Tuesday.", "Nothing on Tuesday."], cache=InMemoryLRUCache(maxsize=8))
+    first = run_streaming(create_calendar_agent(client=client), "What do I have on Tuesday?", lambda d: None)
+    deltas = []
+    # A fresh session sends the identical prompt with identical (empty) memory.
+    second = run_streaming(create_calendar_agent(client=client), "What do I have on Tuesday?", deltas.append)
+
+    assert len(client.calls) == 1
+    assert client.cache.stats.hits == 1
+    assert first.text == second.text == "".join(deltas) == "Nothing on Tuesday."
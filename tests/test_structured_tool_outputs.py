@@ -7,17 +7,12 @@ from calendar_agent.utils import env_truthy
 
 
 @pytest.fixture
-def structured_tools(tmp_path, monkeypatch):
-    db_file = tmp_path / "test_structured.db"
+def structured_tools(calendar_db, monkeypatch):
     original_structured = tools.STRUCTURED
     original_env = os.getenv("CALENDAR_STRUCTURED_OUTPUT")
 
-    monkeypatch.setenv("CALENDAR_DB_PATH", str(db_file))
     monkeypatch.setenv("CALENDAR_STRUCTURED_OUTPUT", "1")
     tools.STRUCTURED = env_truthy("CALENDAR_STRUCTURED_OUTPUT", "0")
-    tools.DB_REVISION = 0
-    tools.LIST_CACHE.clear()
-    tools.init_db()
 
     yield tools
 
@@ -47,7 +42,7 @@ def test_structured_tool_outputs(structured_tools):
     assert set(list_payload.keys()) == {"events", "start", "end"}
     assert list_payload["events"]
     event = next(e for e in list_payload["events"] if e["id"] == event_id)
-    assert set(event.keys()) == {"id", "title", "start", "end", "location", "notes"}
+    assert set(event.keys()) == {"id", "title", "start", "end", "location", "notes", "version"}
     assert event["location"] == "Office"
     assert event["notes"] == "Bring notes"
     assert event["start"].endswith("+01:00")
@@ -56,7 +51,9 @@ def test_structured_tool_outputs(structured_tools):
     update_payload = json.loads(
         structured_tools.update_event(event_id, title="Updated Structured Event")
     )
-    assert update_payload == {"updated_id": event_id}
+    assert update_payload["updated_id"] == event_id
+    assert update_payload["version"] == event["version"] + 1
+    assert update_payload["event"]["title"] == "Updated Structured Event"
 
     delete_payload = json.loads(structured_tools.delete_events([event_id]))
     assert event_id in delete_payload["deleted_ids"]
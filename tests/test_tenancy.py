@@ -0,0 +1,80 @@
+import pytest
+
+from calendar_agent import tools
+
+
+@pytest.fixture
+def shared_db(calendar_db, tmp_path, monkeypatch):
+    monkeypatch.setenv("CALENDAR_TOOL_CACHE_ENABLED", "1")
+    return tmp_path
+
+
+def _add(title):
+    return tools.add_event(title, "2026-02-10T10:00:00", "2026-02-10T11:00:00")
+
+
+def _list():
+    return tools.list_events("2026-02-10T00:00:00", "2026-02-11T00:00:00")
+
+
+def test_calendars_are_isolated_in_shared_db(shared_db):
+    with tools.use_calendar("alice"):
+        _add("Alice Standup")
+    with tools.use_calendar("bob"):
+        _add("Bob Review")
+        assert "Bob Review" in _list()
+        assert "Alice Standup" not in _list()
+        assert "Error" in tools.update_event(1, title="Hijacked")
+        assert "Deleted 0" in tools.delete_events([1])
+    with tools.use_calendar("alice"):
+        assert "Alice Standup" in _list()
+
+
+def test_writes_only_invalidate_own_calendar_cache(shared_db, monkeypatch):
+    with tools.use_calendar("alice"):
+        _list()
+    with tools.use_calendar("bob"):
+        _list()
+
+    calls = {"connect": 0}
+    real_connect = tools._connect
+
+    def counted_connect():
+        calls["connect"] += 1
+        return real_connect()
+
+    monkeypatch.setattr(tools, "_connect", counted_connect)
+
+    with tools.use_calendar("bob"):
+        _add("Bob Review")
+    calls["connect"] = 0
+    with tools.use_calendar("alice"):
+        _list()
+    assert calls["connect"] == 0
+    assert tools.DB_REVISIONS.get("alice", 0) == 0
+    assert tools.DB_REVISIONS["bob"] == 1
+
+
+def test_invalid_calendar_id_rejected():
+    with pytest.raises(ValueError):
+        with tools.use_calendar("../etc"):
+            pass
+
+
+def test_shard_per_tenant_with_bounded_pool(tmp_path, monkeypatch):
+    shard_dir = tmp_path / "shards"
+    monkeypatch.setenv("CALENDAR_SHARD_DIR", str(shard_dir))
+    monkeypatch.setenv("CALENDAR_SHARD_POOL_SIZE", "2")
+    try:
+        for name in ("t1", "t2", "t3"):
+            with tools.use_calendar(name):
+                _add(f"{name} event")
+        assert len(tools.SHARD_POOL) == 2
+        for name in ("t1", "t2", "t3"):
+            assert (shard_dir / f"{name}.db").exists()
+            with tools.use_calendar(name):
+                listing = _list()
+                assert f"{name} event" in listing
+                assert "[1]" in listing
+    finally:
+        tools.SHARD_POOL.close_all()
@@ -0,0 +1,95 @@
+import json
+
+import pytest
+
+from calendar_agent import tools
+from calendar_agent.agent import create_calendar_agent
+from calendar_agent.telemetry import turn_trace
+
+WINDOW = {"search_start_iso": "2026-03-01T00:00:00", "search_end_iso": "2026-03-08T00:00:00"}
+
+
+@pytest.fixture
+def title_db(calendar_db, monkeypatch):
+    monkeypatch.setattr(tools, "STRUCTURED", True)
+    tools.add_event("Dentist", "2026-03-03T15:00:00", "2026-03-03T15:45:00")
+    tools.add_event("Team Sync", "2026-03-02T10:00:00", "2026-03-02T10:30:00")
+    tools.add_event("Team Sync", "2026-03-04T10:00:00", "2026-03-04T10:30:00")
+    tools.add_event("Team Sync prep", "2026-03-04T09:30:00", "2026-03-04T10:00:00")
+
+
+def _events(day_start, day_end):
+    return json.loads(tools.list_events(day_start, day_end))["events"]
+
+
+def test_reschedule_by_title_keeps_duration(title_db):
+    result = json.loads(tools.reschedule_by_title("dentist", "2026-03-05T09:00:00", **WINDOW))
+
+    assert result["event"]["start"] == "2026-03-05T09:00:00+01:00"
+    assert result["event"]["end"] == "2026-03-05T09:45:00+01:00"
+    assert _events("2026-03-03T00:00:00", "2026-03-04T00:00:00") == []
+
+
+def test_ambiguous_title_returns_candidates_without_mutating(title_db):
+    result = json.loads(tools.delete_by_title("Team Sync", **WINDOW))
+
+    assert result["status"] == "ambiguous"
+    assert [c["start"][:10] for c in result["candidates"]] == ["2026-03-02", "2026-03-04"]
+    assert len(_events("2026-03-01T00:00:00", "2026-03-08T00:00:00")) == 4
+
+
+def test_exact_title_beats_substring_and_window_bounds_lookup(title_db):
+    narrowed = {"search_start_iso": "2026-03-04T00:00:00", "search_end_iso": "2026-03-05T00:00:00"}
+    result = json.loads(tools.delete_by_title("team sync", **narrowed))
+    assert result["deleted_count"] == 1
+
+    remaining = [e["title"] for e in _events("2026-03-04T00:00:00", "2026-03-05T00:00:00")]
+    assert remaining == ["Team Sync prep"]
+    assert json.loads(tools.delete_by_title("Dentist", search_start_iso="2026-04-01T00:00:00"))[
+        "status"
+    ] == "not_found"
+
+
+def test_exact_title_is_not_cut_off_by_substring_candidates(title_db):
+    # Six earlier substring matches fill the candidate limit ahead of the exact title.
+    for hour in range(8, 14):
+        tools.add_event(f"Dentist reminder {hour}", f"2026-03-02T{hour:02d}:00:00", f"2026-03-02T{hour:02d}:05:00")
+
+    result = json.loads(tools.delete_by_title("Dentist", **WINDOW))
+
+    assert result["deleted_count"] == 1
+    assert _events("2026-03-03T15:00:00", "2026-03-03T16:00:00") == []
+
+
+def test_exact_title_match_folds_non_ascii_case(title_db):
+    tools.add_event("Riunione Òrdine", "2026-03-05T15:00:00", "2026-03-05T16:00:00")
+    for hour in range(8, 14):
+        tools.add_event(
+            f"Riunione òrdine bozza {hour}",
+            f"2026-03-02T{hour:02d}:00:00",
+            f"2026-03-02T{hour:02d}:05:00",
+        )
+
+    result = json.loads(tools.delete_by_title("riunione òrdine", **WINDOW))
+
+    assert result["deleted_count"] == 1
+    assert _events("2026-03-05T15:00:00", "2026-03-05T16:00:00") == []
+
+
+def test_fused_tool_moves_the_event_in_one_tool_call(title_db, stub_client, monkeypatch):
+    monkeypatch.setenv("CALENDAR_TRACING", "1")
+    client = stub_client(
+        [("reschedule_by_title", {"title": "Dentist", "new_start_iso": "2026-03-06T11:00:00", **WINDOW}), "Moved."]
+    )
+    agent = create_calendar_agent(client=client)
+
+    with turn_trace("calendar.turn") as turn_stats:
+        agent.run("Move my dentist appointment to Friday 11:00")
+        summary = turn_stats.summary()
+
+    assert summary["tool_calls"] == 1
+    moved = _events("2026-03-06T00:00:00", "2026-03-07T00:00:00")
+    assert [(e["title"], e["start"], e["end"]) for e in moved] == [
+        ("Dentist", "2026-03-06T11:00:00+01:00", "2026-03-06T11:45:00+01:00")
+    ]
+    assert _events("2026-03-03T00:00:00", "2026-03-04T00:00:00") == []
@@ -0,0 +1,101 @@
+import sqlite3
+
+import pytest
+
+from calendar_agent import tools
+
+
+@pytest.fixture
+def temp_db(calendar_db, monkeypatch):
+    monkeypatch.setenv("CALENDAR_TOOL_CACHE_ENABLED", "1")
+    return calendar_db
+
+
+def _committed_titles(db_file):
+    with sqlite3.connect(db_file) as conn:
+        return [r[0] for r in conn.execute("SELECT title FROM events ORDER BY id")]
+
+
+def _list():
+    return tools.list_events("2026-02-10T00:00:00", "2026-02-11T00:00:00")
+
+
+def test_turn_writes_commit_once(temp_db, monkeypatch):
+    _list()
+    calls = {"connect": 0}
+    real_connect = tools._connect
+
+    def counted_connect():
+        calls["connect"] += 1
+        return real_connect()
+
+    monkeypatch.setattr(tools, "_connect", counted_connect)
+
+    with tools.unit_of_work() as uow:
+        tools.add_event("One", "2026-02-10T09:00:00", "2026-02-10T10:00:00")
+        tools.add_event("Two", "2026-02-10T11:00:00", "2026-02-10T12:00:00")
+        tools.update_event(1, title="One (moved)", start_iso="2026-02-10T08:00:00")
+        # Pending writes are visible to reads in the same turn...
+        listing = _list()
+        assert "One (moved)" in listing and "Two" in listing
+        # ...but not to other connections until commit.
+        assert _committed_titles(temp_db) == []
+        assert tools.DB_REVISIONS.get("default", 0) == 0
+        assert uow.writes == 3
+
+    assert calls["connect"] == 1
+    assert _committed_titles(temp_db) == ["One (moved)", "Two"]
+    assert tools.DB_REVISIONS["default"] == 1
+
+
+def test_turn_rolls_back_on_error(temp_db):
+    tools.add_event("Keep", "2026-02-10T09:00:00", "2026-02-10T10:00:00")
+    revision = tools.DB_REVISIONS["default"]
+
+    with pytest.raises(RuntimeError):
+        with tools.unit_of_work():
+            tools.delete_events([1])
+            tools.add_event("Drop", "2026-02-10T11:00:00", "2026-02-10T12:00:00")
+            raise RuntimeError("model failed mid-turn")
+
+    assert _committed_titles(temp_db) == ["Keep"]
+    assert tools.DB_REVISIONS["default"] == revision
+    assert "Keep" in _list()
+
+
+def test_read_only_turn_keeps_cache(temp_db):
+    tools.add_event("Cached", "2026-02-10T09:00:00", "2026-02-10T10:00:00")
+    first = _list()
+    with tools.unit_of_work():
+        assert _list() == first
+    assert tools.LIST_CACHE["default"]
+
+
+def test_waiting_for_the_write_slot_times_out_with_a_clear_error(temp_db, monkeypatch):
+    import threading
+    import time
+
+    monkeypatch.setenv("CALENDAR_DB_WRITE_WAIT_SECONDS", "0.1")
+    holding, release = threading.Event(), threading.Event()
+
+    def slow_turn():
+        # A turn that wrote and is now waiting on a model call.
+        with tools.unit_of_work():
+            tools.add_event("Held", "2026-02-10T09:00:00", "2026-02-10T10:00:00")
+            holding.set()
+            release.wait(5)
+
+    holder = threading.Thread(target=slow_turn)
+    holder.start()
+    holding.wait(5)
+    started = time.monotonic()
+    try:
+        with pytest.raises(tools.WriteSlotTimeout, match="Calendar is busy"):
+            with tools.unit_of_work():
+                tools.add_event("Blocked", "2026-02-10T11:00:00", "2026-02-10T12:00:00")
+        assert time.monotonic() - started < 2
+    finally:
+        release.set()
+        holder.join()
+
+    assert _committed_titles(temp_db) == ["Held"]
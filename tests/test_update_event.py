@@ -0,0 +1,57 @@
+import json
+
+import pytest
+
+from calendar_agent import tools
+
+
+@pytest.fixture
+def update_db(calendar_db, monkeypatch):
+    monkeypatch.setattr(tools, "STRUCTURED", True)
+    return json.loads(
+        tools.add_event("Sync", "2026-03-02T09:00:00", "2026-03-02T10:00:00")
+    )["created_id"]
+
+
+def _traced(monkeypatch):
+    statements = []
+    real_connect = tools._connect
+
+    def traced_connect():
+        conn = real_connect()
+        conn.set_trace_callback(statements.append)
+        return conn
+
+    monkeypatch.setattr(tools, "_connect", traced_connect)
+    return statements
+
+
+def test_update_is_one_statement_and_returns_the_row(update_db, monkeypatch):
+    statements = _traced(monkeypatch)
+    result = json.loads(tools.update_event(update_db, title="Sync v2", end_iso="2026-03-02T10:30:00"))
+
+    assert result["version"] == 2
+    assert result["event"]["title"] == "Sync v2"
+    assert result["event"]["end"] == "2026-03-02T10:30:00+01:00"
+    assert not [s for s in statements if s.lstrip().upper().startswith("SELECT * FROM EVENTS")]
+    assert len({s for s in statements if s.lstrip().upper().startswith("UPDATE EVENTS")}) == 1
+
+
+def test_stale_expected_version_is_rejected(update_db):
+    tools.update_event(update_db, title="Edited elsewhere", expected_version=1)
+
+    result = tools.update_event(update_db, title="Mine", expected_version=1)
+    assert "changed by someone else" in result
+    listed = json.loads(tools.list_events("2026-03-02T00:00:00", "2026-03-03T00:00:00"))
+    assert listed["events"][0]["title"] == "Edited elsewhere"
+    assert listed["events"][0]["version"] == 2
+
+
+def test_time_order_is_checked_against_the_stored_row(update_db):
+    result = tools.update_event(update_db, start_iso="2026-03-02T11:00:00")
+    assert result == "Error: Updated start time must be before updated end time."
+    assert tools.update_event(10_000, title="Ghost") == "Error: Event with ID 10000 not found."
+
+    listed = json.loads(tools.list_events("2026-03-02T00:00:00", "2026-03-03T00:00:00"))
+    assert listed["events"][0]["start"] == "2026-03-02T09:00:00+01:00"
+    assert listed["events"][0]["version"] == 1
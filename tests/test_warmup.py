@@ -0,0 +1,100 @@
+import sqlite3
+from datetime import datetime
+from zoneinfo import ZoneInfo
+
+import pytest
+from opentelemetry import trace
+
+from calendar_agent import tools
+from calendar_agent.telemetry import render_turn_summary, turn_trace
+from calendar_agent.timeparse import resolve_range
+from calendar_agent.warmup import Warmup
+
+NOW = datetime(2026, 2, 10, 8, 0, tzinfo=ZoneInfo("Europe/Rome"))
+
+
+@pytest.fixture
+def warmup_db(calendar_db_path, monkeypatch):
+    # Left uncreated: the warm-up itself opens and seeds the database.
+    monkeypatch.setenv("CALENDAR_TOOL_CACHE_ENABLED", "1")
+    monkeypatch.delenv("CALENDAR_WARMUP", raising=False)
+    return calendar_db_path
+
+
+def test_warmup_primes_db_and_tool_cache(warmup_db, monkeypatch, capsys):
+    warmup = Warmup(lambda: "agent", now=NOW).start()
+    assert warmup.result() == "agent"
+
+    report = warmup.report
+    assert report.background
+    assert set(report.steps) == {"db", "archive", "analyze", "list_cache", "agent"}
+    assert report.warmed_ranges == 2
+    with sqlite3.connect(warmup_db) as conn:
+        assert conn.execute("SELECT COUNT(*) FROM sqlite_stat1").fetchone()[0] > 0
+
+    calls = {"connect": 0}
+    real_connect = tools._connect
+
+    def counted_connect():
+        calls["connect"] += 1
+        return real_connect()
+
+    monkeypatch.setattr(tools, "_connect", counted_connect)
+    monkeypatch.setenv("CALENDAR_TRACING", "1")
+    start_iso, end_iso = resolve_range("today", NOW)
+    with turn_trace("calendar.turn") as turn_stats:
+        with trace.get_tracer(__name__).start_as_current_span("Tool list_events"):
+            result = tools.list_events(start_iso, end_iso)
+        summary = turn_stats.summary()
+
+    # The seeded kickoff falls on the warmed day and is served without SQLite.
+    assert "Project Kickoff" in result
+    assert calls["connect"] == 0
+    assert summary["cache_hits"] == {"warmup": 1}
+
+    render_turn_summary(summary, warmup=report)
+    assert "first turn waited" in capsys.readouterr().out
+
+
+def test_writes_drop_unserved_warmup_keys(warmup_db):
+    Warmup(lambda: "agent", now=NOW).start().result()
+    assert tools._WARMED_KEYS.get("default")
+
+    tools.add_event("Later", "2026-02-10T18:00:00", "2026-02-10T19:00:00")
+    assert "default" not in tools._WARMED_KEYS
+
+
+def test_warmup_errors_surface_on_result(warmup_db):
+    def broken():
+        raise RuntimeError("no client")
+
+    warmup = Warmup(broken, now=NOW).start()
+    with pytest.raises(RuntimeError, match="no client"):
+        warmup.result()
+
+
+def test_repl_reports_a_failed_warmup_instead_of_crashing(warmup_db, monkeypatch, capsys):
+    from calendar_agent import __main__ as repl
+
+    def broken():
+        raise RuntimeError("no client")
+
+    monkeypatch.setattr(repl, "create_calendar_agent", broken)
+    monkeypatch.setattr(repl.sys, "argv", ["calendar_agent"])
+    monkeypatch.setattr("builtins.input", lambda prompt="": "what's on today?")
+    repl.main()
+
+    out = capsys.readouterr().out
+    assert "Error: Start-up failed: no client" in out
+    assert "Max conversation turns" not in out
+
+
+def test_disabled_warmup_runs_inline(warmup_db, monkeypatch, capsys):
+    monkeypatch.setenv("CALENDAR_WARMUP", "0")
+    warmup = Warmup(lambda: "agent", now=NOW).start()
+
+    assert warmup._thread is None
+    assert warmup.result() == "agent"
+    assert warmup.report.hidden_ms == 0.0
+    render_turn_summary({}, warmup=warmup.report)
+    assert "background warm-up off" in capsys.readouterr().out